@@ -4,30 +4,28 @@ SystemLink Enterprise TestMonitor delete results example
 This example has two sections.
 The example in the first section creates a single test result and 
 deletes the created result by using delete result API.
-The example in the second section creates multiple(five) test results and 
-deletes all the created results at once using the delete-results API.
+The example in the second section creates multiple(five) test results with one request and 
+deletes all the created results at once using the bulk delete built on the delete-results API.
 """
 
 import uuid
-import sys
-import os
 import datetime
 from typing import Dict, List
 import click
 
-current = os.path.dirname(os.path.realpath(__file__))
-parent = os.path.dirname(current)
-sys.path.append(parent)
-
-import test_data_manager_client
+from nisystemlink_examples.testmonitor import (
+    TestDataManagerClient,
+    bulk_delete_results,
+    create_test_result,
+)
 
 
 def is_partial_success_response(response: Dict) -> bool:
     return "error" in response.keys()
 
 
-def create_single_result() -> Dict:
-    test_result = test_data_manager_client.create_test_result(
+def create_single_result(client: TestDataManagerClient) -> Dict:
+    test_result = create_test_result(
         program_name = "Power Test", 
         part_number = "NI-ABC-123-PWR", 
         operator = "John Smith", 
@@ -36,7 +34,7 @@ def create_single_result() -> Dict:
     )
 
     # create test result
-    response = test_data_manager_client.create_results(results=[test_result])
+    response = client.create_results(results=[test_result])
     if is_partial_success_response(response):
         raise Exception("Error occurred while creating a new test result. Please check if you have provided the correct test result details and if you have the right access for creating the new test result.")
     test_result = response["results"][0]
@@ -44,71 +42,73 @@ def create_single_result() -> Dict:
     return test_result
 
 
-def delete_single_result(result_id: str) -> None:
+def delete_single_result(client: TestDataManagerClient, result_id: str) -> None:
     try:
-        test_data_manager_client.delete_result(result_id, True)
+        client.delete_result(result_id, True)
         print(f"\nThe test result with ID = {result_id} has been deleted successfully")
     except:
         print("Error occurred while deleting the test result. Please check if you have provided the correct result ID and if you have the right access for deleting the test result.")
 
 
-def create_and_delete_single_result() -> None:
+def create_and_delete_single_result(client: TestDataManagerClient) -> None:
     
     # create test result
     print("Creating New test result")
-    test_result = create_single_result()    
+    test_result = create_single_result(client)    
     print(f"Test result has been created under part number={test_result['partNumber']} with ID = {test_result['id']}")
     
     # delete test result
     print("Press enter to delete the result")
     input()
-    delete_single_result(test_result["id"])
-
-
-def create_multiple_results() -> List:
-    test_result = test_data_manager_client.create_test_result(
-        program_name = "Power Test", 
-        part_number = "NI-ABC-123-PWR", 
-        operator = "John Smith", 
-        serial_number = str(uuid.uuid4()), 
-        started_at = str(datetime.datetime.utcnow())
-    )
-    program_name = test_result["programName"]
-    result_ids = []
-    for i in range(0,5):
-        test_result["programName"] = program_name + str(i)
-        response = test_data_manager_client.create_results(results=[test_result])
-        if is_partial_success_response(response):
-            print("Error occurred while creating a new test result. Please check if you have provided the correct test result details and if you have the right access for creating the new test results")
-        else:
-            test_result = response["results"][0]
-            result_ids.append(test_result["id"])
-            print(f"{test_result['id']}")
+    delete_single_result(client, test_result["id"])
+
+
+def create_multiple_results(client: TestDataManagerClient) -> List:
+    test_results = [
+        create_test_result(
+            program_name = "Power Test" + str(i), 
+            part_number = "NI-ABC-123-PWR", 
+            operator = "John Smith", 
+            serial_number = str(uuid.uuid4()), 
+            started_at = str(datetime.datetime.utcnow())
+        )
+        for i in range(0,5)
+    ]
+    # create all test results with a single request
+    response = client.create_results(results=test_results)
+    if is_partial_success_response(response):
+        print("Error occurred while creating some of the new test results. Please check if you have provided the correct test result details and if you have the right access for creating the new test results")
+    result_ids = [test_result["id"] for test_result in response.get("results", [])]
+    for result_id in result_ids:
+        print(result_id)
     if len(result_ids) > 0 :
         return result_ids
     else:
         raise Exception("Error occurred while creating multiple new test results. Please check if you have the right access for creating test results.")
 
 
-def delete_multiple_results(result_ids: List) -> None:
-    response = test_data_manager_client.delete_results(result_ids, True)
-    if is_partial_success_response(response) :
+def delete_multiple_results(client: TestDataManagerClient, result_ids: List) -> None:
+    # The bulk delete splits any number of IDs into chunks and reports every result it could not delete.
+    report = bulk_delete_results(client, result_ids, delete_steps=True)
+    if report.failed:
         print("Error occurred while deleting the test results. Please check if you have provided the correct result IDs and if you have the right access for deleting the test results.")
+        for result_id, error in report.failed.items():
+            print(f"{result_id}: {error}")
     else:
-        print("\nMultiple test results have been deleted successfully.")
+        print(f"\n{report.deleted_count} test results have been deleted successfully.")
 
 
-def create_and_delete_multiple_results() -> None:
+def create_and_delete_multiple_results(client: TestDataManagerClient) -> None:
 
     # create multiple test results
     print("\nCreating multiple test results.\nResult IDs are listed below:")    
-    result_ids = create_multiple_results()    
+    result_ids = create_multiple_results(client)    
     print("\nMultiple test results have been created successfully.")
 
     # Delete multiple test results
     print("Press enter to delete these results.")
     input()
-    delete_multiple_results(result_ids)
+    delete_multiple_results(client, result_ids)
 
 @click.command()
 @click.option("--server", help = "Enter server URL.")
@@ -123,20 +123,22 @@ def main(server, api_key):
     For more information on how to generate API key, please refer to the documentation provided.
     """
 
-    test_data_manager_client.set_base_url_and_api_key(server, api_key)
+    client = TestDataManagerClient(server, api_key)
 
     try:
         # Creating single test result and deleting it
-        create_and_delete_single_result()
+        create_and_delete_single_result(client)
 
         # Creating multiple test result and deleting them all at once
-        create_and_delete_multiple_results()        
+        create_and_delete_multiple_results(client)        
         
     except Exception as e:
         print(e)
         print("The given URL or API key might be invalid or the server might be down. Please try again after verifying the following: server is up, correct URL and API key.")
         print("For more information on how to generate API key, please refer to the documentation provided.")
         print("Try running the 'delete_results.py --help' command for help.")
+    finally:
+        client.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
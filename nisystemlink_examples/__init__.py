@@ -5,12 +5,53 @@ It includes test data generators, simulators, and helper functions for common Sy
 operations.
 
 Modules:
+    alarms: Bulk reconciliation of asset alarms
+    analysis: Failure pareto analysis of test results
+    dataframe: DataFrame client and chunked table ingest
+    etl: Concurrent multi-file ETL pipeline
+    files: Streaming file downloads
+    loadgen: Load generation with simulated test stations
+    lookup: Cached lookups of systems, workspaces and other reference data
+    mockserver: Local stand-in for SystemLink services
+    query: Paginated query iteration
+    scheduler: Test plan scheduling on systems and fixtures
+    specs: Bulk analysis and update of specifications
     testdata: Test data utilities and simulators
+    testmonitor: Test Monitor client and payload builders
+    testplans: Bulk application of test plan templates
 """
 
-from . import testdata
+from . import (
+    alarms,
+    analysis,
+    dataframe,
+    etl,
+    files,
+    loadgen,
+    lookup,
+    mockserver,
+    query,
+    scheduler,
+    specs,
+    testdata,
+    testmonitor,
+    testplans,
+)
 
 __version__ = "0.1.0"
 __all__ = [
+    "alarms",
+    "analysis",
+    "dataframe",
+    "etl",
+    "files",
+    "loadgen",
+    "lookup",
+    "mockserver",
+    "query",
+    "scheduler",
+    "specs",
     "testdata",
+    "testmonitor",
+    "testplans",
 ]
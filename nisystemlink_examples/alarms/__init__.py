@@ -0,0 +1,28 @@
+"""Alarm utilities for SystemLink Enterprise demo package.
+
+This module reconciles the alarms of many assets with their desired state, sending
+only the transitions that change an alarm and skipping assets unchanged since the
+last run.
+"""
+
+from .reconcile import (
+    AlarmReconciler,
+    calibration_alarms,
+    CALIBRATION_STATUS_TO_SEVERITY,
+    CLEAR_SEVERITY,
+    DesiredAlarm,
+    ReconcileReport,
+    severity_index,
+    Transition,
+)
+
+__all__ = [
+    "AlarmReconciler",
+    "CALIBRATION_STATUS_TO_SEVERITY",
+    "CLEAR_SEVERITY",
+    "DesiredAlarm",
+    "ReconcileReport",
+    "Transition",
+    "calibration_alarms",
+    "severity_index",
+]
@@ -0,0 +1,319 @@
+"""This module reconciles alarms with the desired state of many assets in bulk.
+
+Classes:
+    DesiredAlarm: The severity an alarm should have.
+    Transition: A change of the severity of an alarm.
+    ReconcileReport: The outcome of a reconciliation.
+    AlarmReconciler: Sends only the transitions that change an alarm and remembers
+        the state of every alarm across runs.
+
+Functions:
+    calibration_alarms: Derives the desired alarms of assets from their calibration
+        status.
+    severity_index: Indexes the current severity of alarms by their alarm ID.
+"""
+
+import itertools
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from ..query.updates import get_field
+
+CLEAR_SEVERITY = -1
+
+# The severity of the alarm of an asset in each calibration status. Assets in other
+# statuses get no alarm.
+CALIBRATION_STATUS_TO_SEVERITY = {
+    "PAST_RECOMMENDED_DUE_DATE": 2,
+    "APPROACHING_RECOMMENDED_DUE_DATE": 1,
+    "OK": CLEAR_SEVERITY,
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS alarms (
+    alarm_id TEXT PRIMARY KEY,
+    condition TEXT NOT NULL,
+    severity INTEGER NOT NULL
+);
+"""
+
+
+@dataclass(frozen=True)
+class DesiredAlarm:
+    """The severity an alarm should have.
+
+    Attributes:
+        alarm_id: The ID of the alarm, unique per asset.
+        severity: The severity level, or `CLEAR_SEVERITY` if the alarm should be
+            cleared.
+        condition: The condition of the alarm, e.g. the calibration status.
+        source: The asset or other item the alarm is about.
+    """
+
+    alarm_id: str
+    severity: int
+    condition: str
+    source: Any = field(default=None, compare=False)
+
+
+@dataclass
+class Transition:
+    """A change of the severity of an alarm.
+
+    Attributes:
+        alarm: The desired alarm.
+        current_severity: The severity of the alarm on the server, or None if it
+            does not exist.
+    """
+
+    alarm: DesiredAlarm
+    current_severity: Optional[int]
+
+    @property
+    def action(self) -> str:
+        """Whether the transition creates, updates or clears the alarm."""
+        if self.alarm.severity == CLEAR_SEVERITY:
+            return "clear"
+        return "create" if self.current_severity is None else "update"
+
+
+@dataclass
+class ReconcileReport:
+    """The outcome of a reconciliation.
+
+    Attributes:
+        skipped: The number of alarms skipped as their state was unchanged since the
+            last run.
+        in_sync: The number of alarms that already had their severity on the server.
+        succeeded: The transitions that were sent.
+        failed: The transitions that failed, with their errors.
+    """
+
+    skipped: int = 0
+    in_sync: int = 0
+    succeeded: List[Transition] = field(default_factory=list)
+    failed: List[Tuple[Transition, str]] = field(default_factory=list)
+
+
+def calibration_alarms(
+    assets: Iterable[Any],
+    alarm_id: Callable[[Any], str],
+    severities: Mapping[str, int] = CALIBRATION_STATUS_TO_SEVERITY,
+) -> Iterator[DesiredAlarm]:
+    """Derives the desired alarms of assets from their calibration status.
+
+    Args:
+        assets: The assets, as `Asset` models of `nisystemlink-clients` or as
+            dictionaries of the Asset Management API.
+        alarm_id: The function returning the alarm ID of an asset.
+        severities: The severity of each calibration status. Assets in other statuses
+            are skipped.
+
+    Yields:
+        The desired alarm of every asset with a mapped calibration status.
+    """
+    for asset in assets:
+        status = get_field(asset, "calibration_status", "calibrationStatus")
+        status = getattr(status, "value", status)
+        if status in severities:
+            yield DesiredAlarm(alarm_id(asset), severities[status], status, asset)
+
+
+def severity_index(alarms: Iterable[Any]) -> Dict[str, int]:
+    """Indexes the current severity of alarms by their alarm ID.
+
+    Args:
+        alarms: The alarms, as `Alarm` models of `nisystemlink-clients` or as
+            dictionaries of the Alarm API.
+
+    Returns:
+        The current severity level of every alarm by its alarm ID.
+    """
+    return {
+        get_field(alarm, "alarm_id", "alarmId"): get_field(
+            alarm, "current_severity_level", "currentSeverityLevel"
+        )
+        for alarm in alarms
+    }
+
+
+class AlarmReconciler:
+    """Sends only the transitions that change an alarm, remembering every alarm's state.
+
+    The state of every alarm after the last run, its condition and severity, is kept
+    in a snapshot in a local SQLite database. Alarms whose desired state equals the
+    snapshot are skipped without looking at the server. Only the current severity of
+    the other alarms is fetched, in one bulk lookup indexed by alarm ID, and only the
+    alarms whose severity differs get a transition. The transitions are sent by a pool
+    of threads, and the snapshot is updated after every batch, so an interrupted run
+    resumes where it stopped.
+
+    Alarms changed on the server by others are not noticed while the desired state of
+    their asset stays the same. Pass `full=True` to `reconcile` now and then, or
+    remove the snapshot, to check every alarm again.
+    """
+
+    def __init__(self, path: str = ":memory:"):
+        """Initializes the reconciler and creates the snapshot if it does not exist.
+
+        Args:
+            path: The path of the SQLite database file of the snapshot. The default
+                in-memory snapshot is lost when the reconciler is closed.
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def __enter__(self) -> "AlarmReconciler":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM alarms").fetchone()
+        return row[0]
+
+    def close(self) -> None:
+        """Closes the snapshot database."""
+        self._connection.close()
+
+    def diff(
+        self,
+        desired: Iterable[DesiredAlarm],
+        current_severities: Callable[[Sequence[str]], Mapping[str, Optional[int]]],
+        full: bool = False,
+    ) -> Tuple[List[Transition], int, int]:
+        """Finds the transitions that bring the alarms into their desired state.
+
+        Alarms that already have their desired severity on the server are recorded
+        in the snapshot, so they are skipped by the next run.
+
+        Args:
+            desired: The desired alarms. Of repeated alarm IDs, the last one counts.
+            current_severities: The function looking up the current severity of
+                alarms by their IDs, e.g. querying them in chunks and indexing them
+                with `severity_index`. Alarms that do not exist are left out.
+            full: Whether to check every alarm, ignoring the snapshot.
+
+        Returns:
+            The transitions, the number of alarms skipped by the snapshot and the
+            number of alarms already in their desired state.
+        """
+        wanted = {alarm.alarm_id: alarm for alarm in desired}
+        snapshot = {} if full else self._snapshot()
+        changed = [
+            alarm
+            for alarm_id, alarm in wanted.items()
+            if snapshot.get(alarm_id) != (alarm.condition, alarm.severity)
+        ]
+        current = current_severities([alarm.alarm_id for alarm in changed])
+        transitions = []
+        in_sync = []
+        for alarm in changed:
+            severity = current.get(alarm.alarm_id)
+            if severity == alarm.severity or (
+                severity is None and alarm.severity == CLEAR_SEVERITY
+            ):
+                in_sync.append(alarm)
+            else:
+                transitions.append(Transition(alarm, severity))
+        self._record(in_sync)
+        return transitions, len(wanted) - len(changed), len(in_sync)
+
+    def apply(
+        self,
+        transitions: Sequence[Transition],
+        submit: Callable[[Transition], Any],
+        max_workers: int = 8,
+        batch_size: int = 500,
+    ) -> ReconcileReport:
+        """Sends transitions concurrently and records the alarms they changed.
+
+        Args:
+            transitions: The transitions, e.g. as returned by `diff`.
+            submit: The function sending one transition, e.g. building a
+                `CreateOrUpdateAlarmRequest` and passing it to
+                `AlarmClient.create_or_update_alarm`.
+            max_workers: The number of transitions sent at the same time.
+            batch_size: The number of transitions sent before the snapshot is
+                updated.
+
+        Returns:
+            The succeeded and failed transitions.
+        """
+        report = ReconcileReport()
+
+        def send(transition: Transition) -> Optional[str]:
+            try:
+                submit(transition)
+            except Exception as e:
+                return str(e) or type(e).__name__
+            return None
+
+        remaining = iter(transitions)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while batch := list(itertools.islice(remaining, batch_size)):
+                sent = []
+                for transition, error in zip(batch, executor.map(send, batch)):
+                    if error is None:
+                        sent.append(transition.alarm)
+                        report.succeeded.append(transition)
+                    else:
+                        report.failed.append((transition, error))
+                self._record(sent)
+        return report
+
+    def reconcile(
+        self,
+        desired: Iterable[DesiredAlarm],
+        current_severities: Callable[[Sequence[str]], Mapping[str, Optional[int]]],
+        submit: Callable[[Transition], Any],
+        full: bool = False,
+        max_workers: int = 8,
+        batch_size: int = 500,
+    ) -> ReconcileReport:
+        """Brings alarms into their desired state with as few requests as possible.
+
+        See `diff` and `apply` for a description of the arguments.
+
+        Returns:
+            The number of skipped and in-sync alarms and the sent transitions.
+        """
+        transitions, skipped, in_sync = self.diff(desired, current_severities, full)
+        report = self.apply(transitions, submit, max_workers, batch_size)
+        report.skipped = skipped
+        report.in_sync = in_sync
+        return report
+
+    def _snapshot(self) -> Dict[str, Tuple[str, int]]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT alarm_id, condition, severity FROM alarms"
+            ).fetchall()
+        return {
+            alarm_id: (condition, severity) for alarm_id, condition, severity in rows
+        }
+
+    def _record(self, alarms: Iterable[DesiredAlarm]) -> None:
+        rows = [(alarm.alarm_id, alarm.condition, alarm.severity) for alarm in alarms]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO alarms VALUES (?, ?, ?)", rows
+            )
@@ -0,0 +1,44 @@
+"""Analysis utilities for SystemLink Enterprise demo package.
+
+This module computes failure paretos of test results, querying only the fields they
+are built from, and caches the status of results for repeated analyses. It also runs
+the statistics of Data Space analyses on many traces in parallel.
+"""
+
+from .cache import ResultStatusCache
+from .dataspace import (
+    Analysis,
+    AnalysisInput,
+    moving_mean,
+    register_analysis,
+    run_analyses,
+    supported_analysis,
+    trace_statistics,
+    TraceStatistics,
+)
+from .pareto import (
+    failure_pareto,
+    FAILURE_STATUSES,
+    pareto,
+    pareto_graph,
+    query_status_counts,
+    StatusCounts,
+)
+
+__all__ = [
+    "Analysis",
+    "AnalysisInput",
+    "FAILURE_STATUSES",
+    "ResultStatusCache",
+    "StatusCounts",
+    "TraceStatistics",
+    "failure_pareto",
+    "moving_mean",
+    "pareto",
+    "pareto_graph",
+    "query_status_counts",
+    "register_analysis",
+    "run_analyses",
+    "supported_analysis",
+    "trace_statistics",
+]
@@ -0,0 +1,367 @@
+"""This module caches the status of test results locally for repeated pareto analyses.
+
+Classes:
+    ResultStatusCache: Keeps the group and status of results in a local SQLite database
+        and refreshes it incrementally from the results updated since the last refresh.
+"""
+
+import datetime
+import re
+import sqlite3
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .pareto import _filters, _projection, QUERY_RESULTS_ROUTE, StatusCounts
+from ..query import paginate_pages
+from ..testmonitor import TestDataManagerClient
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id TEXT PRIMARY KEY,
+    grp TEXT NOT NULL,
+    status TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_updated_at ON results (updated_at);
+CREATE TABLE IF NOT EXISTS counts (
+    grp TEXT NOT NULL,
+    status TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (grp, status)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS results_insert AFTER INSERT ON results BEGIN
+    INSERT INTO counts VALUES (NEW.grp, NEW.status, 1)
+        ON CONFLICT (grp, status) DO UPDATE SET count = count + 1;
+END;
+CREATE TRIGGER IF NOT EXISTS results_delete AFTER DELETE ON results BEGIN
+    UPDATE counts SET count = count - 1 WHERE grp = OLD.grp AND status = OLD.status;
+END;
+CREATE TRIGGER IF NOT EXISTS results_update AFTER UPDATE OF grp, status ON results
+BEGIN
+    UPDATE counts SET count = count - 1 WHERE grp = OLD.grp AND status = OLD.status;
+    INSERT INTO counts VALUES (NEW.grp, NEW.status, 1)
+        ON CONFLICT (grp, status) DO UPDATE SET count = count + 1;
+END;
+"""
+
+_UPSERT = """
+INSERT INTO results VALUES (?, ?, ?, ?)
+    ON CONFLICT (id) DO UPDATE SET
+        grp = excluded.grp, status = excluded.status, updated_at = excluded.updated_at
+    WHERE excluded.updated_at >= results.updated_at
+"""
+
+_Row = Tuple[str, str, str, str]
+
+# Update times are stored in one fixed-width UTC format, so they compare as strings.
+# The server does not pad fractional seconds, so its "...:05Z" would sort after
+# "...:05.1Z".
+_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+_FRACTION = re.compile(r"\.(\d+)")
+
+
+def _normalize_time(value: str) -> str:
+    """Converts an ISO 8601 time to the fixed-width UTC format of the cache."""
+    if not value:
+        return value
+    value = _FRACTION.sub(lambda match: "." + match.group(1)[:6].ljust(6, "0"), value)
+    time = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if time.tzinfo is None:
+        time = time.replace(tzinfo=datetime.timezone.utc)
+    return time.astimezone(datetime.timezone.utc).strftime(_TIME_FORMAT)
+
+
+class ResultStatusCache:
+    """Keeps the group and status of test results in a local SQLite database.
+
+    The cache holds the ID, the value of the grouping field, the status type and the
+    update time of every result it has seen. `refresh` only fetches the results
+    updated since the newest update time seen before, so rerunning an analysis on
+    overlapping results costs one small query instead of fetching every result again.
+
+    The number of results per group and status is maintained by triggers while the
+    results are stored, so the counts of the whole cache are read without scanning
+    it. Counts of a selection of results are aggregated in SQL.
+
+    Results deleted on the server are not noticed by `refresh`. They leave the cache
+    when they are evicted by `max_age` or `max_entries`.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        group_by: str = "partNumber",
+        max_entries: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        """Initializes the cache and creates the database if it does not exist.
+
+        Args:
+            path: The path of the SQLite database file. The default in-memory database
+                is lost when the cache is closed.
+            group_by: The result field the results are counted by. A database always
+                caches the same field.
+            max_entries: The maximum number of cached results. The results updated
+                least recently are evicted first.
+            max_age: The age in seconds after its last update at which a result is
+                evicted.
+
+        Raises:
+            ValueError: The database caches a different `group_by` field.
+        """
+        self.group_by = group_by
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO meta VALUES ('group_by', ?)", (group_by,)
+            )
+        cached_group_by = self._meta("group_by")
+        if cached_group_by != group_by:
+            self._connection.close()
+            raise ValueError(
+                f"The cache at {path} counts results by {cached_group_by}, "
+                f"not by {group_by}."
+            )
+
+    def __enter__(self) -> "ResultStatusCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connection.execute("SELECT COUNT(*) FROM results").fetchone()
+        return row[0]
+
+    def close(self) -> None:
+        """Closes the database."""
+        self._connection.close()
+
+    @property
+    def watermark(self) -> Optional[str]:
+        """The newest update time seen by `refresh`, or None before the first refresh.
+
+        It is a UTC time with microseconds, e.g. `2024-01-01T00:00:05.100000Z`.
+        """
+        with self._lock:
+            return self._meta("watermark")
+
+    def refresh(
+        self,
+        client: TestDataManagerClient,
+        filter: Optional[str] = None,
+        page_size: int = 1000,
+    ) -> int:
+        """Fetches the results updated since the last refresh.
+
+        The first refresh fetches every result matching the `filter`. Later refreshes
+        should use the same filter. Results updated at the watermark itself are
+        fetched again, so no update is missed when several results share an update
+        time.
+
+        Args:
+            client: The client used to query the results.
+            filter: A Test Monitor result query filter limiting the cached results.
+            page_size: The number of results per page.
+
+        Returns:
+            The number of fetched results.
+        """
+        clauses = [f"({filter})"] if filter else []
+        watermark = self.watermark
+        if watermark is not None:
+            clauses.append(f'updatedAt >= "{watermark}"')
+        fetched, newest = self._fetch(client, " and ".join(clauses), page_size)
+        if newest:
+            # The watermark only advances once every page is stored, as the pages are
+            # not ordered by update time.
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT INTO meta VALUES ('watermark', ?) ON CONFLICT (key) "
+                    "DO UPDATE SET value = max(value, excluded.value)",
+                    (newest,),
+                )
+        self.evict()
+        return fetched
+
+    def fetch(
+        self,
+        client: TestDataManagerClient,
+        result_ids: Sequence[str],
+        ids_per_filter: int = 500,
+        max_workers: int = 4,
+        page_size: int = 1000,
+    ) -> int:
+        """Fetches results by ID, whether they are cached or not.
+
+        The IDs are split into filters of at most `ids_per_filter` IDs, which are
+        queried by up to `max_workers` threads at the same time. This does not advance
+        the watermark, so a later `refresh` still fetches the other results updated
+        in the meantime.
+
+        Args:
+            client: The client used to query the results.
+            result_ids: The IDs of the results.
+            ids_per_filter: The maximum number of IDs in the filter of a single query.
+            max_workers: The maximum number of queries running at the same time.
+            page_size: The number of results per page.
+
+        Returns:
+            The number of fetched results.
+        """
+        filters = _filters(result_ids, None, None, ids_per_filter)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            fetched = sum(
+                count
+                for count, _ in executor.map(
+                    lambda filter: self._fetch(client, filter, page_size), filters
+                )
+            )
+        self.evict()
+        return fetched
+
+    def counts(
+        self,
+        result_ids: Optional[Iterable[str]] = None,
+        client: Optional[TestDataManagerClient] = None,
+        **fetch_arguments: Any,
+    ) -> StatusCounts:
+        """Counts the cached results by group and status.
+
+        Args:
+            result_ids: The IDs of the results to be counted, or None for every cached
+                result.
+            client: The client used to fetch the results of `result_ids` that are not
+                cached. Without a client, uncached results are not counted.
+            **fetch_arguments: Further arguments passed to `fetch`.
+
+        Returns:
+            The number of results by (group, status type).
+        """
+        if result_ids is None:
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT grp, status, count FROM counts WHERE count > 0"
+                ).fetchall()
+            return Counter({(group, status): count for group, status, count in rows})
+
+        ids = list(dict.fromkeys(result_ids))
+        if client is not None:
+            missing = self._missing(ids)
+            if missing:
+                self.fetch(client, missing, **fetch_arguments)
+        with self._lock, self._selection(ids):
+            rows = self._connection.execute(
+                "SELECT grp, status, COUNT(*) FROM results "
+                "JOIN selection USING (id) GROUP BY grp, status"
+            ).fetchall()
+        return Counter({(group, status): count for group, status, count in rows})
+
+    def evict(self) -> int:
+        """Removes the results beyond `max_age` and `max_entries`.
+
+        Returns:
+            The number of removed results.
+        """
+        evicted = 0
+        with self._lock, self._connection:
+            if self.max_age is not None:
+                now = datetime.datetime.now(datetime.timezone.utc)
+                cutoff = now - datetime.timedelta(seconds=self.max_age)
+                evicted += self._connection.execute(
+                    "DELETE FROM results WHERE updated_at < ?",
+                    (cutoff.strftime(_TIME_FORMAT),),
+                ).rowcount
+            if self.max_entries is not None:
+                evicted += self._connection.execute(
+                    "DELETE FROM results WHERE id IN (SELECT id FROM results "
+                    "ORDER BY updated_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                ).rowcount
+        return evicted
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._connection.execute(
+            "SELECT value FROM meta WHERE key = ?", (key,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _fetch(
+        self, client: TestDataManagerClient, filter: str, page_size: int
+    ) -> Tuple[int, str]:
+        """Queries results and stores them page by page.
+
+        Returns:
+            The number of fetched results and their newest update time.
+        """
+
+        def query(body: Dict[str, Any]) -> Dict[str, Any]:
+            return client.post(QUERY_RESULTS_ROUTE, body).json()
+
+        body: Dict[str, Any] = {
+            "filter": filter,
+            "projection": ["ID", _projection(self.group_by), "STATUS", "UPDATED_AT"],
+            "take": page_size,
+            "returnCount": False,
+        }
+        fetched = 0
+        newest = ""
+        for page in paginate_pages(query, body, "results"):
+            rows: List[_Row] = [
+                (
+                    result["id"],
+                    result.get(self.group_by) or "",
+                    (result.get("status") or {}).get("statusType") or "",
+                    _normalize_time(result.get("updatedAt") or ""),
+                )
+                for result in page
+            ]
+            if not rows:
+                continue
+            with self._lock, self._connection:
+                self._connection.executemany(_UPSERT, rows)
+            newest = max(newest, max(row[3] for row in rows))
+            fetched += len(rows)
+        return fetched, newest
+
+    def _missing(self, ids: List[str]) -> List[str]:
+        with self._lock, self._selection(ids):
+            rows = self._connection.execute(
+                "SELECT id FROM selection WHERE id NOT IN (SELECT id FROM results)"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _selection(self, ids: List[str]) -> "_Selection":
+        return _Selection(self._connection, ids)
+
+
+class _Selection:
+    """Holds a list of IDs in a temporary table, so they can be joined in SQL."""
+
+    def __init__(self, connection: sqlite3.Connection, ids: List[str]):
+        self._connection = connection
+        self._ids = ids
+
+    def __enter__(self) -> None:
+        self._connection.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS selection (id TEXT PRIMARY KEY)"
+        )
+        self._connection.executemany(
+            "INSERT OR IGNORE INTO selection VALUES (?)", ((i,) for i in self._ids)
+        )
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._connection.execute("DELETE FROM selection")
+        self._connection.commit()
@@ -0,0 +1,306 @@
+"""This module runs the statistics of Data Space analyses on many traces at once.
+
+Classes:
+    TraceStatistics: The moments and extremes of a trace, computed once per trace.
+    AnalysisInput: What an analysis gets to compute its result from.
+    Analysis: A registered analysis option.
+
+Functions:
+    register_analysis: Registers an analysis option, e.g. a custom analysis.
+    supported_analysis: Lists the registered options in the notebook metadata format.
+    trace_statistics: Computes the statistics of a trace in one set of reductions.
+    moving_mean: Computes the trailing moving mean of a trace with cumulative sums.
+    run_analyses: Runs analysis options on many traces, optionally in parallel.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas  # type: ignore[import-untyped]
+
+SCALAR = "scalar"
+VECTOR = "vector"
+DEFAULT_MOVING_MEAN_WINDOW = 5
+
+
+@dataclass(frozen=True)
+class TraceStatistics:
+    """The moments and extremes of a trace, ignoring missing values.
+
+    Attributes:
+        count: The number of values.
+        min: The smallest value.
+        max: The largest value.
+        mean: The mean of the values.
+        std: The sample standard deviation of the values.
+    """
+
+    count: int
+    min: float
+    max: float
+    mean: float
+    std: float
+
+
+@dataclass
+class AnalysisInput:
+    """What an analysis gets to compute its result from.
+
+    Attributes:
+        values: The y values of the trace.
+        statistics: The statistics of the values, shared by all analyses.
+        frame: The data of the trace.
+        parameters: The parameters of the run, e.g. `lower_limit`.
+    """
+
+    values: np.ndarray
+    statistics: TraceStatistics
+    frame: pandas.DataFrame
+    parameters: Mapping[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class Analysis:
+    """A registered analysis option.
+
+    Attributes:
+        id: The ID of the option, as listed in the notebook outputs.
+        type: `scalar` for one value per trace, `vector` for one value per point.
+        compute: The function computing the result of the option.
+    """
+
+    id: str
+    type: str
+    compute: Callable[[AnalysisInput], Any]
+
+
+_ANALYSES: Dict[str, Analysis] = {}
+
+
+def register_analysis(
+    id: str, type: str = SCALAR
+) -> Callable[[Callable[[AnalysisInput], Any]], Callable[[AnalysisInput], Any]]:
+    """Registers an analysis option, e.g. a custom analysis.
+
+    Use it as a decorator of a module level function, so the function can be sent to
+    the worker processes of `run_analyses`:
+
+        @register_analysis("median")
+        def median(analysis: AnalysisInput) -> float:
+            return float(np.nanmedian(analysis.values))
+
+    Args:
+        id: The ID of the option. Registering an ID again replaces the option.
+        type: `scalar` if the function returns one value for the trace, `vector` if
+            it returns one value per point of the trace.
+
+    Returns:
+        The decorator registering the function.
+
+    Raises:
+        ValueError: The type is neither scalar nor vector.
+    """
+    if type not in (SCALAR, VECTOR):
+        raise ValueError(f"The analysis type must be {SCALAR} or {VECTOR}, not {type}.")
+
+    def register(
+        compute: Callable[[AnalysisInput], Any],
+    ) -> Callable[[AnalysisInput], Any]:
+        _ANALYSES[id] = Analysis(id, type, compute)
+        return compute
+
+    return register
+
+
+def supported_analysis() -> List[Dict[str, str]]:
+    """Lists the registered options in the format of the notebook metadata.
+
+    Returns:
+        The ID and type of every registered option.
+    """
+    return [
+        {"id": analysis.id, "type": analysis.type} for analysis in _ANALYSES.values()
+    ]
+
+
+def trace_statistics(values: np.ndarray) -> TraceStatistics:
+    """Computes the statistics of a trace in one set of reductions.
+
+    Args:
+        values: The values of the trace. NaN values are ignored.
+
+    Returns:
+        The statistics. Without values, every statistic except the count is NaN, and
+        the standard deviation of a single value is NaN.
+    """
+    valid = values[~np.isnan(values)]
+    count = len(valid)
+    if not count:
+        return TraceStatistics(0, math.nan, math.nan, math.nan, math.nan)
+    mean = float(valid.sum()) / count
+    deviations = valid - mean
+    std = (
+        math.sqrt(float(deviations @ deviations) / (count - 1))
+        if count > 1
+        else math.nan
+    )
+    return TraceStatistics(count, float(valid.min()), float(valid.max()), mean, std)
+
+
+def moving_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Computes the trailing moving mean of a trace with cumulative sums.
+
+    Each point is the mean of the last `window` values up to it, skipping NaN values,
+    like `Series.rolling(window, min_periods=1).mean()`. It takes two cumulative sums
+    instead of one sum per window.
+
+    Args:
+        values: The values of the trace.
+        window: The number of values averaged.
+
+    Returns:
+        The moving mean at every point, NaN where the window holds no value.
+    """
+    valid = ~np.isnan(values)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(ends - window, 0)
+    window_counts = counts[ends] - counts[starts]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(
+            window_counts > 0, (sums[ends] - sums[starts]) / window_counts, np.nan
+        )
+
+
+def _ratio(numerator: float, denominator: float) -> float:
+    return numerator / denominator if denominator else math.nan
+
+
+def _limits(analysis: AnalysisInput) -> tuple:
+    return (
+        analysis.parameters.get("lower_limit", math.nan),
+        analysis.parameters.get("upper_limit", math.nan),
+    )
+
+
+def _constant(analysis: AnalysisInput, value: float) -> np.ndarray:
+    return np.full(len(analysis.values), value)
+
+
+@register_analysis("min")
+def _min(analysis: AnalysisInput) -> float:
+    return analysis.statistics.min
+
+
+@register_analysis("max")
+def _max(analysis: AnalysisInput) -> float:
+    return analysis.statistics.max
+
+
+@register_analysis("mean")
+def _mean(analysis: AnalysisInput) -> float:
+    return analysis.statistics.mean
+
+
+@register_analysis("2std")
+def _plus_2std(analysis: AnalysisInput) -> float:
+    return analysis.statistics.mean + 2 * analysis.statistics.std
+
+
+@register_analysis("-2std")
+def _minus_2std(analysis: AnalysisInput) -> float:
+    return analysis.statistics.mean - 2 * analysis.statistics.std
+
+
+@register_analysis("moving_mean", VECTOR)
+def _moving_mean(analysis: AnalysisInput) -> np.ndarray:
+    window = analysis.parameters.get("moving_mean_window", DEFAULT_MOVING_MEAN_WINDOW)
+    return moving_mean(analysis.values, window)
+
+
+@register_analysis("cp", VECTOR)
+def _cp(analysis: AnalysisInput) -> np.ndarray:
+    lower, upper = _limits(analysis)
+    return _constant(analysis, _ratio(upper - lower, 6 * analysis.statistics.std))
+
+
+@register_analysis("cpk", VECTOR)
+def _cpk(analysis: AnalysisInput) -> np.ndarray:
+    lower, upper = _limits(analysis)
+    mean, std = analysis.statistics.mean, analysis.statistics.std
+    return _constant(analysis, _ratio(min(upper - mean, mean - lower), 3 * std))
+
+
+def _analyze(
+    frame: pandas.DataFrame,
+    analyses: Sequence[Analysis],
+    parameters: Mapping[str, Any],
+) -> Dict[str, Any]:
+    """Computes the result of every analysis of one trace."""
+    values = frame["y"].to_numpy(dtype=np.float64)
+    analysis_input = AnalysisInput(
+        values, trace_statistics(values), frame, dict(parameters)
+    )
+    return {analysis.id: analysis.compute(analysis_input) for analysis in analyses}
+
+
+def run_analyses(
+    traces: Sequence[Mapping[str, Any]],
+    analysis_options: Sequence[str],
+    max_workers: Optional[int] = 1,
+    **parameters: Any,
+) -> List[Dict[str, Any]]:
+    """Runs analysis options on many traces, optionally in a pool of processes.
+
+    The statistics of a trace are computed once and shared by all of its scalar
+    options, instead of one pass over the data per option. With `max_workers` other
+    than 1, the traces are spread over a pool of processes, which pays off for long
+    traces on several cores. Custom analyses then have to be module level functions.
+
+    Args:
+        traces: The traces, each with a `name` and its `data`, a frame with `x` and `y`
+            columns, as loaded by `DataSpaceAnalyzer.load_dataset`.
+        analysis_options: The IDs of the registered options to run. IDs are not case
+            sensitive.
+        max_workers: The number of processes, 1 to analyze the traces in this
+            process, or None for the number of CPUs.
+        **parameters: Parameters of the analyses: `lower_limit` and `upper_limit` of
+            `cp` and `cpk`, `moving_mean_window`, and any parameter of custom
+            analyses.
+
+    Returns:
+        The `plot_label` and the `data` of every trace, with one column per option.
+        Scalar results fill their whole column.
+
+    Raises:
+        ValueError: An option is not registered.
+    """
+    options = [option.strip().lower() for option in analysis_options]
+    unsupported = sorted(set(options) - set(_ANALYSES))
+    if unsupported:
+        raise ValueError(
+            "The analysis failed because the following options are not supported: "
+            f"{', '.join(unsupported)}."
+        )
+    analyses = [_ANALYSES[option] for option in dict.fromkeys(options)]
+    frames = [trace["data"] for trace in traces]
+    if max_workers == 1 or len(frames) < 2:
+        results = [_analyze(frame, analyses, parameters) for frame in frames]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(
+                executor.map(
+                    _analyze,
+                    frames,
+                    [analyses] * len(frames),
+                    [parameters] * len(frames),
+                )
+            )
+    return [
+        {"plot_label": trace["name"], "data": frame.assign(**result)}
+        for trace, frame, result in zip(traces, frames, results)
+    ]
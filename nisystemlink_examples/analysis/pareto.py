@@ -0,0 +1,229 @@
+"""This module computes failure paretos of test results on top of paged queries.
+
+Functions:
+    query_status_counts: Counts the results of any number of IDs by group and status,
+        fetching only the fields counted.
+    pareto: Builds the failure pareto table from the columns of individual results.
+    failure_pareto: Builds the failure pareto table from status counts.
+    pareto_graph: Builds the notebook output graph of a pareto table.
+"""
+
+import re
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas  # type: ignore[import-untyped]
+
+from ..query import equals_any, id_filters, paginate
+from ..testmonitor import TestDataManagerClient
+
+QUERY_RESULTS_ROUTE = "nitestmonitor/v2/query-results"
+FAILURE_STATUSES = ("FAILED", "ERRORED")
+DEFAULT_IDS_PER_FILTER = 500
+
+# The number of results by (group, status type).
+StatusCounts = Counter[Tuple[str, str]]
+
+
+def _projection(field: str) -> str:
+    """Converts a result field name to its projection, e.g. partNumber to PART_NUMBER."""
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", field).upper()
+
+
+def _filters(
+    result_ids: Optional[Sequence[str]],
+    filter: Optional[str],
+    statuses: Optional[Sequence[str]],
+    ids_per_filter: int,
+) -> Iterator[str]:
+    """Yields the filters of the queries, each selecting at most `ids_per_filter` IDs."""
+    clauses = []
+    if filter:
+        clauses.append(f"({filter})")
+    if statuses:
+        clauses.append(equals_any("status.statusType")(statuses))
+    combined = " and ".join(clauses)
+    if result_ids is None:
+        yield combined
+        return
+    yield from id_filters(result_ids, equals_any("id"), ids_per_filter, combined)
+
+
+def query_status_counts(
+    client: TestDataManagerClient,
+    result_ids: Optional[Sequence[str]] = None,
+    filter: Optional[str] = None,
+    group_by: str = "partNumber",
+    statuses: Optional[Sequence[str]] = FAILURE_STATUSES,
+    ids_per_filter: int = DEFAULT_IDS_PER_FILTER,
+    max_workers: int = 4,
+    page_size: int = 1000,
+) -> StatusCounts:
+    """Counts test results by a grouping field and their status.
+
+    Only the grouping field and the status of the results are fetched. Long lists of
+    IDs are split into filters of at most `ids_per_filter` IDs, which are queried by up
+    to `max_workers` threads at the same time. The results are counted page by page,
+    so memory grows with the number of groups, not with the number of results.
+
+    Args:
+        client: The client used to query the results.
+        result_ids: The IDs of the results to be counted, or None for all results
+            matching the `filter`.
+        filter: A Test Monitor result query filter the results must match as well.
+        group_by: The result field to count by, e.g. `partNumber` or `operator`.
+        statuses: The status types of the results to be counted, or None for every
+            status. Defaults to the failure statuses the pareto is built from.
+        ids_per_filter: The maximum number of IDs in the filter of a single query.
+        max_workers: The maximum number of queries running at the same time.
+        page_size: The number of results per page.
+
+    Returns:
+        The number of results by (group, status type). Missing values count as "".
+    """
+
+    def count(filter: str) -> StatusCounts:
+        counts: StatusCounts = Counter()
+        body: Dict[str, Any] = {
+            "filter": filter,
+            "projection": [_projection(group_by), "STATUS"],
+            "take": page_size,
+            "returnCount": False,
+        }
+
+        def query(body: Dict[str, Any]) -> Dict[str, Any]:
+            return client.post(QUERY_RESULTS_ROUTE, body).json()
+
+        for result in paginate(query, body, "results"):
+            status = (result.get("status") or {}).get("statusType") or ""
+            counts[(result.get(group_by) or "", status)] += 1
+        return counts
+
+    totals: StatusCounts = Counter()
+    filters = _filters(result_ids, filter, statuses, ids_per_filter)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for counts in executor.map(count, filters):
+            totals.update(counts)
+    return totals
+
+
+def _pareto_frame(groups: np.ndarray, fail_counts: np.ndarray) -> pandas.DataFrame:
+    """Orders groups by descending failure count and accumulates their percentage."""
+    order = np.lexsort((groups, -fail_counts))
+    fail_counts = fail_counts[order]
+    total = fail_counts.sum()
+    cumulative = np.cumsum(fail_counts) * (100 / total) if total else fail_counts * 0.0
+    return pandas.DataFrame(
+        {"group": groups[order], "fail_count": fail_counts, "cumulative": cumulative}
+    )
+
+
+def pareto(
+    groups: Any,
+    statuses: Any,
+    failure_statuses: Sequence[str] = FAILURE_STATUSES,
+) -> pandas.DataFrame:
+    """Builds the failure pareto table from the columns of individual results.
+
+    The failures are counted with NumPy on the columns as given, without building a
+    frame of the results first. To break the failures down by another key, such as
+    the operator, system or program, pass that column as `groups`.
+
+    Args:
+        groups: The group of every result, e.g. its part number. Missing values form
+            the group "".
+        statuses: The status type of every result.
+        failure_statuses: The status types counted as failures.
+
+    Returns:
+        A frame with the `group`, its `fail_count` and the `cumulative` percentage of
+        all failures, ordered by descending failure count.
+    """
+    # Factorizing hashes every value once and leaves only the few distinct statuses
+    # and groups to be compared and sorted.
+    status_codes, status_labels = pandas.factorize(
+        np.asarray(statuses), use_na_sentinel=False
+    )
+    failed = np.isin(status_labels, list(failure_statuses))[status_codes]
+    codes, labels = pandas.factorize(np.asarray(groups), use_na_sentinel=False)
+    fail_counts = np.bincount(codes[failed], minlength=len(labels))
+    # Missing groups are merged into the group "", as in `query_status_counts`.
+    labels = np.where(pandas.isna(labels), "", labels).astype(str)
+    labels, inverse = np.unique(labels, return_inverse=True)
+    fail_counts = np.bincount(inverse, fail_counts, len(labels)).astype(np.int64)
+    failing = fail_counts > 0
+    return _pareto_frame(labels[failing], fail_counts[failing])
+
+
+def failure_pareto(
+    counts: StatusCounts, failure_statuses: Sequence[str] = FAILURE_STATUSES
+) -> pandas.DataFrame:
+    """Builds the failure pareto table from status counts.
+
+    Args:
+        counts: The number of results by (group, status type).
+        failure_statuses: The status types counted as failures.
+
+    Returns:
+        A frame with the `group`, its `fail_count` and the `cumulative` percentage of
+        all failures, ordered by descending failure count.
+    """
+    failures: Counter[str] = Counter()
+    for (group, status), count in counts.items():
+        if status in failure_statuses:
+            failures[group] += count
+    return _pareto_frame(
+        np.array(list(failures), dtype=str),
+        np.fromiter(failures.values(), dtype=np.int64, count=len(failures)),
+    )
+
+
+def pareto_graph(
+    frame: pandas.DataFrame,
+    group_label: str = "Part Number",
+    id: str = "failure_pareto_results_graph",
+) -> Dict[str, Any]:
+    """Builds the `data_frame` graph of a pareto table for the SystemLink notebook output.
+
+    Args:
+        frame: The pareto table, as returned by `pareto` or `failure_pareto`.
+        group_label: The name of the grouping key shown on the axis and in the title.
+            The group "" is shown as "No <group_label>".
+        id: The ID of the graph output.
+
+    Returns:
+        The value to be passed to `scrapbook.glue`.
+    """
+    groups = frame["group"].replace("", f"No {group_label}")
+    table = frame.assign(group=groups)
+    return {
+        "type": "data_frame",
+        "id": id,
+        "data": {
+            "columns": pandas.io.json.build_table_schema(table, index=False)["fields"],
+            "values": table.values.tolist(),
+        },
+        "config": {
+            "title": f"Failure Pareto - Results by {group_label}",
+            "graph": {
+                "axis_labels": [group_label, "Failure Count", "Cumulative %"],
+                "plots": [
+                    {
+                        "x": "group",
+                        "y": "fail_count",
+                        "style": "BAR",
+                        "GROUP_BY": ["group"],
+                    },
+                    {
+                        "x": "group",
+                        "y": "cumulative",
+                        "secondary_y": True,
+                        "style": "LINE",
+                    },
+                ],
+                "orientation": "VERTICAL",
+            },
+        },
+    }
@@ -0,0 +1,28 @@
+"""DataFrame utilities for SystemLink Enterprise demo package.
+
+This module provides a client for the SystemLink DataFrame service, functions that
+stream CSV files and pandas DataFrames into data tables in chunks, and the inference of
+table columns from pandas dtypes.
+"""
+
+from .client import DataFrameClient
+from .ingest import frame_request, ingest_csv, ingest_frames
+from .schema import (
+    csv_dtypes,
+    data_type,
+    infer_columns,
+    validate_columns,
+    widen_columns,
+)
+
+__all__ = [
+    "DataFrameClient",
+    "csv_dtypes",
+    "data_type",
+    "frame_request",
+    "ingest_csv",
+    "ingest_frames",
+    "infer_columns",
+    "validate_columns",
+    "widen_columns",
+]
@@ -0,0 +1,119 @@
+"""This module provides a pooled HTTP client for the SystemLink DataFrame v1 API.
+
+Classes:
+    DataFrameClient: Creates data tables and appends rows to them over a keep-alive
+        connection pool.
+"""
+
+from typing import Any, Dict, List, Optional, Union
+
+import requests
+
+from ..session import create_session
+
+TABLES_ROUTE = "nidataframe/v1/tables"
+
+
+class DataFrameClient:
+    """Client for the DataFrame v1 routes of one SystemLink Enterprise server.
+
+    Like `TestDataManagerClient`, the client keeps its connections alive between calls
+    and retries requests rejected with 429 or 503.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        pool_maxsize: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: Optional[float] = None,
+    ):
+        """Initializes the client.
+
+        Args:
+            base_url: The server URL including the scheme, host, and port if not default.
+            api_key: The API key used to authenticate against the server.
+            pool_maxsize: The maximum number of connections kept open to the server.
+            max_retries: How often a request rejected with 429 or 503 is retried.
+            backoff_factor: The base delay in seconds of the exponential retry backoff.
+            timeout: The timeout in seconds for a single request, or None to wait forever.
+        """
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.timeout = timeout
+        self.session = create_session(
+            api_key,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+        )
+
+    def __enter__(self) -> "DataFrameClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes all pooled connections."""
+        self.session.close()
+
+    def create_table(
+        self,
+        columns: List[Dict[str, Any]],
+        name: Optional[str] = None,
+        workspace: Optional[str] = None,
+        properties: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """Creates a new data table.
+
+        Args:
+            columns: The columns of the table, each with a `name`, `dataType` and
+                `columnType`. Exactly one column must be the `INDEX` column.
+            name: The name of the table.
+            workspace: The ID of the workspace of the table, or None for the default.
+            properties: The properties of the table.
+
+        Returns:
+            The ID of the new table.
+        """
+        body: Dict[str, Any] = {"columns": columns}
+        if name is not None:
+            body["name"] = name
+        if workspace is not None:
+            body["workspace"] = workspace
+        if properties is not None:
+            body["properties"] = properties
+        return self._request("POST", TABLES_ROUTE, json=body).json()["id"]
+
+    def get_table(self, table_id: str) -> Dict[str, Any]:
+        """Returns the metadata of a data table."""
+        return self._request("GET", f"{TABLES_ROUTE}/{table_id}").json()
+
+    def delete_table(self, table_id: str) -> None:
+        """Deletes a data table and its rows."""
+        self._request("DELETE", f"{TABLES_ROUTE}/{table_id}")
+
+    def append_table_data(self, table_id: str, body: Union[str, bytes]) -> None:
+        """Appends rows to a data table.
+
+        Args:
+            table_id: The ID of the table.
+            body: The serialized JSON request body holding the `frame` of rows and the
+                `endOfData` flag. It is sent as is, so large frames are not parsed and
+                serialized again.
+        """
+        self._request(
+            "POST",
+            f"{TABLES_ROUTE}/{table_id}/data",
+            data=body,
+            headers={"Content-Type": "application/json"},
+        )
+
+    def _request(self, method: str, route: str, **kwargs: Any) -> requests.Response:
+        response = self.session.request(
+            method, self.base_url + route, timeout=self.timeout, **kwargs
+        )
+        response.raise_for_status()
+        return response
@@ -0,0 +1,140 @@
+"""This module streams tabular data into SystemLink data tables in chunks.
+
+Functions:
+    frame_request: Serializes a chunk of rows into an append rows request body.
+    ingest_frames: Appends a sequence of pandas DataFrames to a data table.
+    ingest_csv: Reads a CSV file in chunks and appends them to a data table.
+"""
+
+import json
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import pandas  # type: ignore[import-untyped]
+
+from .client import DataFrameClient
+from .schema import csv_dtypes
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def frame_request(chunk: pandas.DataFrame, end_of_data: bool) -> str:
+    """Serializes a chunk of rows into an append rows request body.
+
+    The values are written by the JSON encoder of pandas without building Python
+    objects per cell, in their native JSON form: numbers and booleans unquoted and
+    timestamps in ISO 8601. Missing values become null. Chunks read with `dtype=str`
+    keep the text of the source file.
+
+    Args:
+        chunk: The rows to be appended. The index is not written.
+        end_of_data: Whether this is the last chunk of the table.
+
+    Returns:
+        The JSON request body.
+    """
+    columns = json.dumps([str(column) for column in chunk.columns])
+    data = chunk.to_json(orient="values", date_format="iso", date_unit="us")
+    end = "true" if end_of_data else "false"
+    return f'{{"frame":{{"columns":{columns},"data":{data}}},"endOfData":{end}}}'
+
+
+def ingest_frames(
+    client: DataFrameClient, table_id: str, frames: Iterable[pandas.DataFrame]
+) -> int:
+    """Appends a sequence of pandas DataFrames to a data table in order.
+
+    While one chunk is uploaded, the next one is read and serialized, so reading,
+    serialization and upload overlap. At most two serialized chunks are held in memory.
+    Only the last request sets `endOfData`, which completes the table.
+
+    Args:
+        client: The client used to append the rows.
+        table_id: The ID of the table, whose columns must match those of the frames.
+        frames: The chunks of rows, e.g. from `pandas.read_csv` with a `chunksize`.
+
+    Returns:
+        The number of appended rows.
+
+    Raises:
+        requests.HTTPError: A chunk was rejected. The chunks before it were appended.
+    """
+    rows = 0
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        upload: Optional["Future[None]"] = None
+        chunks = iter(frames)
+        chunk = next(chunks, None)
+        while chunk is not None:
+            next_chunk = next(chunks, None)
+            body = frame_request(chunk, end_of_data=next_chunk is None)
+            if upload is not None:
+                upload.result()
+            upload = executor.submit(client.append_table_data, table_id, body)
+            rows += len(chunk)
+            chunk = next_chunk
+        if upload is not None:
+            upload.result()
+        else:
+            client.append_table_data(table_id, '{"endOfData":true}')
+    return rows
+
+
+def _read_chunks(chunks: Iterable[pandas.DataFrame]) -> Iterator[pandas.DataFrame]:
+    """Yields the chunks of a CSV reader, raising a ValueError for unreadable rows.
+
+    pandas raises a TypeError, ValueError or OverflowError depending on the dtype a
+    value does not fit.
+    """
+    rows = 0
+    iterator = iter(chunks)
+    while True:
+        try:
+            chunk = next(iterator)
+        except StopIteration:
+            return
+        except (TypeError, ValueError, OverflowError) as e:
+            raise ValueError(
+                f"The rows after row {rows} could not be read in the column types: {e}"
+            ) from e
+        rows += len(chunk)
+        yield chunk
+
+
+def ingest_csv(
+    client: DataFrameClient,
+    table_id: str,
+    source: Any,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    columns: Optional[List[Dict[str, Any]]] = None,
+    **read_csv_arguments: Any,
+) -> int:
+    """Reads a CSV file in chunks and appends them to a data table.
+
+    The file is never loaded as a whole. Given the `columns` of the table, numbers
+    and booleans are parsed and sent as JSON numbers and booleans, which are smaller
+    than quoted text and need no conversion by the service. Otherwise, and for
+    timestamps and strings, the values are read as text and sent without conversion.
+
+    Args:
+        client: The client used to append the rows.
+        table_id: The ID of the table, whose columns must match those of the file.
+        source: The path or file object of the CSV file.
+        chunk_size: The number of rows sent per request.
+        columns: The column definitions of the table, e.g. from `infer_columns`.
+        **read_csv_arguments: Further arguments passed to `pandas.read_csv`, e.g.
+            `index_col=0` to skip an unnamed index column.
+
+    Returns:
+        The number of appended rows.
+
+    Raises:
+        ValueError: A chunk could not be read, e.g. as a value does not fit the data
+            type of its column. Chunks before it may have been appended.
+            `widen_columns` finds data types holding every value.
+    """
+    if columns is not None:
+        for name, value in csv_dtypes(columns).items():
+            read_csv_arguments.setdefault(name, value)
+    read_csv_arguments.setdefault("dtype", str)
+    with pandas.read_csv(source, chunksize=chunk_size, **read_csv_arguments) as chunks:
+        return ingest_frames(client, table_id, _read_chunks(chunks))
@@ -0,0 +1,234 @@
+"""This module derives the columns of SystemLink data tables from pandas DataFrames.
+
+Functions:
+    data_type: Maps a pandas or NumPy dtype to a DataFrame service data type.
+    infer_columns: Builds the column definitions of a table from a sample of its rows.
+    validate_columns: Checks column definitions against the rules of the service.
+    csv_dtypes: Builds the `pandas.read_csv` arguments that read rows in their types.
+    widen_columns: Widens the data types of columns to hold every value of text rows.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import pandas  # type: ignore[import-untyped]
+from pandas.api import types  # type: ignore[import-untyped]
+
+DATA_TYPES = ("INT32", "INT64", "FLOAT32", "FLOAT64", "TIMESTAMP", "BOOL", "STRING")
+INDEX_DATA_TYPES = ("INT32", "INT64", "TIMESTAMP")
+COLUMN_TYPES = ("INDEX", "NORMAL", "NULLABLE")
+
+# The dtypes used to read the values of each data type from text. Integers and
+# booleans use the pandas extension types, which hold missing values without turning
+# the column into floats or objects. FLOAT32 is read as float64, so the values are
+# written back in their shortest decimal form and stored as float32 by the service.
+# Timestamps are sent as text either way, so their source text is kept unparsed.
+_CSV_DTYPES = {
+    "INT32": "Int32",
+    "INT64": "Int64",
+    "FLOAT32": "float64",
+    "FLOAT64": "float64",
+    "TIMESTAMP": "object",
+    "BOOL": "boolean",
+    "STRING": "object",
+}
+
+
+# The text `pandas.read_csv` reads as booleans by default.
+_BOOL_TEXT = ("True", "TRUE", "true", "False", "FALSE", "false")
+_INT32_RANGE = (-(2**31), 2**31 - 1)
+
+
+def data_type(dtype: Any) -> str:
+    """Maps a pandas or NumPy dtype to a DataFrame service data type.
+
+    Args:
+        dtype: The dtype of a column, e.g. `frame["voltage"].dtype`.
+
+    Returns:
+        The narrowest data type holding every value of the dtype. Integers of up to 16
+        bits and unsigned 16 bit integers map to INT32, larger integers to INT64. Types
+        without a counterpart, such as objects, map to STRING.
+    """
+    if types.is_bool_dtype(dtype):
+        return "BOOL"
+    if types.is_integer_dtype(dtype):
+        size = types.pandas_dtype(dtype).itemsize
+        signed = types.is_signed_integer_dtype(dtype)
+        return "INT32" if size < 4 or (size == 4 and signed) else "INT64"
+    if types.is_float_dtype(dtype):
+        return "FLOAT32" if types.pandas_dtype(dtype).itemsize <= 4 else "FLOAT64"
+    if types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "STRING"
+
+
+def _value_type(column: pandas.Series) -> str:
+    """Infers the data type of a column, looking into the values of object columns."""
+    if not types.is_object_dtype(column.dtype) and not types.is_string_dtype(
+        column.dtype
+    ):
+        return data_type(column.dtype)
+    values = column.dropna()
+    if values.empty:
+        return "STRING"
+    if all(isinstance(value, bool) for value in values):
+        return "BOOL"
+    # ISO 8601 parsing accepts plain digits such as years, serial numbers or codes.
+    if pandas.to_numeric(values, errors="coerce").notna().any():
+        return "STRING"
+    try:
+        pandas.to_datetime(values, format="ISO8601")
+    except (ValueError, TypeError):
+        return "STRING"
+    return "TIMESTAMP"
+
+
+def infer_columns(
+    frame: pandas.DataFrame, index: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Builds the column definitions of a table from a sample of its rows.
+
+    The data types follow the dtypes of the columns. Text columns holding only ISO
+    8601 timestamps or booleans, as read from a CSV file without `parse_dates`, are
+    recognized as well. Unless given, the index is the first integer or timestamp
+    column whose sampled values are unique and present. All other columns are
+    nullable, as the sample cannot show that later rows have every value.
+
+    Args:
+        frame: The rows to infer the columns from. Only the columns are kept in the
+            table, not the index of the frame.
+        index: The name of the index column.
+
+    Returns:
+        The column definitions, ready to be passed to `DataFrameClient.create_table`.
+
+    Raises:
+        ValueError: No column can be the index, or the columns are not valid.
+    """
+    columns = [
+        {
+            "name": str(name),
+            "dataType": _value_type(frame[name]),
+            "columnType": "NULLABLE",
+        }
+        for name in frame.columns
+    ]
+    if index is None:
+        for column, name in zip(columns, frame.columns):
+            values = frame[name]
+            if (
+                column["dataType"] in INDEX_DATA_TYPES
+                and values.notna().all()
+                and values.is_unique
+            ):
+                index = column["name"]
+                break
+        else:
+            raise ValueError(
+                "No column can be the index. The index must be an integer or "
+                "timestamp column with unique values."
+            )
+    for column in columns:
+        if column["name"] == index:
+            column["columnType"] = "INDEX"
+    validate_columns(columns)
+    return columns
+
+
+def validate_columns(columns: List[Dict[str, Any]]) -> None:
+    """Checks column definitions against the rules of the DataFrame service.
+
+    Args:
+        columns: The column definitions, each with a `name`, `dataType` and
+            `columnType`.
+
+    Raises:
+        ValueError: The names are not unique, a type is unknown, or there is not
+            exactly one index column of an integer or timestamp type.
+    """
+    names = [column["name"] for column in columns]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise ValueError(f"The column names {duplicates} are not unique.")
+    for column in columns:
+        if column["dataType"] not in DATA_TYPES:
+            raise ValueError(
+                f"Column {column['name']} has the unknown data type "
+                f"{column['dataType']}."
+            )
+        if column.get("columnType", "NORMAL") not in COLUMN_TYPES:
+            raise ValueError(
+                f"Column {column['name']} has the unknown column type "
+                f"{column['columnType']}."
+            )
+    indexes = [column for column in columns if column.get("columnType") == "INDEX"]
+    if len(indexes) != 1:
+        raise ValueError(f"A table needs one index column, not {len(indexes)}.")
+    if indexes[0]["dataType"] not in INDEX_DATA_TYPES:
+        raise ValueError(
+            f"The index column {indexes[0]['name']} must be one of "
+            f"{', '.join(INDEX_DATA_TYPES)}, not {indexes[0]['dataType']}."
+        )
+
+
+def csv_dtypes(columns: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Builds the `pandas.read_csv` arguments that read rows in the types of a table.
+
+    Reading every chunk of a file with the same dtypes keeps the values of a column
+    in one type, even if a chunk has only missing values in it.
+
+    Args:
+        columns: The column definitions of the table.
+
+    Returns:
+        The `dtype` argument of `pandas.read_csv`.
+    """
+    return {
+        "dtype": {column["name"]: _CSV_DTYPES[column["dataType"]] for column in columns}
+    }
+
+
+def _widen(data_type: str, values: pandas.Series) -> str:
+    """Returns the narrowest data type, at least `data_type`, holding text values."""
+    if data_type == "BOOL":
+        return data_type if values.isin(_BOOL_TEXT).all() else "STRING"
+    if data_type not in ("INT32", "INT64", "FLOAT32", "FLOAT64"):
+        return data_type
+    numbers = pandas.to_numeric(values, errors="coerce")
+    if numbers.isna().any():
+        return "STRING"
+    if data_type.startswith("FLOAT"):
+        return data_type
+    if not types.is_integer_dtype(numbers.dtype) and (numbers % 1 != 0).any():
+        return "FLOAT64"
+    if data_type == "INT32" and not numbers.between(*_INT32_RANGE).all():
+        return "INT64"
+    return data_type
+
+
+def widen_columns(
+    columns: List[Dict[str, Any]], frame: pandas.DataFrame
+) -> List[Dict[str, Any]]:
+    """Widens the data types of columns to hold every value of rows read as text.
+
+    Columns inferred from a sample may not fit the rows after it, e.g. an integer
+    column with a decimal value further down the file. Integer columns are widened to
+    INT64 or FLOAT64 and columns with values that are not numbers or booleans to
+    STRING. The index column is kept, as its data type cannot be widened.
+
+    Args:
+        columns: The column definitions, e.g. from `infer_columns`.
+        frame: The rows, read with `dtype=str`. Calling this for every chunk of a
+            file widens the columns to hold the whole file.
+
+    Returns:
+        The column definitions with the widened data types.
+    """
+    widened = []
+    for column in columns:
+        column = dict(column)
+        if column.get("columnType") != "INDEX" and column["name"] in frame:
+            values = frame[column["name"]].dropna()
+            column["dataType"] = _widen(column["dataType"], values)
+        widened.append(column)
+    return widened
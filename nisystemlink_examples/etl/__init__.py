@@ -0,0 +1,14 @@
+"""ETL utilities for SystemLink Enterprise demo package.
+
+This module loads many measurement files from the SystemLink File service into data
+tables and links them to test results, running downloads and uploads concurrently.
+Run `python -m nisystemlink_examples.etl --help` for the command line.
+"""
+
+from .pipeline import EtlReport, FileOutcome, run_etl
+
+__all__ = [
+    "EtlReport",
+    "FileOutcome",
+    "run_etl",
+]
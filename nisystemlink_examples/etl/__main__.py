@@ -0,0 +1,76 @@
+"""Command line entry point of the ETL pipeline.
+
+Example:
+    python -m nisystemlink_examples.etl --server http://localhost:8080
+        --api-key key --index-col 0 FILE_ID [FILE_ID ...]
+"""
+
+import argparse
+import os
+import sys
+from typing import Any, Dict, List, Optional
+
+from .pipeline import run_etl
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Loads files into data tables and prints the outcome of every file.
+
+    Args:
+        argv: The command line arguments. Defaults to `sys.argv`.
+
+    Returns:
+        The exit code, which is 1 if any file failed.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m nisystemlink_examples.etl",
+        description="Loads CSV files from SystemLink into data tables.",
+    )
+    parser.add_argument("file_ids", nargs="+", metavar="FILE_ID")
+    parser.add_argument(
+        "--server", required=True, help="The server URL, e.g. http://localhost:8080."
+    )
+    parser.add_argument(
+        "--api-key",
+        default=os.environ.get("SYSTEMLINK_API_KEY", ""),
+        help="The API key. Defaults to the SYSTEMLINK_API_KEY environment variable.",
+    )
+    parser.add_argument("--workspace", default=None)
+    parser.add_argument("--download-workers", type=int, default=4)
+    parser.add_argument("--load-workers", type=int, default=4)
+    parser.add_argument("--chunk-size", type=int, default=100_000)
+    parser.add_argument(
+        "--index-col",
+        type=int,
+        default=None,
+        help="The position of a CSV column that is skipped as the row labels.",
+    )
+    args = parser.parse_args(argv)
+
+    read_csv_arguments: Dict[str, Any] = {}
+    if args.index_col is not None:
+        read_csv_arguments["index_col"] = args.index_col
+    report = run_etl(
+        args.server,
+        args.api_key,
+        args.file_ids,
+        workspace=args.workspace,
+        download_workers=args.download_workers,
+        load_workers=args.load_workers,
+        chunk_size=args.chunk_size,
+        **read_csv_arguments,
+    )
+    for outcome in report.files:
+        if outcome.error is None:
+            print(
+                f"{outcome.file_id}: {outcome.row_count} rows in table "
+                f"{outcome.table_id}, result {outcome.result_id}"
+            )
+        else:
+            print(f"{outcome.file_id}: failed, {outcome.error}")
+    print(f"{len(report.succeeded)} of {len(report.files)} files loaded.")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
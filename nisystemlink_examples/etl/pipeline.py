@@ -0,0 +1,348 @@
+"""This module runs the extract, transform and load steps of many files concurrently.
+
+Classes:
+    FileOutcome: What the pipeline created for one file, or why it failed.
+    EtlReport: The outcome of a pipeline run.
+
+Functions:
+    run_etl: Loads many CSV files into data tables and links them to test results.
+"""
+
+import contextlib
+import os
+import queue
+import shutil
+import tempfile
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas  # type: ignore[import-untyped]
+import requests
+
+from ..dataframe import (
+    DataFrameClient,
+    infer_columns,
+    ingest_csv,
+    validate_columns,
+    widen_columns,
+)
+from ..files import FileClient
+from ..testmonitor import TestDataManagerClient
+from ..testmonitor.payloads import PASSED_STATUS
+
+MAX_RESULTS_PER_REQUEST = 1000
+
+
+@dataclass
+class FileOutcome:
+    """What the pipeline created for one file, or why it failed.
+
+    Attributes:
+        file_id: The ID of the file.
+        file_name: The name of the downloaded file.
+        table_id: The ID of the data table holding the rows of the file.
+        row_count: The number of rows appended to the table.
+        result_id: The ID of the test result linking the file and the table.
+        error: The error that stopped the file, or None if it was loaded.
+    """
+
+    file_id: str
+    file_name: Optional[str] = None
+    table_id: Optional[str] = None
+    row_count: int = 0
+    result_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class EtlReport:
+    """The outcome of a pipeline run.
+
+    Attributes:
+        files: The outcome of every file, in the order the file IDs were given.
+    """
+
+    files: List[FileOutcome] = field(default_factory=list)
+
+    @property
+    def succeeded(self) -> List[FileOutcome]:
+        """The files that were loaded and linked to a test result."""
+        return [outcome for outcome in self.files if outcome.error is None]
+
+    @property
+    def failed(self) -> List[FileOutcome]:
+        """The files that could not be loaded."""
+        return [outcome for outcome in self.files if outcome.error is not None]
+
+    def scrapbook_result(self) -> List[Dict[str, Any]]:
+        """Summarizes the run in the format of the SystemLink notebook output.
+
+        Returns:
+            The value to be passed to `scrapbook.glue("result", ...)`.
+        """
+        return [
+            {"type": "scalar", "id": "Files", "value": len(self.files)},
+            {"type": "scalar", "id": "Loaded Files", "value": len(self.succeeded)},
+            {"type": "scalar", "id": "Failed Files", "value": len(self.failed)},
+            {
+                "type": "scalar",
+                "id": "Rows",
+                "value": sum(outcome.row_count for outcome in self.files),
+            },
+        ]
+
+
+_Job = Tuple[FileOutcome, Optional[str]]
+_STOP = None
+
+
+class _Stage:
+    """Runs a function on the jobs of a bounded queue in worker threads.
+
+    The jobs returned by the function are put into the queue of the next stage, so a
+    slow stage blocks the stages in front of it instead of piling up their output.
+    """
+
+    def __init__(
+        self,
+        work: Callable[[_Job], _Job],
+        workers: int,
+        queue_size: int,
+        next_stage: Optional["_Stage"] = None,
+    ):
+        self._work = work
+        self._queue: "queue.Queue[Optional[_Job]]" = queue.Queue(queue_size)
+        self._next_stage = next_stage
+        self._threads = [
+            threading.Thread(target=self._run, daemon=True) for _ in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def put(self, job: _Job) -> None:
+        self._queue.put(job)
+
+    def close(self) -> None:
+        """Waits for all queued jobs and then closes the next stage."""
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        if self._next_stage is not None:
+            self._next_stage.close()
+
+    def _run(self) -> None:
+        while (job := self._queue.get()) is not _STOP:
+            outcome = job[0]
+            if outcome.error is None:
+                try:
+                    job = self._work(job)
+                except Exception as e:
+                    outcome.error = str(e) or type(e).__name__
+            if self._next_stage is not None:
+                self._next_stage.put(job)
+
+
+def _table_columns(
+    names: List[str], column_types: Sequence[str]
+) -> List[Dict[str, Any]]:
+    if len(names) != len(column_types):
+        raise ValueError(
+            f"The file has {len(names)} columns, but {len(column_types)} column types "
+            "were given."
+        )
+    columns = [
+        {
+            "name": str(name),
+            "dataType": data_type,
+            "columnType": "NULLABLE" if index else "INDEX",
+        }
+        for index, (name, data_type) in enumerate(zip(names, column_types))
+    ]
+    validate_columns(columns)
+    return columns
+
+
+def _widen_file_columns(
+    path: str,
+    columns: List[Dict[str, Any]],
+    chunk_size: int,
+    read_csv_arguments: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Widens inferred columns to hold every row of a file, read as text."""
+    arguments = dict(read_csv_arguments, dtype=str, chunksize=chunk_size)
+    with pandas.read_csv(path, **arguments) as chunks:
+        for chunk in chunks:
+            columns = widen_columns(columns, chunk)
+    return columns
+
+
+def _create_results(
+    client: TestDataManagerClient,
+    outcomes: List[FileOutcome],
+    result_fields: Dict[str, Any],
+    workspace: Optional[str],
+) -> None:
+    """Creates one test result per loaded file in as few requests as possible."""
+    for start in range(0, len(outcomes), MAX_RESULTS_PER_REQUEST):
+        batch = outcomes[start : start + MAX_RESULTS_PER_REQUEST]
+        results = []
+        for outcome in batch:
+            result = {
+                "programName": "Simple ETL Example",
+                "status": dict(PASSED_STATUS),
+                **result_fields,
+                "fileIds": [outcome.file_id],
+                "dataTableIds": [outcome.table_id],
+            }
+            if workspace is not None:
+                result["workspace"] = workspace
+            results.append(result)
+        try:
+            response = client.create_results(results)
+        except Exception as e:
+            for outcome in batch:
+                outcome.error = str(e)
+            continue
+        # Table IDs are unique even if a file ID was given more than once.
+        by_table_id = {outcome.table_id: outcome for outcome in batch}
+        for result in response.get("results") or []:
+            table_id = (result.get("dataTableIds") or [None])[0]
+            if table_id in by_table_id:
+                by_table_id.pop(table_id).result_id = result.get("id")
+        message = (response.get("error") or {}).get("message", "No result created.")
+        for outcome in by_table_id.values():
+            outcome.error = message
+
+
+def run_etl(
+    base_url: str,
+    api_key: str,
+    file_ids: Sequence[str],
+    workspace: Optional[str] = None,
+    column_types: Optional[Sequence[str]] = None,
+    sample_rows: int = 1000,
+    result_fields: Optional[Dict[str, Any]] = None,
+    download_workers: int = 4,
+    load_workers: int = 4,
+    queue_size: int = 8,
+    chunk_size: int = 100_000,
+    work_directory: Optional[str] = None,
+    **read_csv_arguments: Any,
+) -> EtlReport:
+    """Loads many CSV files into data tables and links each to a new test result.
+
+    This runs the steps of the Simple ETL notebook for any number of files. Files are
+    downloaded by one pool of workers and loaded into data tables by another, so
+    downloads overlap with the uploads of earlier files. The stages are connected by
+    queues of at most `queue_size` files, which bounds the disk space used by
+    downloaded files waiting to be loaded. Every file is removed once it is loaded.
+    The test results of all loaded files are created together at the end.
+
+    A file that fails in any step is recorded in the report and skipped, without
+    stopping the other files. A table the file was partly loaded into is deleted.
+
+    Args:
+        base_url: The server URL including the scheme, host, and port if not default.
+        api_key: The API key used to authenticate against the server.
+        file_ids: The IDs of the CSV files.
+        workspace: The ID of the workspace of the tables and results, or None for
+            the default workspace.
+        column_types: The data type of every column of the files, with the first
+            column as the index of the table. By default, the columns of every file
+            are inferred from its first `sample_rows` rows with `infer_columns`. If a
+            later row does not fit them, the file is loaded again into a table with
+            the columns widened by `widen_columns`.
+        sample_rows: The number of rows the columns are inferred from.
+        result_fields: Fields of the created test results, such as `partNumber`.
+        download_workers: The number of files downloaded at the same time.
+        load_workers: The number of files loaded into data tables at the same time.
+        queue_size: The maximum number of files waiting between two stages.
+        chunk_size: The number of rows sent per append request.
+        work_directory: The directory the files are downloaded to. Defaults to a
+            temporary directory.
+        **read_csv_arguments: Further arguments passed to `pandas.read_csv`, e.g.
+            `index_col=0` to skip an unnamed index column.
+
+    Returns:
+        The tables and results created for every file and the errors of the files
+        that failed.
+    """
+    report = EtlReport([FileOutcome(file_id) for file_id in file_ids])
+    file_client = FileClient(base_url, api_key)
+    dataframe_client = DataFrameClient(base_url, api_key, pool_maxsize=load_workers)
+    testmonitor_client = TestDataManagerClient(base_url, api_key)
+
+    def download(job: _Job) -> _Job:
+        outcome, _ = job
+        # Every job gets its own directory, as a file ID may be given more than once.
+        directory = tempfile.mkdtemp(dir=directory_root)
+        path = file_client.download(outcome.file_id, directory, resume=False)
+        outcome.file_name = os.path.basename(path)
+        return outcome, path
+
+    def load_table(
+        outcome: FileOutcome, path: str, columns: List[Dict[str, Any]]
+    ) -> None:
+        """Loads a file into a new table, which is deleted if the file fails."""
+        table_id = dataframe_client.create_table(
+            columns,
+            name=outcome.file_name,
+            workspace=workspace,
+        )
+        try:
+            outcome.row_count = ingest_csv(
+                dataframe_client,
+                table_id,
+                path,
+                chunk_size,
+                columns,
+                **read_csv_arguments,
+            )
+        except Exception:
+            with contextlib.suppress(requests.RequestException):
+                dataframe_client.delete_table(table_id)
+            raise
+        outcome.table_id = table_id
+
+    def load(job: _Job) -> _Job:
+        outcome, path = job
+        assert path is not None
+        try:
+            if column_types is not None:
+                header = pandas.read_csv(path, nrows=0, **read_csv_arguments)
+                columns = _table_columns(list(header.columns), column_types)
+                load_table(outcome, path, columns)
+                return outcome, None
+            sample = pandas.read_csv(path, nrows=sample_rows, **read_csv_arguments)
+            columns = infer_columns(sample)
+            try:
+                load_table(outcome, path, columns)
+            except ValueError:
+                # A row after the sample does not fit the inferred columns.
+                widened = _widen_file_columns(
+                    path, columns, chunk_size, read_csv_arguments
+                )
+                if widened == columns:
+                    raise
+                load_table(outcome, path, widened)
+        finally:
+            shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+        return outcome, None
+
+    with tempfile.TemporaryDirectory(dir=work_directory) as directory_root:
+        try:
+            loader = _Stage(load, load_workers, queue_size)
+            downloader = _Stage(download, download_workers, queue_size, loader)
+            for outcome in report.files:
+                downloader.put((outcome, None))
+            downloader.close()
+            _create_results(
+                testmonitor_client, report.succeeded, result_fields or {}, workspace
+            )
+        finally:
+            file_client.close()
+            dataframe_client.close()
+            testmonitor_client.close()
+    return report
@@ -0,0 +1,11 @@
+"""File utilities for SystemLink Enterprise demo package.
+
+This module provides a client that streams files from the SystemLink File service to
+disk or to incremental readers, resuming interrupted downloads.
+"""
+
+from .client import FileClient
+
+__all__ = [
+    "FileClient",
+]
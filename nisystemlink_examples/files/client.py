@@ -0,0 +1,197 @@
+"""This module provides a streaming HTTP client for the SystemLink File v1 API.
+
+Classes:
+    FileClient: Streams file downloads to disk or to a reader without buffering the
+        whole file in memory.
+"""
+
+import contextlib
+import os
+import tempfile
+from email.message import Message
+from typing import Any, BinaryIO, cast, Iterator, Optional
+
+import requests
+
+from ..session import create_session
+
+FILE_DATA_ROUTE = "nifile/v1/service-groups/Default/files/{file_id}/data"
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Errors raised while the body of a download is read, after which the download can be
+# resumed from the bytes already written.
+_INTERRUPTED = (
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ConnectionError,
+)
+
+
+def _file_name(response: requests.Response) -> Optional[str]:
+    message = Message()
+    message["Content-Disposition"] = response.headers.get("Content-Disposition", "")
+    name = message.get_filename()
+    return os.path.basename(name) if name else None
+
+
+def _total_size(response: requests.Response, offset: int) -> Optional[int]:
+    content_range = response.headers.get("Content-Range", "")
+    if "/" in content_range and not content_range.endswith("/*"):
+        return int(content_range.rsplit("/", 1)[1])
+    length = response.headers.get("Content-Length")
+    return offset + int(length) if length is not None else None
+
+
+class FileClient:
+    """Client for the File v1 routes of one SystemLink Enterprise server.
+
+    Downloads are streamed in chunks, so files of any size are downloaded with constant
+    memory. Interrupted downloads continue where they stopped with an HTTP range
+    request instead of starting over.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: Optional[float] = None,
+    ):
+        """Initializes the client.
+
+        Args:
+            base_url: The server URL including the scheme, host, and port if not default.
+            api_key: The API key used to authenticate against the server.
+            max_retries: How often a request rejected with 429 or 503 is retried, and
+                how often an interrupted download is resumed.
+            backoff_factor: The base delay in seconds of the exponential retry backoff.
+            timeout: The timeout in seconds for connecting and for every read, or None
+                to wait forever.
+        """
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.session = create_session(
+            api_key, max_retries=max_retries, backoff_factor=backoff_factor
+        )
+
+    def __enter__(self) -> "FileClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes all pooled connections."""
+        self.session.close()
+
+    @contextlib.contextmanager
+    def open(self, file_id: str) -> Iterator[BinaryIO]:
+        """Opens the content of a file as a binary stream read from the network.
+
+        The stream can be passed to readers that read incrementally, such as
+        `pandas.read_csv` with a `chunksize` or `ingest_csv`, so the file is never
+        held in memory or written to disk. Interrupted streams are not resumed.
+
+        Args:
+            file_id: The ID of the file.
+
+        Yields:
+            The content of the file.
+        """
+        with self._get(file_id) as response:
+            response.raw.decode_content = True
+            yield cast(BinaryIO, response.raw)
+
+    def download(
+        self,
+        file_id: str,
+        destination: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        resume: bool = True,
+    ) -> str:
+        """Downloads a file to disk in chunks.
+
+        If the connection breaks, the download is resumed from the bytes already
+        written, up to `max_retries` times. With `resume`, an incomplete file left at
+        the destination by an earlier call is completed instead of downloaded again.
+        A file larger than the file on the server is replaced.
+
+        Args:
+            file_id: The ID of the file.
+            destination: The path of the downloaded file, or a directory to download
+                the file into under its name on the server. Defaults to a new
+                temporary directory, which the caller is responsible for removing.
+            chunk_size: The number of bytes written at a time.
+            resume: Whether an existing file at the destination is continued.
+
+        Returns:
+            The path of the downloaded file.
+
+        Raises:
+            requests.HTTPError: The server rejected the download.
+            requests.ConnectionError: The download was interrupted more than
+                `max_retries` times.
+        """
+        path = None
+        if destination is not None and not os.path.isdir(destination):
+            path = destination
+        offset = (
+            os.path.getsize(path) if resume and path and os.path.exists(path) else 0
+        )
+
+        attempt = 0
+        while True:
+            try:
+                with self._get(file_id, offset) as response:
+                    if response.status_code == 416:
+                        assert path is not None
+                        content_range = response.headers.get("Content-Range", "")
+                        if content_range == f"bytes */{offset}":
+                            # The file at the destination is already complete.
+                            return path
+                        # The file at the destination is larger than the file on
+                        # the server, so it is not a part of it. Download it again.
+                        offset = 0
+                        continue
+                    if path is None:
+                        directory = destination or tempfile.mkdtemp()
+                        path = os.path.join(directory, _file_name(response) or file_id)
+                    if response.status_code != 206:
+                        offset = 0
+                    total = _total_size(response, offset)
+                    with open(path, "ab" if offset else "wb") as file:
+                        for chunk in response.iter_content(chunk_size):
+                            file.write(chunk)
+                            offset += len(chunk)
+                if total is None or offset >= total:
+                    return path
+                if attempt >= self.max_retries:
+                    raise requests.ConnectionError(
+                        f"Download of file {file_id} ended after {offset} of "
+                        f"{total} bytes."
+                    )
+            except _INTERRUPTED as error:
+                if path is None:
+                    raise
+                if attempt >= self.max_retries:
+                    raise requests.ConnectionError(
+                        f"Download of file {file_id} was interrupted "
+                        f"{attempt + 1} times."
+                    ) from error
+            if os.path.exists(path):
+                offset = os.path.getsize(path)
+            attempt += 1
+
+    def _get(self, file_id: str, offset: int = 0) -> requests.Response:
+        headers = {"Range": f"bytes={offset}-"} if offset else {}
+        response = self.session.get(
+            self.base_url + FILE_DATA_ROUTE.format(file_id=file_id),
+            headers=headers,
+            stream=True,
+            timeout=self.timeout,
+        )
+        if response.status_code == 416 and offset:
+            return response
+        response.raise_for_status()
+        return response
@@ -0,0 +1,15 @@
+"""Load generation utilities for SystemLink Enterprise demo package.
+
+This module simulates many test stations that publish results and steps to the
+SystemLink Test Monitor service, and reports the achieved throughput, request latency
+and error rate. Run `python -m nisystemlink_examples.loadgen --help` for the command line.
+"""
+
+from .runner import LoadReport, run_load, run_station, StationStats
+
+__all__ = [
+    "LoadReport",
+    "StationStats",
+    "run_load",
+    "run_station",
+]
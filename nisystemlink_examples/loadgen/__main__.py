@@ -0,0 +1,71 @@
+"""Command line entry point of the load generator.
+
+Example:
+    python -m nisystemlink_examples.loadgen --server http://localhost:8080
+        --api-key key --stations 8 --sequences 100 --rate 2
+"""
+
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from .runner import run_load
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Runs the load generator and prints its report.
+
+    Args:
+        argv: The command line arguments. Defaults to `sys.argv`.
+
+    Returns:
+        The exit code, which is 1 if any request failed.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m nisystemlink_examples.loadgen",
+        description="Simulates test stations publishing results to SystemLink.",
+    )
+    parser.add_argument(
+        "--server", required=True, help="The server URL, e.g. http://localhost:8080."
+    )
+    parser.add_argument(
+        "--api-key",
+        default=os.environ.get("SYSTEMLINK_API_KEY", ""),
+        help="The API key. Defaults to the SYSTEMLINK_API_KEY environment variable.",
+    )
+    parser.add_argument("--stations", type=int, default=4)
+    parser.add_argument("--sequences", type=int, default=10, help="Per station.")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=0.0,
+        help="Sequences per second and station. 0 runs them back to back.",
+    )
+    parser.add_argument("--currents", type=int, default=10)
+    parser.add_argument("--voltages", type=int, default=10)
+    parser.add_argument("--steps-per-request", type=int, default=1000)
+    parser.add_argument(
+        "--processes", type=int, default=None, help="Defaults to one per station."
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    report = run_load(
+        args.server,
+        args.api_key,
+        stations=args.stations,
+        sequences=args.sequences,
+        rate=args.rate,
+        currents=args.currents,
+        voltages=args.voltages,
+        steps_per_request=args.steps_per_request,
+        processes=args.processes,
+        seed=args.seed,
+    )
+    print(report.summary())
+    return 1 if report.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
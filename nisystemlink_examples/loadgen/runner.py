@@ -0,0 +1,272 @@
+"""This module runs simulated test stations against the Test Monitor service.
+
+Classes:
+    StationStats: The requests sent by one simulated station and their outcome.
+    LoadReport: The throughput, latencies and errors of a load run.
+
+Functions:
+    run_station: Simulates one test station uploading its sequences.
+    run_load: Simulates many test stations in a process pool.
+"""
+
+import socket
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import requests
+
+from ..testdata import Simulator
+from ..testmonitor import TestDataManagerClient
+
+DEFAULT_PERCENTILES = (50.0, 90.0, 99.0)
+
+
+@dataclass
+class StationStats:
+    """The requests sent by one simulated station and their outcome.
+
+    Attributes:
+        results: The number of results created.
+        steps: The number of steps created.
+        latencies: The duration of every request in seconds.
+        errors: The number of failed or partially failed requests.
+        started_at: The wall clock time the station started, in seconds since the epoch.
+        finished_at: The wall clock time the station finished.
+    """
+
+    results: int = 0
+    steps: int = 0
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+
+@dataclass
+class LoadReport:
+    """The throughput, latencies and errors of a load run.
+
+    Attributes:
+        stations: The number of simulated stations.
+        duration: The time in seconds from the first station start to the last finish.
+        results: The number of results created.
+        steps: The number of steps created.
+        requests: The number of requests sent.
+        errors: The number of failed or partially failed requests.
+        latencies: The duration of every request in seconds.
+    """
+
+    stations: int
+    duration: float
+    results: int
+    steps: int
+    requests: int
+    errors: int
+    latencies: np.ndarray
+
+    @classmethod
+    def from_stations(cls, stats: Sequence[StationStats]) -> "LoadReport":
+        """Combines the statistics of all stations of a run."""
+        latencies = [latency for station in stats for latency in station.latencies]
+        started_at = min((station.started_at for station in stats), default=0.0)
+        finished_at = max((station.finished_at for station in stats), default=0.0)
+        return cls(
+            stations=len(stats),
+            duration=finished_at - started_at,
+            results=sum(station.results for station in stats),
+            steps=sum(station.steps for station in stats),
+            requests=len(latencies),
+            errors=sum(station.errors for station in stats),
+            latencies=np.asarray(latencies, dtype=float),
+        )
+
+    def _per_second(self, count: int) -> float:
+        return count / self.duration if self.duration > 0 else 0.0
+
+    @property
+    def results_per_second(self) -> float:
+        """The achieved result throughput."""
+        return self._per_second(self.results)
+
+    @property
+    def steps_per_second(self) -> float:
+        """The achieved step throughput."""
+        return self._per_second(self.steps)
+
+    @property
+    def requests_per_second(self) -> float:
+        """The achieved request throughput."""
+        return self._per_second(self.requests)
+
+    @property
+    def error_rate(self) -> float:
+        """The fraction of requests that failed."""
+        return self.errors / self.requests if self.requests else 0.0
+
+    def latency_percentiles(
+        self, percentiles: Sequence[float] = DEFAULT_PERCENTILES
+    ) -> Dict[float, float]:
+        """Returns the request latency in seconds at each of the given percentiles."""
+        if not len(self.latencies):
+            return {percentile: 0.0 for percentile in percentiles}
+        values = np.percentile(self.latencies, percentiles)
+        return dict(zip(percentiles, values.tolist()))
+
+    def summary(self) -> str:
+        """Formats the report as human-readable text."""
+        latencies = ", ".join(
+            f"p{percentile:g} {value * 1000:.1f} ms"
+            for percentile, value in self.latency_percentiles().items()
+        )
+        return "\n".join(
+            [
+                f"Stations:   {self.stations}",
+                f"Duration:   {self.duration:.2f} s",
+                f"Results:    {self.results} ({self.results_per_second:.1f}/s)",
+                f"Steps:      {self.steps} ({self.steps_per_second:.1f}/s)",
+                f"Requests:   {self.requests} ({self.requests_per_second:.1f}/s)",
+                f"Errors:     {self.errors} ({self.error_rate:.2%})",
+                f"Latency:    {latencies}",
+            ]
+        )
+
+
+def _timed(
+    stats: StationStats, send: Callable[..., Dict[str, Any]], *args: Any
+) -> Optional[Dict[str, Any]]:
+    """Sends a request, records its latency and returns None if it failed."""
+    start = time.perf_counter()
+    try:
+        response = send(*args)
+    except requests.RequestException:
+        response = None
+    stats.latencies.append(time.perf_counter() - start)
+    if response is None or "error" in response:
+        stats.errors += 1
+    return response
+
+
+def run_station(
+    base_url: str,
+    api_key: str,
+    station: int,
+    sequences: int,
+    rate: float = 0.0,
+    currents: int = 10,
+    voltages: int = 10,
+    steps_per_request: int = 1000,
+    seed: Optional[int] = None,
+) -> StationStats:
+    """Simulates one test station uploading its sequences.
+
+    Each sequence creates a result, creates its steps level by level in requests of at
+    most `steps_per_request` steps, and finally updates the result status.
+
+    Args:
+        base_url: The server URL including the scheme, host, and port if not default.
+        api_key: The API key used to authenticate against the server.
+        station: The number of the station, used in its system ID.
+        sequences: The number of sequences the station runs.
+        rate: The number of sequences started per second, or 0 to run them back to back.
+        currents: The number of currents swept per sequence.
+        voltages: The number of voltages swept at every current.
+        steps_per_request: The maximum number of steps created per request.
+        seed: The seed of the simulator, for reproducible measurements.
+
+    Returns:
+        The statistics of the requests the station sent.
+    """
+    simulator = Simulator(currents=range(currents), voltages=range(voltages), seed=seed)
+    hostname = socket.gethostname()
+    stats = StationStats(started_at=time.time())
+    start = time.perf_counter()
+    with TestDataManagerClient(base_url, api_key) as client:
+        for index in range(sequences):
+            if rate > 0:
+                time.sleep(max(0.0, start + index / rate - time.perf_counter()))
+            sequence = simulator.simulate_sequence(
+                part_number="NI-ABC-123-PWR",
+                serial_number=str(uuid.uuid4()),
+                test_plan_id="",
+                system_id=f"loadgen-station-{station}",
+                test_program="Power Test",
+                operator="loadgen",
+                hostname=hostname,
+            )
+            result = sequence.to_result()
+            response = _timed(stats, client.create_results, [result])
+            if not response or not response.get("results"):
+                continue
+            stats.results += 1
+            result_id = response["results"][0]["id"]
+
+            for level in sequence.to_step_tree(result_id).levels():
+                for offset in range(0, len(level), steps_per_request):
+                    chunk = level[offset : offset + steps_per_request]
+                    response = _timed(stats, client.create_steps, chunk)
+                    if response:
+                        stats.steps += len(response.get("steps") or [])
+            _timed(
+                stats,
+                client.update_results,
+                [{"id": result_id, "status": sequence.status}],
+            )
+    stats.finished_at = time.time()
+    return stats
+
+
+def run_load(
+    base_url: str,
+    api_key: str,
+    stations: int = 4,
+    sequences: int = 10,
+    rate: float = 0.0,
+    currents: int = 10,
+    voltages: int = 10,
+    steps_per_request: int = 1000,
+    processes: Optional[int] = None,
+    seed: Optional[int] = None,
+) -> LoadReport:
+    """Simulates many test stations in a process pool.
+
+    Every station runs in a worker process of its own if there are enough processes,
+    so the simulation and payload building of the stations do not compete for the GIL.
+
+    Args:
+        base_url: The server URL including the scheme, host, and port if not default.
+        api_key: The API key used to authenticate against the server.
+        stations: The number of simulated stations.
+        sequences: The number of sequences each station runs.
+        rate: The number of sequences each station starts per second, or 0 to run them
+            back to back.
+        currents: The number of currents swept per sequence.
+        voltages: The number of voltages swept at every current.
+        steps_per_request: The maximum number of steps created per request.
+        processes: The number of worker processes. Defaults to one per station.
+        seed: The base seed of the simulators. Station `n` uses `seed + n`.
+
+    Returns:
+        The combined throughput, latencies and errors of all stations.
+    """
+    with ProcessPoolExecutor(max_workers=processes or stations) as executor:
+        futures = [
+            executor.submit(
+                run_station,
+                base_url,
+                api_key,
+                station,
+                sequences,
+                rate,
+                currents,
+                voltages,
+                steps_per_request,
+                None if seed is None else seed + station,
+            )
+            for station in range(stations)
+        ]
+        stats = [future.result() for future in futures]
+    return LoadReport.from_stations(stats)
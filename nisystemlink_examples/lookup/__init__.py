@@ -0,0 +1,13 @@
+"""Lookup utilities for SystemLink Enterprise demo package.
+
+This module caches slowly changing reference data, such as systems, workspaces and
+asset locations, for a time to live and across notebook runs, so resolving an ID is a
+dictionary lookup instead of a query.
+"""
+
+from .cache import LookupCache, query_fetcher
+
+__all__ = [
+    "LookupCache",
+    "query_fetcher",
+]
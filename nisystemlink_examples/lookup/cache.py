@@ -0,0 +1,292 @@
+"""This module caches slowly changing reference data, such as systems and workspaces.
+
+Classes:
+    LookupCache: Holds entities by ID for a time to live, evicting the least recently
+        used ones, and optionally keeps them on disk across runs.
+
+Functions:
+    query_fetcher: Builds the bulk fetch function of a cache from a paged query.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from ..query import equals_any, query_by_ids
+from ..query.chunked import DEFAULT_IDS_PER_QUERY, FilterBuilder
+
+Fetch = Callable[[Sequence[str]], Mapping[str, Any]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value TEXT,
+    fetched_at REAL NOT NULL
+);
+"""
+
+# Marks IDs the fetch function did not return, so they are not fetched again until
+# their time to live ends.
+_MISSING = object()
+
+
+class LookupCache:
+    """Holds entities by ID for a time to live, evicting the least recently used ones.
+
+    Lookups of cached entities are dictionary hits. Entities that are not cached, or
+    older than `ttl`, are fetched in one bulk call for all IDs of a lookup. IDs the
+    fetch function does not return are remembered as missing for the same time, so
+    unknown IDs are not queried over and over.
+
+    Use one cache per kind of entity, each with the time to live that suits how often
+    the entities change. With a `path`, the entities are also written to a SQLite
+    database and loaded by the next run, which requires values that can be stored as
+    JSON, such as the dictionaries returned by the SystemLink APIs.
+    """
+
+    def __init__(
+        self,
+        fetch: Fetch,
+        ttl: float = 3600.0,
+        max_entries: Optional[int] = None,
+        path: Optional[str] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initializes the cache, loading the fresh entries of the database at `path`.
+
+        Args:
+            fetch: The function fetching entities by ID. It returns the entities by
+                their ID, and may return more entities than were asked for.
+            ttl: The time to live of an entity in seconds.
+            max_entries: The maximum number of cached entities. The least recently
+                used entities are evicted first.
+            path: The path of the SQLite database the entities are kept in across
+                runs, or None to keep them in memory only.
+            clock: The function returning the current time in seconds.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._fetch = fetch
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._connection: Optional[sqlite3.Connection] = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(_SCHEMA)
+            self._load()
+
+    def __enter__(self) -> "LookupCache":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._fresh(key) is not None
+
+    def close(self) -> None:
+        """Closes the database."""
+        if self._connection is not None:
+            self._connection.close()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Looks up an entity, fetching it if it is not cached.
+
+        Args:
+            key: The ID of the entity.
+            default: The value returned if the entity does not exist.
+
+        Returns:
+            The entity, or `default` if it does not exist.
+        """
+        return self.get_many([key]).get(key, default)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """Looks up entities, fetching those that are not cached in one call.
+
+        Args:
+            keys: The IDs of the entities.
+
+        Returns:
+            The entities that exist, by their ID.
+        """
+        found: Dict[str, Any] = {}
+        stale: List[str] = []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                entry = self._fresh(key)
+                if entry is None:
+                    stale.append(key)
+                elif entry[0] is not _MISSING:
+                    found[key] = entry[0]
+        if stale:
+            fetched = self.prefetch(stale)
+            found.update((key, fetched[key]) for key in stale if key in fetched)
+        return found
+
+    def prefetch(self, keys: Sequence[str]) -> Dict[str, Any]:
+        """Fetches entities in one call and caches them, whether they are cached or not.
+
+        Args:
+            keys: The IDs of the entities, e.g. all systems used by a notebook run.
+
+        Returns:
+            The fetched entities by their ID.
+        """
+        fetched = dict(self._fetch(keys))
+        entries: Dict[str, Any] = {key: _MISSING for key in keys}
+        entries.update(fetched)
+        self.update(entries)
+        return fetched
+
+    def update(self, entities: Mapping[str, Any]) -> None:
+        """Caches entities that were fetched elsewhere.
+
+        Args:
+            entities: The entities by their ID.
+        """
+        now = self._clock()
+        with self._lock:
+            for key, value in entities.items():
+                self._entries[key] = (value, now)
+                self._entries.move_to_end(key)
+            evicted = []
+            while (
+                self.max_entries is not None and len(self._entries) > self.max_entries
+            ):
+                evicted.append(self._entries.popitem(last=False)[0])
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.executemany(
+                        "INSERT OR REPLACE INTO entries VALUES (?, ?, ?)",
+                        (
+                            (key, _dump(value), now)
+                            for key, value in entities.items()
+                            if key in self._entries
+                        ),
+                    )
+                    self._connection.executemany(
+                        "DELETE FROM entries WHERE key = ?", ((k,) for k in evicted)
+                    )
+
+    def invalidate(self, keys: Optional[Iterable[str]] = None) -> None:
+        """Removes entities from the cache, so they are fetched again.
+
+        Args:
+            keys: The IDs of the entities, or None to remove every entity.
+        """
+        with self._lock:
+            if keys is None:
+                self._entries.clear()
+                if self._connection is not None:
+                    with self._connection:
+                        self._connection.execute("DELETE FROM entries")
+                return
+            removed = list(keys)
+            for key in removed:
+                self._entries.pop(key, None)
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.executemany(
+                        "DELETE FROM entries WHERE key = ?", ((k,) for k in removed)
+                    )
+
+    def _fresh(self, key: str) -> Optional[Tuple[Any, float]]:
+        """Returns the entry of a key and marks it as recently used, if it is fresh."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if self._clock() - entry[1] >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _load(self) -> None:
+        assert self._connection is not None
+        cutoff = self._clock() - self.ttl
+        with self._connection:
+            self._connection.execute(
+                "DELETE FROM entries WHERE fetched_at <= ?", (cutoff,)
+            )
+        rows = self._connection.execute(
+            "SELECT key, value, fetched_at FROM entries ORDER BY fetched_at"
+        ).fetchall()
+        for key, value, fetched_at in rows:
+            self._entries[key] = (
+                _MISSING if value is None else json.loads(value),
+                fetched_at,
+            )
+        while self.max_entries is not None and len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+def _dump(value: Any) -> Optional[str]:
+    return None if value is _MISSING else json.dumps(value)
+
+
+def query_fetcher(
+    query: Callable[[Any], Any],
+    request: Any,
+    items_field: str,
+    build_filter: FilterBuilder = equals_any("id"),
+    key: str = "id",
+    ids_per_query: int = DEFAULT_IDS_PER_QUERY,
+    max_workers: int = 4,
+) -> Fetch:
+    """Builds the bulk fetch function of a cache from a paged query.
+
+    The IDs of a fetch are queried with `query_by_ids`, in concurrent queries of
+    bounded filters.
+
+    Args:
+        query: The function sending the query, e.g. `SystemsClient.query_systems`.
+        request: The request of the query without the IDs, e.g. a query of systems
+            projecting `new(id,alias)`.
+        items_field: The name of the response field holding the items of a page.
+        build_filter: The function building the filter of a chunk of IDs.
+        key: The field of the items holding their ID.
+        ids_per_query: The maximum number of IDs per query.
+        max_workers: The maximum number of queries running at the same time.
+
+    Returns:
+        The fetch function, returning the items by their ID.
+    """
+
+    def item_key(item: Any) -> Any:
+        return item.get(key) if isinstance(item, dict) else getattr(item, key, None)
+
+    def fetch(ids: Sequence[str]) -> Dict[str, Any]:
+        items = query_by_ids(
+            query,
+            request,
+            items_field,
+            ids,
+            build_filter,
+            ids_per_query,
+            max_workers,
+            key=item_key,
+        )
+        return {item_key(item): item for item in items}
+
+    return fetch
@@ -0,0 +1,15 @@
+"""Mock server for SystemLink Enterprise demo package.
+
+This module provides an in-memory stand-in for the Test Monitor, DataFrame and File
+routes of a SystemLink Enterprise server, with configurable latency and error
+injection, so the clients of this package can be tested and benchmarked offline. Run
+`python -m nisystemlink_examples.mockserver --help` to serve it on a local port.
+"""
+
+from .filters import compile_filter
+from .server import MockSystemLinkServer
+
+__all__ = [
+    "MockSystemLinkServer",
+    "compile_filter",
+]
@@ -0,0 +1,70 @@
+"""Command line entry point of the mock server.
+
+Example:
+    python -m nisystemlink_examples.mockserver --port 8080 --latency 0.01
+"""
+
+import argparse
+import sys
+import threading
+from typing import List, Optional
+
+from .server import MockSystemLinkServer
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Serves the mock server until interrupted.
+
+    Args:
+        argv: The command line arguments. Defaults to `sys.argv`.
+
+    Returns:
+        The exit code.
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m nisystemlink_examples.mockserver",
+        description="Serves SystemLink Test Monitor, DataFrame and File routes locally.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to every request."
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        help="Probability that a request is rejected with --error-status.",
+    )
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument(
+        "--partial-failure-rate",
+        type=float,
+        default=0.0,
+        help="Probability that an item of a batch request is rejected.",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    server = MockSystemLinkServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        partial_failure_rate=args.partial_failure_rate,
+        seed=args.seed,
+    )
+    server.start()
+    print(f"Serving on {server.url}. Press Ctrl+C to stop.")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
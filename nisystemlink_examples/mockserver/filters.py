@@ -0,0 +1,182 @@
+"""This module evaluates the subset of the SystemLink query language used by this package.
+
+Functions:
+    compile_filter: Compiles a query filter into a predicate over stored items.
+"""
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+Predicate = Callable[[Dict[str, Any]], bool]
+
+_STRING = r'"(?:[^"\\]|\\.)*"'
+_TOKEN = re.compile(
+    rf"\s*(?:(?P<string>{_STRING})|(?P<number>-?\d+(?:\.\d+)?)|(?P<substitution>@\d+)"
+    r"|(?P<operator>==|!=|>=|<=|>|<|&&|\|\||\(|\))"
+    rf"|(?P<word>[A-Za-z_][\w.]*(?:\[{_STRING}\](?:\.[A-Za-z_][\w.]*)?)*))"
+)
+# The names of a field path, e.g. `properties["Serial Number"]` or `status.statusType`.
+_PATH_NAME = re.compile(rf"\[(?P<quoted>{_STRING})\]|(?P<name>[^.\[\]]+)")
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    ">": lambda a, b: a is not None and b is not None and a > b,
+    ">=": lambda a, b: a is not None and b is not None and a >= b,
+    "<": lambda a, b: a is not None and b is not None and a < b,
+    "<=": lambda a, b: a is not None and b is not None and a <= b,
+}
+_LITERALS = {"true": True, "false": False, "null": None}
+
+
+def _tokenize(text: str) -> List[str]:
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if not match:
+            raise ValueError(f"Unsupported filter syntax at {text[position:]!r}.")
+        tokens.append(match.group(match.lastgroup or 0))
+        position = match.end()
+    return tokens
+
+
+def _unquote(token: str) -> str:
+    return re.sub(r"\\(.)", r"\1", token[1:-1])
+
+
+def _field(item: Dict[str, Any], path: str) -> Any:
+    """Looks up a field path, ignoring the case of the names."""
+    value: Any = item
+    for match in _PATH_NAME.finditer(path):
+        quoted = match.group("quoted")
+        name = _unquote(quoted) if quoted else match.group("name")
+        if not isinstance(value, dict):
+            return None
+        keys = {key.lower(): key for key in value}
+        value = value.get(keys.get(name.lower(), name))
+    return value
+
+
+# A parsed filter: ("or", [nodes]), ("and", [nodes]) or ("compare", path, op, value).
+_Node = Tuple[Any, ...]
+
+
+class _Parser:
+    def __init__(self, text: str, substitutions: Sequence[Any] = ()):
+        self._tokens = _tokenize(text)
+        self._substitutions = substitutions
+        self._position = 0
+
+    def parse(self) -> Optional[_Node]:
+        if not self._tokens:
+            return None
+        node = self._or()
+        if self._peek() is not None:
+            raise ValueError(f"Unexpected {self._peek()!r} in filter.")
+        return node
+
+    def _peek(self) -> Optional[str]:
+        if self._position < len(self._tokens):
+            return self._tokens[self._position]
+        return None
+
+    def _next(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise ValueError("Unexpected end of filter.")
+        self._position += 1
+        return token
+
+    def _or(self) -> _Node:
+        operands = [self._and()]
+        while (self._peek() or "").lower() in ("or", "||"):
+            self._next()
+            operands.append(self._and())
+        return operands[0] if len(operands) == 1 else ("or", operands)
+
+    def _and(self) -> _Node:
+        operands = [self._comparison()]
+        while (self._peek() or "").lower() in ("and", "&&"):
+            self._next()
+            operands.append(self._comparison())
+        return operands[0] if len(operands) == 1 else ("and", operands)
+
+    def _comparison(self) -> _Node:
+        token = self._next()
+        if token == "(":
+            node = self._or()
+            if self._next() != ")":
+                raise ValueError("Unbalanced parentheses in filter.")
+            return node
+        operator = self._next()
+        if operator not in _COMPARISONS:
+            raise ValueError(f"Unsupported operator {operator!r} in filter.")
+        return ("compare", token, operator, self._literal(self._next()))
+
+    def _literal(self, token: str) -> Any:
+        if token.startswith('"'):
+            return _unquote(token)
+        if token.startswith("@"):
+            index = int(token[1:])
+            if index >= len(self._substitutions):
+                raise ValueError(f"No substitution for {token} in filter.")
+            return self._substitutions[index]
+        if token.lower() in _LITERALS:
+            return _LITERALS[token.lower()]
+        try:
+            return float(token)
+        except ValueError:
+            raise ValueError(f"Unsupported value {token!r} in filter.") from None
+
+
+def _member(path: str, values: Set[Any]) -> Predicate:
+    return lambda item: _field(item, path) in values
+
+
+def _compile(node: _Node) -> Predicate:
+    if node[0] == "compare":
+        _, path, operator, value = node
+        compare = _COMPARISONS[operator]
+        return lambda item: compare(_field(item, path), value)
+    operands = node[1]
+    if node[0] == "and":
+        predicates = [_compile(operand) for operand in operands]
+        return lambda item: all(predicate(item) for predicate in predicates)
+    # Long chains of `field == value` alternatives, as used to select many items by
+    # ID, are looked up in a set instead of being compared one by one.
+    alternatives: Dict[str, Set[Any]] = {}
+    predicates = []
+    for operand in operands:
+        if operand[0] == "compare" and operand[2] == "==" and operand[3] is not None:
+            alternatives.setdefault(operand[1], set()).add(operand[3])
+        else:
+            predicates.append(_compile(operand))
+    predicates.extend(_member(path, values) for path, values in alternatives.items())
+    return lambda item: any(predicate(item) for predicate in predicates)
+
+
+def compile_filter(
+    text: Optional[str], substitutions: Optional[Sequence[Any]] = None
+) -> Predicate:
+    """Compiles a query filter into a predicate over stored items.
+
+    Comparisons of a field with a string, number, boolean or null literal, or with a
+    substitution `@0`, `@1`, ..., can be combined with `and`, `or` and parentheses,
+    e.g. `(id == "a" or id == @0) and status.statusType == "FAILED"`. Field names are
+    matched case-insensitively, and names with spaces can be quoted in brackets, as in
+    `properties["Serial Number"]`. Strings compare lexically, which orders ISO 8601
+    timestamps correctly.
+
+    Args:
+        text: The filter. An empty filter matches every item.
+        substitutions: The values of the substitutions, by their index.
+
+    Returns:
+        A function that tells whether an item matches the filter.
+
+    Raises:
+        ValueError: The filter uses syntax outside of the supported subset.
+    """
+    node = _Parser(text or "", substitutions or ()).parse()
+    return (lambda item: True) if node is None else _compile(node)
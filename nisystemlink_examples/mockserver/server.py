@@ -0,0 +1,532 @@
+"""This module provides a local stand-in for a SystemLink Enterprise server.
+
+Classes:
+    MockSystemLinkServer: Serves the Test Monitor, DataFrame and File routes from memory
+        on a localhost port, with configurable latency and error injection.
+"""
+
+import datetime
+import json
+import random
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .filters import compile_filter
+
+TESTMONITOR_PREFIX = "/nitestmonitor/v2/"
+DATAFRAME_PREFIX = "/nidataframe/v1/"
+FILE_PREFIX = "/nifile/v1/service-groups/Default/"
+
+_Response = Tuple[int, Any, Dict[str, str]]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately. Without TCP_NODELAY, every response on
+    # a keep-alive connection would wait for the delayed ACK of the client.
+    disable_nagle_algorithm = True
+    server: "_HTTPServer"
+
+    def do_GET(self) -> None:
+        self._handle("GET")
+
+    def do_POST(self) -> None:
+        self._handle("POST")
+
+    def do_DELETE(self) -> None:
+        self._handle("DELETE")
+
+    def _handle(self, method: str) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw_body = self.rfile.read(length) if length else b""
+        parts = urlsplit(self.path)
+        mock = self.server.mock
+        status, body, headers = mock._dispatch(
+            method,
+            parts.path,
+            {key: values[0] for key, values in parse_qs(parts.query).items()},
+            json.loads(raw_body) if raw_body else None,
+            dict(self.headers.items()),
+        )
+        if isinstance(body, bytes):
+            payload = body
+        else:
+            payload = b"" if body is None else json.dumps(body).encode()
+            headers.setdefault("Content-Type", "application/json")
+        self.send_response(status)
+        headers.setdefault("Content-Length", str(len(payload)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+        if len(payload) < int(headers["Content-Length"]):
+            self.close_connection = True
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    mock: "MockSystemLinkServer"
+
+
+class MockSystemLinkServer:
+    """Serves the SystemLink routes used by this package from memory.
+
+    The server runs on a background thread of the current process and listens on a
+    localhost port, so the clients of this package can be exercised and benchmarked
+    without a SystemLink Enterprise instance. It implements:
+
+    - `nitestmonitor/v2`: `results`, `steps`, `update-results`, `update-steps`,
+      `delete-results`, `results/{id}`, `results/{id}/steps/{id}` and
+      `query-results`. Query filters are evaluated for comparisons combined with
+      `and` and `or`; see `compile_filter`.
+      Created and updated results get an `updatedAt` timestamp.
+    - `nidataframe/v1`: `tables`, `tables/{id}` and `tables/{id}/data`, including
+      reading the rows back in pages.
+    - `nifile/v1/service-groups/Default/files/{id}/data`, including `Range` requests.
+
+    Every request waits `latency` seconds. With probability `error_rate`, a request is
+    rejected with `error_status`. With probability `partial_failure_rate`, each item
+    of a batch request is rejected with a partial success response, like the server
+    does for items that fail validation. All random decisions use a generator seeded
+    with `seed`, so runs are reproducible.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        partial_failure_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        """Initializes the server without starting it.
+
+        Args:
+            host: The interface to listen on.
+            port: The port to listen on. 0 picks a free port.
+            latency: The time in seconds every request takes.
+            error_rate: The probability that a request is rejected with `error_status`.
+            error_status: The HTTP status of rejected requests.
+            partial_failure_rate: The probability that an item of a batch request is
+                rejected in a partial success response.
+            seed: The seed of the random generator used for error injection.
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.partial_failure_rate = partial_failure_rate
+        self.results: Dict[str, Dict[str, Any]] = {}
+        self.steps: Dict[str, Dict[str, Any]] = {}
+        self.tables: Dict[str, Dict[str, Any]] = {}
+        self.files: Dict[str, Tuple[str, bytes]] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self._random = random.Random(seed)
+        self._failures: List[int] = []
+        self._truncations: List[int] = []
+        self._delays: List[float] = []
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._httpd = _HTTPServer((host, port), _Handler)
+        self._httpd.mock = self
+        self._thread: Optional[threading.Thread] = None
+        routes: List[Tuple[str, str, Callable[..., _Response]]] = [
+            ("POST", TESTMONITOR_PREFIX + "results", self._create_results),
+            ("POST", TESTMONITOR_PREFIX + "steps", self._create_steps),
+            ("POST", TESTMONITOR_PREFIX + "update-results", self._update_results),
+            ("POST", TESTMONITOR_PREFIX + "update-steps", self._update_steps),
+            ("POST", TESTMONITOR_PREFIX + "delete-results", self._delete_results),
+            (
+                "DELETE",
+                TESTMONITOR_PREFIX + "results/(?P<id>[^/]+)",
+                self._delete_result,
+            ),
+            ("POST", TESTMONITOR_PREFIX + "query-results", self._query_results),
+            (
+                "GET",
+                TESTMONITOR_PREFIX
+                + "results/(?P<result_id>[^/]+)/steps/(?P<step_id>[^/]+)",
+                self._get_step,
+            ),
+            ("POST", DATAFRAME_PREFIX + "tables", self._create_table),
+            ("GET", DATAFRAME_PREFIX + "tables/(?P<id>[^/]+)", self._get_table),
+            ("DELETE", DATAFRAME_PREFIX + "tables/(?P<id>[^/]+)", self._delete_table),
+            (
+                "POST",
+                DATAFRAME_PREFIX + "tables/(?P<id>[^/]+)/data",
+                self._append_table_data,
+            ),
+            (
+                "GET",
+                DATAFRAME_PREFIX + "tables/(?P<id>[^/]+)/data",
+                self._get_table_data,
+            ),
+            ("GET", FILE_PREFIX + "files/(?P<id>[^/]+)/data", self._download_file),
+        ]
+        self._routes = [
+            (method, re.compile(pattern), handler)
+            for method, pattern, handler in routes
+        ]
+
+    def __enter__(self) -> "MockSystemLinkServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        """The base URL of the server, to be passed to the clients."""
+        host = str(self._httpd.server_address[0])
+        return f"http://{host}:{self._httpd.server_port}"
+
+    def start(self) -> None:
+        """Starts serving requests on a background thread."""
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._httpd.serve_forever,
+                kwargs={"poll_interval": 0.01},
+                daemon=True,
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stops serving and closes the listening socket."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._httpd.server_close()
+
+    def fail_next(self, count: int = 1, status: Optional[int] = None) -> None:
+        """Rejects the next `count` requests with `status`, or with `error_status`."""
+        with self._lock:
+            self._failures.extend([status or self.error_status] * count)
+
+    def truncate_next_downloads(self, count: int = 1, after_bytes: int = 0) -> None:
+        """Drops the connection of the next `count` file downloads after some bytes.
+
+        The responses announce their full length, so the client sees an incomplete
+        body, as when a connection breaks during a large download.
+        """
+        with self._lock:
+            self._truncations.extend([after_bytes] * count)
+
+    def delay_next_responses(self, count: int = 1, seconds: float = 1.0) -> None:
+        """Delays the responses of the next `count` requests after handling them.
+
+        The requests take effect before the client gets a response, as when a client
+        times out waiting for a request the server has applied.
+        """
+        with self._lock:
+            self._delays.extend([seconds] * count)
+
+    def add_file(self, name: str, content: bytes) -> str:
+        """Stores a file that can be downloaded from the File routes.
+
+        Args:
+            name: The file name returned in the `Content-Disposition` header.
+            content: The content of the file.
+
+        Returns:
+            The ID of the file.
+        """
+        file_id = str(uuid.uuid4())
+        with self._lock:
+            self.files[file_id] = (name, content)
+        return file_id
+
+    def _dispatch(
+        self,
+        method: str,
+        path: str,
+        params: Dict[str, str],
+        body: Any,
+        headers: Dict[str, str],
+    ) -> _Response:
+        with self._lock:
+            self.requests.append((method, path))
+            failure = self._failures.pop(0) if self._failures else None
+            if failure is None and self._random.random() < self.error_rate:
+                failure = self.error_status
+        if self.latency:
+            self._stopped.wait(self.latency)
+        if failure is not None:
+            error = {"error": {"message": "Injected failure."}}
+            return failure, error, {"Retry-After": "0"}
+
+        for route_method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match and route_method == method:
+                with self._lock:
+                    response = handler(
+                        body=body, params=params, headers=headers, **match.groupdict()
+                    )
+                    delay = self._delays.pop(0) if self._delays else 0.0
+                if delay:
+                    self._stopped.wait(delay)
+                return response
+        return 404, {"error": {"message": f"No route for {method} {path}."}}, {}
+
+    def _rejects_item(self) -> bool:
+        return self._random.random() < self.partial_failure_rate
+
+    # Test Monitor
+
+    def _batch(
+        self,
+        items: List[Dict[str, Any]],
+        items_field: str,
+        id_field: str,
+        apply: Callable[[Dict[str, Any]], Optional[Dict[str, Any]]],
+        success_status: int,
+    ) -> _Response:
+        succeeded: List[Dict[str, Any]] = []
+        failed: List[Dict[str, Any]] = []
+        for item in items:
+            stored = None if self._rejects_item() else apply(item)
+            if stored is None:
+                failed.append(item)
+            else:
+                succeeded.append(stored)
+        if not failed:
+            return success_status, {items_field: succeeded}, {}
+        return 200, _partial_success(items_field, succeeded, failed, id_field), {}
+
+    def _create_results(self, body: Dict[str, Any], **_: Any) -> _Response:
+        def create(result: Dict[str, Any]) -> Dict[str, Any]:
+            stored = dict(result, id=str(uuid.uuid4()), updatedAt=_utc_now())
+            self.results[stored["id"]] = stored
+            return stored
+
+        return self._batch(body["results"], "results", "id", create, 201)
+
+    def _update_results(self, body: Dict[str, Any], **_: Any) -> _Response:
+        def update(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            if result.get("id") not in self.results:
+                return None
+            self.results[result["id"]].update(result, updatedAt=_utc_now())
+            return self.results[result["id"]]
+
+        return self._batch(body["results"], "results", "id", update, 200)
+
+    def _create_steps(self, body: Dict[str, Any], **_: Any) -> _Response:
+        def create(step: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            step_id = step.get("stepId") or str(uuid.uuid4())
+            if step.get("resultId") not in self.results or step_id in self.steps:
+                return None
+            self.steps[step_id] = dict(step, stepId=step_id)
+            return self.steps[step_id]
+
+        return self._batch(body["steps"], "steps", "stepId", create, 201)
+
+    def _get_step(self, result_id: str, step_id: str, **_: Any) -> _Response:
+        step = self.steps.get(step_id)
+        if step is None or step.get("resultId") != result_id:
+            return 404, {"error": {"message": f"Step {step_id} not found."}}, {}
+        return 200, step, {}
+
+    def _update_steps(self, body: Dict[str, Any], **_: Any) -> _Response:
+        def update(step: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+            if step.get("stepId") not in self.steps:
+                return None
+            self.steps[step["stepId"]].update(step)
+            return self.steps[step["stepId"]]
+
+        return self._batch(body["steps"], "steps", "stepId", update, 200)
+
+    def _remove_result(self, result_id: str, delete_steps: bool) -> bool:
+        if self.results.pop(result_id, None) is None:
+            return False
+        if delete_steps:
+            for step_id in [
+                step_id
+                for step_id, step in self.steps.items()
+                if step.get("resultId") == result_id
+            ]:
+                del self.steps[step_id]
+        return True
+
+    def _delete_results(self, body: Dict[str, Any], **_: Any) -> _Response:
+        deleted: List[str] = []
+        failed: List[str] = []
+        for result_id in body["ids"]:
+            if not self._rejects_item() and self._remove_result(
+                result_id, body.get("deleteSteps", False)
+            ):
+                deleted.append(result_id)
+            else:
+                failed.append(result_id)
+        if not failed:
+            return 204, None, {}
+        error = _error(
+            [
+                {"resourceId": result_id, "message": "Not deleted."}
+                for result_id in failed
+            ]
+        )
+        return 200, {"ids": deleted, "failed": failed, "error": error}, {}
+
+    def _delete_result(self, id: str, params: Dict[str, str], **_: Any) -> _Response:
+        if not self._remove_result(id, params.get("deleteSteps") == "true"):
+            return 404, {"error": {"message": f"Result {id} not found."}}, {}
+        return 204, None, {}
+
+    def _query_results(self, body: Dict[str, Any], **_: Any) -> _Response:
+        try:
+            matches = compile_filter(body.get("filter"), body.get("substitutions"))
+        except ValueError as e:
+            return 400, {"error": {"message": str(e)}}, {}
+        results = [result for result in self.results.values() if matches(result)]
+        start = int(body.get("continuationToken") or 0)
+        end = start + int(body.get("take") or 1000)
+        page = results[start:end]
+        projection = body.get("projection")
+        if projection:
+            # Projections name fields in upper snake case, e.g. PART_NUMBER.
+            fields = {name.replace("_", "").lower() for name in projection}
+            page = [{k: v for k, v in r.items() if k.lower() in fields} for r in page]
+        response: Dict[str, Any] = {
+            "results": page,
+            "continuationToken": str(end) if end < len(results) else None,
+        }
+        if body.get("returnCount"):
+            response["totalCount"] = len(results)
+        return 200, response, {}
+
+    # DataFrame
+
+    def _create_table(self, body: Dict[str, Any], **_: Any) -> _Response:
+        columns = body.get("columns") or []
+        if sum(column.get("columnType") == "INDEX" for column in columns) != 1:
+            return 400, {"error": {"message": "A table needs one index column."}}, {}
+        table_id = uuid.uuid4().hex[:24]
+        self.tables[table_id] = {
+            "id": table_id,
+            "name": body.get("name"),
+            "workspace": body.get("workspace"),
+            "columns": columns,
+            "properties": body.get("properties") or {},
+            "rowCount": 0,
+            "supportsAppend": True,
+            "rows": [],
+        }
+        return 201, {"id": table_id}, {}
+
+    def _get_table(self, id: str, **_: Any) -> _Response:
+        if id not in self.tables:
+            return 404, {"error": {"message": f"Table {id} not found."}}, {}
+        table = {k: v for k, v in self.tables[id].items() if k != "rows"}
+        return 200, table, {}
+
+    def _delete_table(self, id: str, **_: Any) -> _Response:
+        if self.tables.pop(id, None) is None:
+            return 404, {"error": {"message": f"Table {id} not found."}}, {}
+        return 204, None, {}
+
+    def _append_table_data(self, id: str, body: Dict[str, Any], **_: Any) -> _Response:
+        table = self.tables.get(id)
+        if table is None:
+            return 404, {"error": {"message": f"Table {id} not found."}}, {}
+        if not table["supportsAppend"]:
+            return 409, {"error": {"message": "The table is complete."}}, {}
+        frame = body.get("frame") or {}
+        names = [column["name"] for column in table["columns"]]
+        columns = frame.get("columns") or names
+        if sorted(columns) != sorted(names):
+            return (
+                400,
+                {"error": {"message": "The columns do not match the table."}},
+                {},
+            )
+        rows = frame.get("data") or []
+        if any(len(row) != len(columns) for row in rows):
+            return 400, {"error": {"message": "A row has the wrong length."}}, {}
+        order = [columns.index(name) for name in names]
+        table["rows"].extend([row[index] for index in order] for row in rows)
+        table["rowCount"] = len(table["rows"])
+        table["supportsAppend"] = not body.get("endOfData", False)
+        return 204, None, {}
+
+    def _get_table_data(self, id: str, params: Dict[str, str], **_: Any) -> _Response:
+        table = self.tables.get(id)
+        if table is None:
+            return 404, {"error": {"message": f"Table {id} not found."}}, {}
+        start = int(params.get("continuationToken") or 0)
+        end = start + int(params.get("take") or 500)
+        return (
+            200,
+            {
+                "frame": {
+                    "columns": [column["name"] for column in table["columns"]],
+                    "data": table["rows"][start:end],
+                },
+                "totalRowCount": len(table["rows"]),
+                "continuationToken": str(end) if end < len(table["rows"]) else None,
+            },
+            {},
+        )
+
+    # File
+
+    def _download_file(self, id: str, headers: Dict[str, str], **_: Any) -> _Response:
+        if id not in self.files:
+            return 404, {"error": {"message": f"File {id} not found."}}, {}
+        name, content = self.files[id]
+        response_headers = {
+            "Content-Type": "application/octet-stream",
+            "Content-Disposition": f'attachment; filename="{name}"',
+            "Accept-Ranges": "bytes",
+        }
+        match = re.fullmatch(r"bytes=(\d+)-(\d*)", headers.get("Range", ""))
+        status = 200
+        if match:
+            start = int(match.group(1))
+            end = min(int(match.group(2) or len(content) - 1), len(content) - 1)
+            if start >= len(content):
+                response_headers["Content-Range"] = f"bytes */{len(content)}"
+                return 416, b"", response_headers
+            response_headers["Content-Range"] = f"bytes {start}-{end}/{len(content)}"
+            content = content[start : end + 1]
+            status = 206
+        if self._truncations:
+            response_headers["Content-Length"] = str(len(content))
+            content = content[: self._truncations.pop(0)]
+        return status, content, response_headers
+
+
+def _utc_now() -> str:
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return now.strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _error(inner_errors: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {
+        "name": "Skyline.OneOrMoreErrorsOccurred",
+        "message": "One or more errors occurred. See the contained list for details.",
+        "innerErrors": inner_errors,
+    }
+
+
+def _partial_success(
+    items_field: str,
+    succeeded: List[Dict[str, Any]],
+    failed: List[Dict[str, Any]],
+    id_field: str,
+) -> Dict[str, Any]:
+    inner_errors = [
+        {"resourceId": item.get(id_field), "message": "The item was rejected."}
+        for item in failed
+    ]
+    return {items_field: succeeded, "failed": failed, "error": _error(inner_errors)}
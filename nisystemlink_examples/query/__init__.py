@@ -0,0 +1,27 @@
+"""Query utilities for SystemLink Enterprise demo package.
+
+This module provides a paginator that iterates lazily over the items of any paged
+SystemLink query, whether it pages with continuation tokens or with skip and take, and
+queries items by any number of IDs with concurrent queries of bounded filters. It also
+sends bulk updates in concurrent chunks and collects their updated and failed items.
+"""
+
+from .chunked import (
+    contains_any,
+    equals_any,
+    id_filters,
+    query_by_ids,
+)
+from .pagination import apaginate, paginate, paginate_pages
+from .updates import ChunkedUpdater
+
+__all__ = [
+    "ChunkedUpdater",
+    "apaginate",
+    "contains_any",
+    "equals_any",
+    "id_filters",
+    "paginate",
+    "paginate_pages",
+    "query_by_ids",
+]
@@ -0,0 +1,173 @@
+"""This module queries items by long lists of IDs with many bounded, concurrent queries.
+
+A filter selecting thousands of IDs gets slow to evaluate or is rejected by the
+service. The functions in this module split the IDs into filters of a bounded size,
+run the resulting queries concurrently and merge their items into one iterator.
+
+Functions:
+    equals_any: Builds filters comparing a field with each of a list of values.
+    contains_any: Builds Dynamic LINQ filters looking up an expression in a list.
+    id_filters: Yields the filters selecting a list of IDs in bounded chunks.
+    query_by_ids: Yields the items of a paged query for any number of IDs.
+"""
+
+import collections
+import itertools
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TypeVar,
+)
+
+from .pagination import _get, _with, paginate
+
+RequestT = TypeVar("RequestT")
+
+FilterBuilder = Callable[[Sequence[str]], str]
+
+DEFAULT_IDS_PER_QUERY = 500
+
+
+def _quote(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def equals_any(field: str) -> FilterBuilder:
+    """Builds filters comparing a field with each of a list of values.
+
+    Args:
+        field: The field, e.g. `id` or `systemId`.
+
+    Returns:
+        A function building e.g. `(id == "a" or id == "b")` from `["a", "b"]`.
+    """
+
+    def build(values: Sequence[str]) -> str:
+        return "(" + " or ".join(f"{field} == {_quote(v)}" for v in values) + ")"
+
+    return build
+
+
+def contains_any(expression: str) -> FilterBuilder:
+    """Builds Dynamic LINQ filters looking up an expression in a list of values.
+
+    This is the filter syntax of services such as Asset Management and Systems.
+
+    Args:
+        expression: The expression, e.g. `location.minionId`.
+
+    Returns:
+        A function building e.g. `new[] {"a", "b"}.Contains(location.minionId)` from
+        `["a", "b"]`.
+    """
+
+    def build(values: Sequence[str]) -> str:
+        return f"new[] {{{', '.join(map(_quote, values))}}}.Contains({expression})"
+
+    return build
+
+
+def id_filters(
+    ids: Iterable[str],
+    build_filter: FilterBuilder,
+    ids_per_query: int = DEFAULT_IDS_PER_QUERY,
+    filter: Optional[str] = None,
+) -> Iterator[str]:
+    """Yields the filters selecting a list of IDs in bounded chunks.
+
+    Args:
+        ids: The IDs. Repeated IDs are selected once.
+        build_filter: The function building the filter of a chunk of IDs, e.g.
+            `equals_any("id")`.
+        ids_per_query: The maximum number of IDs per filter.
+        filter: A filter the items must match as well.
+
+    Yields:
+        The filter of every chunk of IDs.
+    """
+    remaining = iter(dict.fromkeys(ids))
+    while chunk := list(itertools.islice(remaining, ids_per_query)):
+        selection = build_filter(chunk)
+        yield f"{selection} and ({filter})" if filter else selection
+
+
+def _item_id(item: Any) -> Optional[Hashable]:
+    return _get(item, "id")
+
+
+def query_by_ids(
+    query: Callable[[RequestT], Any],
+    request: RequestT,
+    items_field: str,
+    ids: Iterable[str],
+    build_filter: FilterBuilder,
+    ids_per_query: int = DEFAULT_IDS_PER_QUERY,
+    max_workers: int = 4,
+    key: Optional[Callable[[Any], Optional[Hashable]]] = _item_id,
+) -> Iterator[Any]:
+    """Yields the items of a paged query for any number of IDs.
+
+    The IDs are split into filters of at most `ids_per_query` IDs, combined with the
+    filter of the `request`. Up to `max_workers` of these queries run at the same
+    time, each fetching all of its pages. The items are yielded in the order of the
+    chunks, and at most `max_workers + 1` chunks are held in memory.
+
+    Args:
+        query: The function sending the query, e.g. `TestPlanClient.query_test_plans`.
+        request: The request of the query without the IDs. See `paginate_pages` for
+            the supported requests. The request passed in is not modified.
+        items_field: The name of the response field holding the items of a page.
+        ids: The IDs to query.
+        build_filter: The function building the filter of a chunk of IDs, e.g.
+            `equals_any("id")` or `contains_any("location.minionId")`.
+        ids_per_query: The maximum number of IDs per query.
+        max_workers: The maximum number of queries running at the same time.
+        key: The function returning the key items are deduplicated by, e.g. when the
+            chunks select items by a field that is not unique. By default, items are
+            deduplicated by their `id`. Items with a key of None are always yielded,
+            and a key of None yields every item.
+
+    Yields:
+        The items of every chunk.
+    """
+    filter = _get(request, "filter")
+
+    def fetch(chunk_filter: str) -> List[Any]:
+        return list(
+            paginate(
+                query,
+                _with(request, "filter", chunk_filter),
+                items_field,
+                prefetch_pages=0,
+            )
+        )
+
+    seen: Set[Hashable] = set()
+    filters = id_filters(ids, build_filter, ids_per_query, filter)
+    pending: Deque["Future[List[Any]]"] = collections.deque()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        try:
+            for chunk_filter in itertools.chain(filters, [None]):
+                if chunk_filter is not None:
+                    pending.append(executor.submit(fetch, chunk_filter))
+                # Keep every worker busy, and drain the remaining chunks at the end.
+                while pending and (chunk_filter is None or len(pending) > max_workers):
+                    for item in pending.popleft().result():
+                        item_key = None if key is None else key(item)
+                        if item_key is None:
+                            yield item
+                        elif item_key not in seen:
+                            seen.add(item_key)
+                            yield item
+        finally:
+            for future in pending:
+                future.cancel()
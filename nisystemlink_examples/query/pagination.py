@@ -0,0 +1,231 @@
+"""This module provides lazy, prefetching iteration over paged SystemLink queries.
+
+SystemLink services page their query responses either with a continuation token
+(Test Monitor, Specifications, Test Plans, Alarms) or with `skip` and `take` (Systems,
+Assets). The functions in this module hide both behind one iterator.
+
+Functions:
+    paginate: Yields the items of a paged query, prefetching pages on a background thread.
+    paginate_pages: Yields the pages of a paged query, prefetching on a background thread.
+    apaginate: Asynchronously yields the items of a paged query with an async query
+        function, prefetching pages in a background task.
+"""
+
+import asyncio
+import copy
+import queue
+import threading
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+RequestT = TypeVar("RequestT")
+
+_DICT_KEYS = {
+    "continuation_token": "continuationToken",
+    "skip": "skip",
+    "take": "take",
+}
+
+
+def _get(obj: Any, name: str) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(_DICT_KEYS.get(name, name))
+    return getattr(obj, name, None)
+
+
+def _has(obj: Any, name: str) -> bool:
+    if isinstance(obj, dict):
+        return _DICT_KEYS.get(name, name) in obj
+    return hasattr(obj, name)
+
+
+def _with(request: RequestT, name: str, value: Any) -> RequestT:
+    if isinstance(request, dict):
+        return dict(request, **{_DICT_KEYS.get(name, name): value})  # type: ignore
+    updated = copy.copy(request)
+    setattr(updated, name, value)
+    return updated
+
+
+def _next_request(
+    request: RequestT, response: Any, items: List[Any]
+) -> Optional[RequestT]:
+    """Returns the request for the page after `response`, or None on the last page."""
+    if not items:
+        return None
+    token = _get(response, "continuation_token")
+    if token:
+        return _with(request, "continuation_token", token)
+    if _has(response, "continuation_token") or not _has(request, "skip"):
+        return None
+    take = _get(request, "take")
+    if take and len(items) < take:
+        return None
+    return _with(request, "skip", (_get(request, "skip") or 0) + len(items))
+
+
+def _page(response: Any, items_field: str) -> List[Any]:
+    return list(_get(response, items_field) or [])
+
+
+def paginate_pages(
+    query: Callable[[RequestT], Any],
+    request: RequestT,
+    items_field: str,
+    prefetch_pages: int = 1,
+    max_items: Optional[int] = None,
+) -> Iterator[List[Any]]:
+    """Yields the pages of a paged query.
+
+    While the caller processes a page, up to `prefetch_pages` further pages are fetched
+    on a background thread, so at most `prefetch_pages + 1` pages are held in memory.
+    The request passed in is not modified.
+
+    Args:
+        query: The function sending the query, e.g. `TestMonitorClient.query_results`.
+        request: The request of the first page. Requests and responses may be models
+            with `continuation_token`/`skip`/`take` attributes or JSON dictionaries with
+            `continuationToken`/`skip`/`take` keys.
+        items_field: The name of the response field holding the items of a page,
+            e.g. "results", "specs", "test_plans", "assets" or "data".
+        prefetch_pages: The number of pages fetched ahead of the caller. Zero fetches
+            every page on the caller's thread when it is needed.
+        max_items: The maximum number of items to return, or None for all.
+
+    Yields:
+        The non-empty pages of the query.
+    """
+    pages = _fetch_pages(query, request, items_field)
+    if max_items is not None and max_items <= 0:
+        return
+    if max_items is not None:
+        pages = _limit(pages, max_items)
+    if prefetch_pages < 1:
+        yield from pages
+        return
+
+    buffer: "queue.Queue[Tuple[str, Any]]" = queue.Queue()
+    free_slots = threading.Semaphore(prefetch_pages)
+    stopped = threading.Event()
+
+    def produce() -> None:
+        try:
+            while True:
+                while not free_slots.acquire(timeout=0.1):
+                    if stopped.is_set():
+                        return
+                if stopped.is_set():
+                    return
+                page = next(pages, None)
+                if page is None:
+                    break
+                buffer.put(("page", page))
+            buffer.put(("done", None))
+        except BaseException as e:
+            buffer.put(("error", e))
+
+    producer = threading.Thread(target=produce, daemon=True)
+    producer.start()
+    try:
+        while True:
+            kind, value = buffer.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            free_slots.release()
+            yield value
+    finally:
+        stopped.set()
+
+
+def paginate(
+    query: Callable[[RequestT], Any],
+    request: RequestT,
+    items_field: str,
+    prefetch_pages: int = 1,
+    max_items: Optional[int] = None,
+) -> Iterator[Any]:
+    """Yields the items of a paged query one by one.
+
+    See `paginate_pages` for a description of the arguments.
+    """
+    for page in paginate_pages(query, request, items_field, prefetch_pages, max_items):
+        yield from page
+
+
+async def apaginate(
+    query: Callable[[RequestT], Awaitable[Any]],
+    request: RequestT,
+    items_field: str,
+    prefetch_pages: int = 1,
+    max_items: Optional[int] = None,
+) -> AsyncIterator[Any]:
+    """Asynchronously yields the items of a paged query with an async query function.
+
+    The next pages are fetched in a background task while the caller processes the
+    current one. See `paginate_pages` for a description of the arguments.
+    """
+    buffer: "asyncio.Queue[Tuple[str, Any]]" = asyncio.Queue(
+        maxsize=max(prefetch_pages, 1)
+    )
+
+    async def produce() -> None:
+        try:
+            next_request: Optional[RequestT] = request
+            remaining = max_items
+            while next_request is not None and (remaining is None or remaining > 0):
+                response = await query(next_request)
+                items = _page(response, items_field)
+                if remaining is not None:
+                    items = items[:remaining]
+                    remaining -= len(items)
+                if items:
+                    await buffer.put(("page", items))
+                next_request = _next_request(next_request, response, items)
+            await buffer.put(("done", None))
+        except Exception as e:
+            await buffer.put(("error", e))
+
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            kind, value = await buffer.get()
+            if kind == "done":
+                return
+            if kind == "error":
+                raise value
+            for item in value:
+                yield item
+    finally:
+        producer.cancel()
+
+
+def _fetch_pages(
+    query: Callable[[RequestT], Any], request: RequestT, items_field: str
+) -> Iterator[List[Any]]:
+    next_request: Optional[RequestT] = request
+    while next_request is not None:
+        response = query(next_request)
+        items = _page(response, items_field)
+        if items:
+            yield items
+        next_request = _next_request(next_request, response, items)
+
+
+def _limit(pages: Iterator[List[Any]], max_items: int) -> Iterator[List[Any]]:
+    remaining = max_items
+    for page in pages:
+        yield page[:remaining]
+        remaining -= len(page)
+        if remaining <= 0:
+            return
@@ -0,0 +1,140 @@
+"""This module sends bulk updates in bounded, concurrent chunks.
+
+The update routes of SystemLink services (Specifications, Test Plans, Test Monitor)
+answer with partial success responses, listing the updated and the failed items of a
+request. The helpers in this module read those responses, whether they are models of
+`nisystemlink-clients` or dictionaries of the JSON API.
+
+Classes:
+    ChunkedUpdater: Sends chunks of updates concurrently and collects the updated and
+        failed items.
+
+Functions:
+    get_field: Reads a field of a model by its attribute or of a dictionary by its key.
+    error_message: Describes an exception or the error of a partial success response.
+"""
+
+import collections
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Deque, List, Optional, Tuple
+
+_Outcome = Tuple[List[Any], List[Any], Optional[str]]
+
+
+def get_field(obj: Any, name: str, key: str) -> Any:
+    """Reads a field of a model or of a dictionary.
+
+    Args:
+        obj: The model or dictionary.
+        name: The attribute of the field in the model.
+        key: The JSON key of the field in the dictionary.
+
+    Returns:
+        The value of the field, or None if it has none.
+    """
+    if isinstance(obj, dict):
+        return obj.get(key)
+    return getattr(obj, name, None)
+
+
+def error_message(error: Any) -> str:
+    """Describes an exception or the error of a partial success response.
+
+    Args:
+        error: The exception, or the error of a response as a model or dictionary.
+
+    Returns:
+        The message of the error, or its type if it has no message.
+    """
+    if isinstance(error, BaseException):
+        return str(error) or type(error).__name__
+    return str(get_field(error, "message", "message") or error)
+
+
+class ChunkedUpdater:
+    """Sends chunks of updates concurrently and collects the updated and failed items.
+
+    Up to `max_workers` update requests run at the same time. Submitting a chunk
+    blocks while that many are running, so at most `max_workers + 1` chunks are held
+    in memory. A chunk whose request raised an error fails as a whole. The failed items
+    of a response are mapped back to the items that were sent, by their `id`, so they
+    can be sent again.
+
+    Attributes:
+        updated: The updated items of all responses.
+        failed: The items that were not updated.
+        errors: The errors of the failed requests.
+    """
+
+    def __init__(
+        self,
+        update: Callable[[List[Any]], Any],
+        updated_field: Tuple[str, str],
+        failed_field: Tuple[str, str],
+        max_workers: int = 4,
+    ):
+        """Initializes the updater.
+
+        Args:
+            update: The function sending the update of a chunk. It returns the partial
+                success response of the chunk.
+            updated_field: The attribute and JSON key of the updated items in the
+                response, e.g. `("updated_specs", "updatedSpecs")`.
+            failed_field: The attribute and JSON key of the failed items in the
+                response.
+            max_workers: The maximum number of update requests running at the same
+                time.
+        """
+        self.updated: List[Any] = []
+        self.failed: List[Any] = []
+        self.errors: List[str] = []
+        self._update = update
+        self._updated_field = updated_field
+        self._failed_field = failed_field
+        self._max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._pending: Deque["Future[_Outcome]"] = collections.deque()
+
+    def __enter__(self) -> "ChunkedUpdater":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def submit(self, chunk: List[Any]) -> None:
+        """Sends the update of a chunk, waiting while too many requests are running."""
+        self._pending.append(self._executor.submit(self._send, chunk))
+        while len(self._pending) > self._max_workers:
+            self._collect(self._pending.popleft())
+
+    def wait(self) -> None:
+        """Waits for every submitted chunk and collects its outcome."""
+        while self._pending:
+            self._collect(self._pending.popleft())
+
+    def close(self) -> None:
+        """Waits for the submitted chunks and shuts down the worker threads."""
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown()
+
+    def _send(self, chunk: List[Any]) -> _Outcome:
+        try:
+            response = self._update(chunk)
+        except Exception as e:
+            return [], chunk, error_message(e)
+        updated = list(get_field(response, *self._updated_field) or [])
+        failed = list(get_field(response, *self._failed_field) or [])
+        # Return the items that were sent rather than their echo in the response.
+        sent = {get_field(item, "id", "id"): item for item in chunk}
+        failed = [sent.get(get_field(item, "id", "id"), item) for item in failed]
+        error = get_field(response, "error", "error")
+        return updated, failed, None if error is None else error_message(error)
+
+    def _collect(self, future: "Future[_Outcome]") -> None:
+        updated, failed, error = future.result()
+        self.updated.extend(updated)
+        self.failed.extend(failed)
+        if error is not None:
+            self.errors.append(error)
@@ -0,0 +1,17 @@
+"""Scheduling utilities for SystemLink Enterprise demo package.
+
+This module finds the earliest free slots for test plans on systems and their
+fixtures, keeping the booked windows of every system and fixture in sorted interval
+indexes, and schedules many test plans with one request.
+"""
+
+from .engine import booking_filter, schedule_request, Scheduler, Slot
+from .intervals import IntervalIndex
+
+__all__ = [
+    "IntervalIndex",
+    "Scheduler",
+    "Slot",
+    "booking_filter",
+    "schedule_request",
+]
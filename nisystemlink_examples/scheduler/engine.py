@@ -0,0 +1,321 @@
+"""This module finds the earliest slots for test plans on systems and their fixtures.
+
+Classes:
+    Slot: The system, fixtures and time window a test plan is scheduled to.
+    Scheduler: Books test plans into per-system and per-fixture interval indexes and
+        finds the earliest slot on any compatible system.
+
+Functions:
+    booking_filter: Builds the test plan query filter of the bookings in a time window.
+    schedule_request: Builds one request scheduling many test plans.
+
+Times may be given with any time zone and are converted to UTC. Naive times, without a
+time zone, are taken to be in UTC, like the times of the Test Plans API.
+"""
+
+import operator
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .intervals import IntervalIndex
+from ..query.updates import get_field
+
+DATE_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+def _utc(value: datetime) -> datetime:
+    """Converts a time to UTC, taking a naive time to be in UTC already."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _format(value: datetime) -> str:
+    return _utc(value).strftime(DATE_TIME_FORMAT)
+
+
+@dataclass
+class Slot:
+    """The system, fixtures and time window a test plan is scheduled to.
+
+    Attributes:
+        test_plan_id: The ID of the test plan.
+        system_id: The ID of the system.
+        start: The planned start of the test plan.
+        end: The estimated end of the test plan.
+        fixture_ids: The IDs of the fixtures reserved for the test plan.
+    """
+
+    test_plan_id: str
+    system_id: str
+    start: datetime
+    end: datetime
+    fixture_ids: List[str] = field(default_factory=list)
+
+    def schedule_request(self) -> Dict[str, Any]:
+        """Builds the request scheduling the test plan to the slot.
+
+        Returns:
+            The request, which can also be passed to the `ScheduleTestPlanRequest`
+            model of `nisystemlink-clients`.
+        """
+        return {
+            "id": self.test_plan_id,
+            "systemId": self.system_id,
+            "fixtureIds": list(self.fixture_ids),
+            "plannedStartDateTime": _format(self.start),
+            "estimatedEndDateTime": _format(self.end),
+            "estimatedDurationInSeconds": int((self.end - self.start).total_seconds()),
+        }
+
+
+def booking_filter(start: datetime, end: datetime) -> str:
+    """Builds the test plan query filter of the bookings in a time window.
+
+    The filter does not list the systems, as `Scheduler.book_test_plans` skips the
+    test plans of systems it does not know. One query thus serves any number of
+    systems.
+
+    Args:
+        start: The start of the window.
+        end: The end of the window.
+
+    Returns:
+        The filter of the test plans planned to overlap the window.
+    """
+    return (
+        f'plannedStartDateTime <= "{_format(end)}" and '
+        f'estimatedEndDateTime >= "{_format(start)}"'
+    )
+
+
+def schedule_request(slots: Iterable[Slot], replace: bool = True) -> Dict[str, Any]:
+    """Builds one request scheduling many test plans.
+
+    Args:
+        slots: The slots of the test plans.
+        replace: Whether the system and fixtures of the test plans are replaced
+            instead of added to.
+
+    Returns:
+        The body of a `schedule-testplans` request, which can also be passed to the
+        `ScheduleTestPlansRequest` model of `nisystemlink-clients`.
+    """
+    return {
+        "testPlans": [slot.schedule_request() for slot in slots],
+        "replace": replace,
+    }
+
+
+def _date_time(value: Any) -> Optional[datetime]:
+    if value is None:
+        return None
+    if not isinstance(value, datetime):
+        value = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return _utc(value)
+
+
+class Scheduler:
+    """Books test plans into per-system and per-fixture interval indexes.
+
+    Every system and fixture keeps its bookings in an `IntervalIndex`. A test plan
+    without fixtures occupies its whole system, so it is booked on the system and on
+    every fixture of the system. A test plan with fixtures is booked on its fixtures
+    and on the system, leaving the other fixtures of the system free.
+
+    Slots are searched with binary searches on the indexes of the compatible systems
+    and their fixtures, instead of rebuilding and scanning the bookings of every
+    system for every test plan. Each scheduled test plan is booked right away, so the
+    test plans scheduled later take it into account, and all of them can be sent in
+    one request built by `schedule_request`.
+    """
+
+    def __init__(self, start: datetime, end: datetime):
+        """Initializes a scheduler without systems.
+
+        Args:
+            start: The earliest start of a scheduled test plan.
+            end: The latest end of a scheduled test plan.
+        """
+        self.start = _utc(start)
+        self.end = _utc(end)
+        self._systems: Dict[str, IntervalIndex] = {}
+        self._system_fixtures: Dict[str, List[str]] = {}
+        self._fixtures: Dict[str, IntervalIndex] = {}
+
+    def add_system(self, system_id: str, fixture_ids: Sequence[str] = ()) -> None:
+        """Adds a system and its fixtures.
+
+        Adding a known system again adds its new fixtures.
+
+        Args:
+            system_id: The ID of the system.
+            fixture_ids: The IDs of the fixtures of the system.
+        """
+        self._systems.setdefault(system_id, IntervalIndex())
+        fixtures = self._system_fixtures.setdefault(system_id, [])
+        for fixture_id in fixture_ids:
+            if fixture_id not in fixtures:
+                fixtures.append(fixture_id)
+                self._fixtures.setdefault(fixture_id, IntervalIndex())
+
+    def fixtures(self, system_id: str) -> List[str]:
+        """Returns the IDs of the fixtures of a system."""
+        return list(self._system_fixtures.get(system_id, []))
+
+    def book(
+        self,
+        system_id: str,
+        start: datetime,
+        end: datetime,
+        fixture_ids: Sequence[str] = (),
+    ) -> None:
+        """Books a time window on a system.
+
+        Args:
+            system_id: The ID of the system, which must have been added.
+            start: The start of the window.
+            end: The end of the window.
+            fixture_ids: The IDs of the fixtures used, or none to occupy the whole
+                system.
+
+        Raises:
+            KeyError: The system has not been added.
+        """
+        start, end = _utc(start), _utc(end)
+        self._systems[system_id].add(start, end)
+        for fixture_id in fixture_ids or self._system_fixtures[system_id]:
+            self._fixtures.setdefault(fixture_id, IntervalIndex()).add(start, end)
+
+    def book_test_plans(self, test_plans: Iterable[Any]) -> int:
+        """Books the windows of scheduled test plans.
+
+        Test plans on systems that have not been added, and test plans without a
+        planned start or estimated end, are skipped.
+
+        Args:
+            test_plans: The test plans, as `TestPlan` models of `nisystemlink-clients`
+                or as dictionaries of the Test Plans API.
+
+        Returns:
+            The number of booked test plans.
+        """
+        booked = 0
+        for test_plan in test_plans:
+            system_id = get_field(test_plan, "system_id", "systemId")
+            start = _date_time(
+                get_field(test_plan, "planned_start_date_time", "plannedStartDateTime")
+            )
+            end = _date_time(
+                get_field(test_plan, "estimated_end_date_time", "estimatedEndDateTime")
+            )
+            if system_id not in self._systems or start is None or end is None:
+                continue
+            fixture_ids = get_field(test_plan, "fixture_ids", "fixtureIds") or ()
+            self.book(system_id, start, end, fixture_ids)
+            booked += 1
+        return booked
+
+    def earliest_slot(
+        self,
+        duration: timedelta,
+        fixture_count: int = 0,
+        system_ids: Optional[Iterable[str]] = None,
+        not_before: Optional[datetime] = None,
+    ) -> Optional[Tuple[str, datetime, List[str]]]:
+        """Finds the earliest slot on any compatible system.
+
+        Args:
+            duration: The estimated duration of the test plan.
+            fixture_count: The number of fixtures of one system the test plan needs
+                at the same time, or 0 to occupy the whole system.
+            system_ids: The IDs of the compatible systems, e.g. the systems matching
+                the system filter of the test plan. Defaults to every system.
+            not_before: The earliest start. Defaults to the start of the scheduler.
+
+        Returns:
+            The ID of the system, the start in UTC and the IDs of the fixtures of the
+            earliest slot, or None if no system has a slot before the end of the
+            scheduler. Of systems with the same earliest start, the first one wins.
+        """
+        not_before = max(_utc(not_before or self.start), self.start)
+        best: Optional[Tuple[str, datetime, List[str]]] = None
+        for system_id in self._systems if system_ids is None else system_ids:
+            if system_id not in self._systems:
+                continue
+            # A slot must start before the best one found so far to replace it.
+            deadline = self.end if best is None else min(self.end, best[1] + duration)
+            if fixture_count:
+                found = self._earliest_with_fixtures(
+                    system_id, fixture_count, duration, not_before, deadline
+                )
+            else:
+                start = self._systems[system_id].earliest_fit(
+                    duration, not_before, deadline
+                )
+                found = None if start is None else (start, [])
+            if found is not None and (best is None or found[0] < best[1]):
+                best = (system_id, found[0], found[1])
+        return best
+
+    def schedule(
+        self,
+        test_plan_id: str,
+        duration: timedelta,
+        fixture_count: int = 0,
+        system_ids: Optional[Iterable[str]] = None,
+        not_before: Optional[datetime] = None,
+    ) -> Optional[Slot]:
+        """Finds the earliest slot of a test plan and books it.
+
+        Args:
+            test_plan_id: The ID of the test plan.
+            duration: The estimated duration of the test plan.
+            fixture_count: The number of fixtures the test plan needs, or 0 to occupy
+                the whole system.
+            system_ids: The IDs of the compatible systems. Defaults to every system.
+            not_before: The earliest start. Defaults to the start of the scheduler.
+
+        Returns:
+            The booked slot, or None if there is no slot before the end of the
+            scheduler.
+        """
+        found = self.earliest_slot(duration, fixture_count, system_ids, not_before)
+        if found is None:
+            return None
+        system_id, start, fixture_ids = found
+        self.book(system_id, start, start + duration, fixture_ids)
+        return Slot(test_plan_id, system_id, start, start + duration, fixture_ids)
+
+    def _earliest_with_fixtures(
+        self,
+        system_id: str,
+        fixture_count: int,
+        duration: timedelta,
+        not_before: datetime,
+        deadline: datetime,
+    ) -> Optional[Tuple[datetime, List[str]]]:
+        """Finds the earliest time enough fixtures of a system are free together.
+
+        No slot starts before the `fixture_count`-th earliest free window of the
+        single fixtures, so the search jumps to that time until the fixtures are
+        free together. Each step costs one binary search per fixture.
+        """
+        fixture_ids = self._system_fixtures[system_id]
+        if len(fixture_ids) < fixture_count:
+            return None
+        start = not_before
+        while True:
+            fits = []
+            for fixture_id in fixture_ids:
+                fit = self._fixtures[fixture_id].earliest_fit(duration, start, deadline)
+                if fit is not None:
+                    fits.append((fit, fixture_id))
+            if len(fits) < fixture_count:
+                return None
+            fits.sort(key=operator.itemgetter(0))
+            latest = fits[fixture_count - 1][0]
+            if latest == start:
+                return start, [fixture_id for _, fixture_id in fits[:fixture_count]]
+            start = latest
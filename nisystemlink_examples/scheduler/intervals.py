@@ -0,0 +1,89 @@
+"""This module keeps the booked time windows of a resource in a sorted interval index.
+
+Classes:
+    IntervalIndex: The booked windows of one system or fixture, merged and sorted so
+        that overlaps and free slots are found by binary search.
+"""
+
+import bisect
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple
+
+
+class IntervalIndex:
+    """The booked windows of one system or fixture.
+
+    Windows are half-open, so a booking ending at 10:00 does not overlap one starting
+    at 10:00. Overlapping and adjacent windows are merged as they are added, which
+    keeps both the start and the end times sorted. Every lookup starts with a binary
+    search, and a search for a free slot only walks the gaps that are too short.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an index without bookings."""
+        self._starts: List[datetime] = []
+        self._ends: List[datetime] = []
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __iter__(self) -> Iterator[Tuple[datetime, datetime]]:
+        return zip(self._starts, self._ends)
+
+    def add(self, start: datetime, end: datetime) -> None:
+        """Books a window, merging it with the windows it overlaps or touches.
+
+        Args:
+            start: The start of the window.
+            end: The end of the window. Empty or inverted windows are ignored.
+        """
+        if end <= start:
+            return
+        first = bisect.bisect_left(self._ends, start)
+        last = bisect.bisect_right(self._starts, end)
+        if first < last:
+            start = min(start, self._starts[first])
+            end = max(end, self._ends[last - 1])
+        self._starts[first:last] = [start]
+        self._ends[first:last] = [end]
+
+    def is_free(self, start: datetime, end: datetime) -> bool:
+        """Tells whether a window overlaps no booking.
+
+        Args:
+            start: The start of the window.
+            end: The end of the window.
+
+        Returns:
+            True if the window is free.
+        """
+        position = bisect.bisect_right(self._ends, start)
+        return position == len(self._starts) or self._starts[position] >= end
+
+    def earliest_fit(
+        self,
+        duration: timedelta,
+        not_before: datetime,
+        deadline: Optional[datetime] = None,
+    ) -> Optional[datetime]:
+        """Finds the earliest free window of a duration.
+
+        Args:
+            duration: The length of the window.
+            not_before: The earliest start of the window.
+            deadline: The latest end of the window, or None for no limit.
+
+        Returns:
+            The start of the earliest free window, or None if it would end after the
+            `deadline`.
+        """
+        start = not_before
+        position = bisect.bisect_right(self._ends, start)
+        while (
+            position < len(self._starts) and self._starts[position] < start + duration
+        ):
+            start = max(start, self._ends[position])
+            position += 1
+        if deadline is not None and start + duration > deadline:
+            return None
+        return start
@@ -0,0 +1,60 @@
+"""This module creates the HTTP sessions shared by the clients of this package.
+
+Functions:
+    create_session: Creates an authenticated session with a retrying connection pool.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RETRY_STATUS_CODES = (429, 503)
+
+
+def create_session(
+    api_key: str,
+    pool_connections: int = 10,
+    pool_maxsize: int = 10,
+    max_retries: int = 3,
+    backoff_factor: float = 0.5,
+) -> requests.Session:
+    """Creates a session that authenticates with an API key and keeps connections alive.
+
+    Requests rejected with 429 or 503 are retried with exponential backoff, honoring
+    the `Retry-After` header sent by the server, as are requests that could not
+    connect. Requests that fail after they were sent, e.g. by a read timeout, are not
+    retried, as the server may have applied them already.
+
+    Args:
+        api_key: The API key used to authenticate against the server.
+        pool_connections: The number of per-host connection pools to cache.
+        pool_maxsize: The maximum number of connections kept open to a single host.
+            Requests beyond this limit wait for a free connection.
+        max_retries: How often a request rejected with 429 or 503, or failing to
+            connect, is retried.
+        backoff_factor: The base delay in seconds of the exponential retry backoff.
+
+    Returns:
+        The session.
+    """
+    session = requests.Session()
+    session.headers.update({"X-NI-API-KEY": api_key})
+    retry = Retry(
+        total=max_retries,
+        read=0,
+        other=0,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=None,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+        pool_block=True,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
@@ -0,0 +1,12 @@
+"""Specification utilities for SystemLink Enterprise demo package.
+
+This module analyzes the specifications of products in bulk, analyzing them while
+they are queried and sending their updates in bounded, concurrent chunks.
+"""
+
+from .pipeline import analyze_specs, SpecAnalysisReport
+
+__all__ = [
+    "SpecAnalysisReport",
+    "analyze_specs",
+]
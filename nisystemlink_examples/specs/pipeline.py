@@ -0,0 +1,135 @@
+"""This module analyzes many specifications and updates them in bounded chunks.
+
+Classes:
+    SpecAnalysisReport: The outcome of an analysis run.
+
+Functions:
+    analyze_specs: Analyzes specs as they are queried and sends their updates in
+        concurrent chunks, retrying only the specs that failed.
+"""
+
+import functools
+import itertools
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple
+
+from ..query.updates import ChunkedUpdater, error_message
+
+DEFAULT_SPECS_PER_UPDATE = 1000
+
+
+@dataclass
+class SpecAnalysisReport:
+    """The outcome of an analysis run.
+
+    Attributes:
+        updated_specs: The `updated_specs` of all update responses.
+        failed_specs: The specs whose update still failed after the retries.
+        analysis_errors: The specs whose analysis raised an error, with the error.
+            They are not updated.
+        unchanged: The number of specs the analysis left unchanged.
+        errors: The errors of the failed update requests.
+    """
+
+    updated_specs: List[Any] = field(default_factory=list)
+    failed_specs: List[Any] = field(default_factory=list)
+    analysis_errors: List[Tuple[Any, str]] = field(default_factory=list)
+    unchanged: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+def _analyze_safely(
+    analyze: Callable[[Any], Any], spec: Any
+) -> Tuple[Any, Optional[str]]:
+    """Runs the analysis of a spec, returning its error instead of raising it.
+
+    It is a module level function, so it can be sent to a process pool.
+    """
+    try:
+        return analyze(spec), None
+    except Exception as e:
+        return spec, error_message(e)
+
+
+def analyze_specs(
+    specs: Iterable[Any],
+    analyze: Callable[[Any], Any],
+    update: Callable[[List[Any]], Any],
+    specs_per_update: int = DEFAULT_SPECS_PER_UPDATE,
+    max_updates: int = 4,
+    max_workers: int = 4,
+    executor: Optional[Executor] = None,
+    retries: int = 1,
+) -> SpecAnalysisReport:
+    """Analyzes specs as they are queried and sends their updates in chunks.
+
+    The specs are taken from `specs` one chunk of `specs_per_update` at a time and
+    analyzed by a pool of workers. Every analyzed chunk is sent in one update request,
+    with up to `max_updates` requests running while the next chunks are analyzed, so
+    at most `max_updates + 2` chunks are held in memory. Specs whose update failed,
+    whether reported as failed by the server or in a request that raised an error,
+    are sent again after all chunks, up to `retries` times.
+
+    Args:
+        specs: The specs, e.g. `paginate(client.query_specs, request, "specs")` to
+            query them page by page while they are analyzed.
+        analyze: The function analyzing one spec. It returns the spec to update,
+            e.g. the spec with new properties, or None if the spec is unchanged.
+        update: The function sending the update of a chunk of specs, e.g. building
+            an `UpdateSpecificationsRequest` and passing it to
+            `SpecClient.update_specs`. It returns the response, with the
+            `updated_specs` and `failed_specs` of the chunk.
+        specs_per_update: The maximum number of specs sent in one update request.
+        max_updates: The maximum number of update requests running at the same time.
+        max_workers: The number of threads analyzing specs, if no `executor` is
+            given.
+        executor: The pool analyzing specs, e.g. a `ProcessPoolExecutor` for
+            analyses bound by computation. The `analyze` function and the specs must
+            then be picklable. The executor is not shut down.
+        retries: The number of times failed specs are sent again. Failures that do
+            not go away by themselves, such as version conflicts, still fail.
+
+    Returns:
+        The updated and failed specs of all chunks and the errors of the analysis.
+    """
+    report = SpecAnalysisReport()
+    analyze_spec = functools.partial(_analyze_safely, analyze)
+    updated_field = ("updated_specs", "updatedSpecs")
+    failed_field = ("failed_specs", "failedSpecs")
+    analyzer = executor or ThreadPoolExecutor(max_workers=max_workers)
+    remaining = iter(specs)
+    try:
+        with ChunkedUpdater(
+            update, updated_field, failed_field, max_updates
+        ) as updater:
+            while batch := list(itertools.islice(remaining, specs_per_update)):
+                chunk = []
+                for spec, error in analyzer.map(analyze_spec, batch):
+                    if error is not None:
+                        report.analysis_errors.append((spec, error))
+                    elif spec is None:
+                        report.unchanged += 1
+                    else:
+                        chunk.append(spec)
+                if chunk:
+                    updater.submit(chunk)
+            for attempt in range(retries + 1):
+                updater.wait()
+                if attempt == retries or not updater.failed:
+                    break
+                retry = _chunks(updater.failed, specs_per_update)
+                updater.failed = []
+                for chunk in retry:
+                    updater.submit(chunk)
+    finally:
+        if executor is None:
+            analyzer.shutdown()
+    report.updated_specs = updater.updated
+    report.failed_specs = updater.failed
+    report.errors = updater.errors
+    return report
+
+
+def _chunks(items: Sequence[Any], size: int) -> List[List[Any]]:
+    return [list(items[start : start + size]) for start in range(0, len(items), size)]
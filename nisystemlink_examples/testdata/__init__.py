@@ -4,8 +4,9 @@ This module provides utilities for generating test data and simulating test exec
 scenarios for SystemLink Enterprise integrations.
 """
 
-from .simulator import Simulator
+from .simulator import SimulatedSequence, Simulator
 
 __all__ = [
+    "SimulatedSequence",
     "Simulator",
 ]
@@ -1,16 +1,179 @@
 """This module provides a `Simulator` class for simulating test sequences in SystemLink.
 
 Classes:
-    Simulator: Simulates test sequences by printing provided test parameters.
+    SimulatedSequence: The measurements of one simulated test sequence, stored as columns.
+    Simulator: Simulates power test sequences as vectorized sweeps of current and voltage.
 """
 
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional
+
+import numpy as np
+
+from ..testmonitor.payloads import create_test_result, FAILED_STATUS, PASSED_STATUS
+from ..testmonitor.steps import StepTree
+
+
+@dataclass
+class SimulatedSequence:
+    """The measurements of one simulated test sequence.
+
+    Every measurement is one row of the column arrays, ordered by current and then by
+    voltage, so the measurements of one voltage sweep are contiguous.
+
+    Attributes:
+        part_number: The part number of the tested unit.
+        serial_number: The serial number of the tested unit.
+        test_plan_id: The ID of the test plan the sequence belongs to.
+        system_id: The ID of the system that ran the sequence.
+        test_program: The name of the test program.
+        operator: The operator who ran the sequence.
+        hostname: The host name of the system that ran the sequence.
+        current: The input current of every measurement.
+        voltage: The input voltage of every measurement.
+        power: The measured power of every measurement.
+        passed: Whether each measured power is within the limits.
+        low_limit: The lowest passing power.
+        high_limit: The highest passing power.
+    """
+
+    part_number: str
+    serial_number: str
+    test_plan_id: str
+    system_id: str
+    test_program: str
+    operator: str
+    hostname: str
+    current: np.ndarray
+    voltage: np.ndarray
+    power: np.ndarray
+    passed: np.ndarray
+    low_limit: float
+    high_limit: float
+
+    def __len__(self) -> int:
+        return len(self.power)
+
+    @property
+    def status(self) -> Dict[str, str]:
+        """The status of the sequence, which fails if any measurement failed."""
+        return dict(PASSED_STATUS if self.passed.all() else FAILED_STATUS)
+
+    def to_result(self, **result_fields: Any) -> Dict[str, Any]:
+        """Builds the test result of the sequence.
+
+        Args:
+            **result_fields: Further arguments passed to `create_test_result`.
+
+        Returns:
+            The result data used to create a test result.
+        """
+        properties = {"testPlanId": self.test_plan_id}
+        properties.update(result_fields.pop("properties", None) or {})
+        return create_test_result(
+            program_name=self.test_program,
+            part_number=self.part_number,
+            operator=self.operator,
+            serial_number=self.serial_number,
+            system_id=self.system_id,
+            host_name=self.hostname,
+            properties=properties,
+            status=self.status,
+            **result_fields,
+        )
+
+    def to_step_tree(self, result_id: str) -> StepTree:
+        """Builds the steps of the sequence.
+
+        Every current gets a "Voltage Sweep" step with one "Measure Power Output" child
+        step per measurement. The sweep steps take the status of their measurements.
+
+        Args:
+            result_id: The ID of the result the steps belong to.
+
+        Returns:
+            The step tree, ready to be uploaded.
+        """
+        tree = StepTree(result_id)
+        low_limit, high_limit = str(self.low_limit), str(self.high_limit)
+        columns = zip(
+            self.current.tolist(),
+            self.voltage.tolist(),
+            self.power.tolist(),
+            self.passed.tolist(),
+        )
+        sweep = None
+        sweep_current = None
+        for current, voltage, power, passed in columns:
+            if sweep is None or current != sweep_current:
+                sweep = tree.add_step("Voltage Sweep", "SequenceCall")
+                sweep_current = current
+            status = PASSED_STATUS if passed else FAILED_STATUS
+            parameter = {
+                "name": "Power Test",
+                "status": status["statusType"],
+                "measurement": str(power),
+                "units": "Watts",
+                "nominalValue": None,
+                "lowLimit": low_limit,
+                "highLimit": high_limit,
+                "comparisonType": "GELE",
+            }
+            tree.add_step(
+                "Measure Power Output",
+                "NumericLimit",
+                parent=sweep,
+                inputs=[
+                    {"name": "current", "value": current},
+                    {"name": "voltage", "value": voltage},
+                ],
+                outputs=[{"name": "power", "value": power}],
+                parameters={"text": "", "parameters": [parameter]},
+                status=dict(status),
+            )
+        tree.roll_up_status()
+        return tree
+
 
 class Simulator:
-    """Simulates test sequences based on a test plan for a product using its specifications."""
+    """Simulates test sequences based on a test plan for a product using its specifications.
 
-    def __init__(self):
-        """Initializes the Simulator."""
-        pass
+    A sequence sweeps the input current and voltage of a power supply and measures its
+    output power, P = I * V, with a random current and voltage loss to simulate a
+    non-ideal device. Each measurement passes if the power is within the limits. The
+    whole sweep is computed at once with NumPy, so sequences with millions of
+    measurements are generated quickly.
+    """
+
+    def __init__(
+        self,
+        currents: Optional[Iterable[float]] = None,
+        voltages: Optional[Iterable[float]] = None,
+        low_limit: float = 0.0,
+        high_limit: float = 70.0,
+        max_loss: float = 0.25,
+        seed: Optional[int] = None,
+    ):
+        """Initializes the Simulator.
+
+        Args:
+            currents: The input currents of the sweep. Defaults to 0 through 9.
+            voltages: The input voltages swept at every current. Defaults to 0 through 9.
+            low_limit: The lowest passing power.
+            high_limit: The highest passing power.
+            max_loss: The largest fraction of current and voltage lost in the device.
+            seed: The seed of the random generator, for reproducible sequences.
+        """
+        self.currents = np.asarray(
+            range(10) if currents is None else list(currents), dtype=float
+        )
+        self.voltages = np.asarray(
+            range(10) if voltages is None else list(voltages), dtype=float
+        )
+        self.low_limit = low_limit
+        self.high_limit = high_limit
+        self.max_loss = max_loss
+        self._random = np.random.default_rng(seed)
 
     def simulate_sequence(
         self,
@@ -21,6 +184,39 @@ class Simulator:
         test_program: str,
         operator: str,
         hostname: str,
-    ) -> str:
-        """Simulates a test sequence."""
-        return "Hello World!"
+    ) -> SimulatedSequence:
+        """Simulates a test sequence.
+
+        Args:
+            part_number: The part number of the tested unit.
+            serial_number: The serial number of the tested unit.
+            test_plan_id: The ID of the test plan the sequence belongs to.
+            system_id: The ID of the system that runs the sequence.
+            test_program: The name of the test program.
+            operator: The operator who runs the sequence.
+            hostname: The host name of the system that runs the sequence.
+
+        Returns:
+            The measurements of every current and voltage combination.
+        """
+        current = np.repeat(self.currents, len(self.voltages))
+        voltage = np.tile(self.voltages, len(self.currents))
+        losses = 1 - self._random.random((2, len(current))) * self.max_loss
+        current_loss, voltage_loss = losses
+        power = current * current_loss * voltage * voltage_loss
+        passed = (power >= self.low_limit) & (power <= self.high_limit)
+        return SimulatedSequence(
+            part_number=part_number,
+            serial_number=serial_number,
+            test_plan_id=test_plan_id,
+            system_id=system_id,
+            test_program=test_program,
+            operator=operator,
+            hostname=hostname,
+            current=current,
+            voltage=voltage,
+            power=power,
+            passed=passed,
+            low_limit=self.low_limit,
+            high_limit=self.high_limit,
+        )
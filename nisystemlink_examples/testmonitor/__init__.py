@@ -0,0 +1,28 @@
+"""TestMonitor utilities for SystemLink Enterprise demo package.
+
+This module provides synchronous and asyncio clients, payload builders, a batching
+step writer, an in-memory step tree and an offline spool for publishing test results
+and steps to the SystemLink Test Monitor service, as well as bulk deletion of results.
+"""
+
+from .async_client import AsyncTestDataManagerClient
+from .batch import StepBatchWriter, StepWriteError
+from .client import TestDataManagerClient
+from .delete import bulk_delete_results, BulkDeleteReport
+from .payloads import create_test_result, create_test_step
+from .spool import ResultSpool
+from .steps import StepNode, StepTree
+
+__all__ = [
+    "AsyncTestDataManagerClient",
+    "BulkDeleteReport",
+    "ResultSpool",
+    "StepBatchWriter",
+    "StepNode",
+    "StepTree",
+    "StepWriteError",
+    "TestDataManagerClient",
+    "bulk_delete_results",
+    "create_test_result",
+    "create_test_step",
+]
@@ -0,0 +1,225 @@
+"""This module provides an asyncio client for the SystemLink Test Monitor v2 API.
+
+Classes:
+    AsyncTestDataManagerClient: The asyncio counterpart of `TestDataManagerClient`.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .client import (
+    CREATE_RESULTS_ROUTE,
+    CREATE_STEPS_ROUTE,
+    DELETE_RESULT_ROUTE,
+    DELETE_RESULTS_ROUTE,
+    UPDATE_RESULTS_ROUTE,
+    UPDATE_STEPS_ROUTE,
+)
+from .payloads import (
+    create_results_request,
+    delete_results_request,
+    steps_request,
+    update_results_request,
+)
+from ..session import RETRY_STATUS_CODES
+
+
+class AsyncTestDataManagerClient:
+    """Asyncio client for the Test Monitor v2 routes of one SystemLink Enterprise server.
+
+    The client mirrors the methods of `TestDataManagerClient` as coroutines. At most
+    `max_concurrency` requests are in flight at any time; further calls wait for a
+    free slot, so many units can be uploaded concurrently from one event loop without
+    flooding the server. Requests rejected with 429 or 503 are retried with
+    exponential backoff, honoring the `Retry-After` header sent by the server.
+    """
+
+    __test__ = False  # Keep pytest from collecting this class because of its name.
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        max_concurrency: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: Optional[float] = None,
+    ):
+        """Initializes the client.
+
+        Args:
+            base_url: The server URL including the scheme, host, and port if not default.
+            api_key: The API key used to authenticate against the server.
+            max_concurrency: The maximum number of requests in flight at the same time.
+                This is also the size of the connection pool.
+            max_retries: How often a request rejected with 429 or 503 is retried.
+            backoff_factor: The base delay in seconds of the exponential retry backoff.
+            timeout: The timeout in seconds for a single request, or None to wait forever.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._client = httpx.AsyncClient(
+            base_url=base_url if base_url.endswith("/") else base_url + "/",
+            headers={"X-NI-API-KEY": api_key},
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+            timeout=timeout,
+        )
+
+    async def __aenter__(self) -> "AsyncTestDataManagerClient":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """Closes all pooled connections."""
+        await self._client.aclose()
+
+    async def create_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Creates new test results. The server generates the result IDs.
+
+        Args:
+            results: The results to be created.
+
+        Returns:
+            The JSON response of the server.
+        """
+        if len(results) == 0:
+            raise ValueError("Number of results to be created can not be empty.")
+        response = await self.post(
+            CREATE_RESULTS_ROUTE, create_results_request(results)
+        )
+        return response.json()
+
+    async def update_results(
+        self, results: List[Dict[str, Any]], determine_status_from_steps: bool = True
+    ) -> Dict[str, Any]:
+        """Updates existing test results by merging or replacing values.
+
+        Args:
+            results: The results to be updated.
+            determine_status_from_steps: Whether the result status should be derived
+                from the status of its steps.
+
+        Returns:
+            The JSON response of the server.
+        """
+        if len(results) == 0:
+            raise ValueError("Number of results to be updated can not be empty.")
+        body = update_results_request(results, determine_status_from_steps)
+        return (await self.post(UPDATE_RESULTS_ROUTE, body)).json()
+
+    async def create_steps(
+        self, steps: List[Dict[str, Any]], update_result_total_time: bool = True
+    ) -> Dict[str, Any]:
+        """Creates new test steps.
+
+        The results associated with the steps must exist prior to step creation. The
+        server generates step IDs if they are not provided.
+
+        Args:
+            steps: The steps to be created.
+            update_result_total_time: Whether the result total time should be updated.
+
+        Returns:
+            The JSON response of the server.
+        """
+        if len(steps) == 0:
+            raise ValueError("Number of steps to be created can not be empty.")
+        body = steps_request(steps, update_result_total_time)
+        return (await self.post(CREATE_STEPS_ROUTE, body)).json()
+
+    async def update_steps(
+        self, steps: List[Dict[str, Any]], update_result_total_time: bool = True
+    ) -> Dict[str, Any]:
+        """Updates existing steps by merging or replacing values.
+
+        Args:
+            steps: The steps to be updated.
+            update_result_total_time: Whether the result total time should be updated.
+
+        Returns:
+            The JSON response of the server.
+        """
+        if len(steps) == 0:
+            raise ValueError("Number of steps to be updated can not be empty.")
+        body = steps_request(steps, update_result_total_time)
+        return (await self.post(UPDATE_STEPS_ROUTE, body)).json()
+
+    async def delete_result(self, result_id: str, delete_steps: bool = True) -> None:
+        """Deletes a single test result.
+
+        Args:
+            result_id: The ID of the result to be deleted.
+            delete_steps: Whether the steps of the result should be deleted as well.
+        """
+        if not result_id:
+            raise ValueError("Missing required parameter 'result_id'.")
+        await self.delete(
+            f"{DELETE_RESULT_ROUTE}/{result_id}",
+            params={"deleteSteps": str(delete_steps).lower()},
+        )
+
+    async def delete_results(
+        self, result_ids: List[str], delete_steps: bool = True
+    ) -> Dict[str, Any]:
+        """Deletes multiple test results.
+
+        Args:
+            result_ids: The IDs of the results to be deleted.
+            delete_steps: Whether the steps of the results should be deleted as well.
+
+        Returns:
+            The JSON response of the server, or an empty dictionary if all results
+            were deleted.
+        """
+        if not result_ids:
+            raise ValueError("result_ids cannot be null or empty.")
+        body = delete_results_request(result_ids, delete_steps)
+        response = await self.post(DELETE_RESULTS_ROUTE, body)
+        if response.status_code == 204:
+            return {}
+        return response.json()
+
+    async def get(
+        self, route: str, params: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        """Sends a GET request to a route of the server and raises on HTTP errors."""
+        return await self._request("GET", route, params=params)
+
+    async def post(self, route: str, body: Dict[str, Any]) -> httpx.Response:
+        """Sends a POST request to a route of the server and raises on HTTP errors."""
+        return await self._request("POST", route, json=body)
+
+    async def delete(
+        self, route: str, params: Optional[Dict[str, Any]] = None
+    ) -> httpx.Response:
+        """Sends a DELETE request to a route of the server and raises on HTTP errors."""
+        return await self._request("DELETE", route, params=params)
+
+    async def _request(self, method: str, route: str, **kwargs: Any) -> httpx.Response:
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                response = await self._client.request(method, route, **kwargs)
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt == self.max_retries
+                ):
+                    break
+                await asyncio.sleep(self._retry_delay(response, attempt))
+        response.raise_for_status()
+        return response
+
+    def _retry_delay(self, response: httpx.Response, attempt: int) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff_factor * 2**attempt
@@ -0,0 +1,219 @@
+"""This module provides a `StepBatchWriter` class for buffered Test Monitor step uploads.
+
+Classes:
+    StepBatchWriter: Coalesces step creations and updates into batched requests.
+    StepWriteError: Raised through a step's future when the server rejected the step.
+"""
+
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .client import TestDataManagerClient
+
+_StepKey = Tuple[Optional[str], Optional[str]]
+_SendSteps = Callable[[List[Dict[str, Any]]], Dict[str, Any]]
+
+
+class StepWriteError(Exception):
+    """Raised when the server reports a step as failed in a partial success response."""
+
+    def __init__(self, step: Dict[str, Any], error: Optional[Dict[str, Any]]):
+        """Initializes the error with the rejected step and the server error payload."""
+        super().__init__(f"Step '{step.get('name')}' was not written: {error}")
+        self.step = step
+        self.error = error
+
+
+class _PendingStep:
+    def __init__(self, step: Dict[str, Any], size: int):
+        self.step = step
+        self.size = size
+        self.future: "Future[Dict[str, Any]]" = Future()
+
+
+def _step_key(step: Dict[str, Any]) -> _StepKey:
+    return step.get("resultId"), step.get("stepId")
+
+
+class StepBatchWriter:
+    """Buffers step creations and updates and sends them to the server in batches.
+
+    Steps are flushed when the buffer holds `max_steps` steps, when its estimated JSON
+    size reaches `max_bytes`, or when the oldest buffered step is older than
+    `max_age` seconds. Repeated updates of the same step are merged into a single
+    update, and an update of a step that is still waiting to be created is folded into
+    its creation. Every call returns a future that resolves to the step returned by the
+    server, or raises `StepWriteError` if the server rejected the step. Steps are
+    matched to the response by their `resultId` and `stepId`, so steps created without
+    a `stepId` get a generated one.
+    """
+
+    def __init__(
+        self,
+        client: TestDataManagerClient,
+        max_steps: int = 1000,
+        max_bytes: int = 4 * 1024 * 1024,
+        max_age: Optional[float] = 1.0,
+    ):
+        """Initializes the writer.
+
+        Args:
+            client: The client used to send the batched requests.
+            max_steps: The maximum number of steps sent in one request.
+            max_bytes: The approximate maximum JSON size of one request in bytes.
+            max_age: The maximum time in seconds a step stays buffered, or None to only
+                flush by count and size.
+        """
+        if max_steps < 1:
+            raise ValueError("max_steps must be at least 1.")
+        self._client = client
+        self._max_steps = max_steps
+        self._max_bytes = max_bytes
+        self._max_age = max_age
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._creates: Dict[_StepKey, _PendingStep] = {}
+        self._updates: Dict[_StepKey, _PendingStep] = {}
+        self._size = 0
+        self._oldest: Optional[float] = None
+        self._closed = threading.Event()
+        self._timer: Optional[threading.Thread] = None
+        if max_age is not None:
+            self._timer = threading.Thread(target=self._flush_stale, daemon=True)
+            self._timer.start()
+
+    def __enter__(self) -> "StepBatchWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def create(self, step: Dict[str, Any]) -> "Future[Dict[str, Any]]":
+        """Buffers a step to be created.
+
+        Args:
+            step: The step to be created. A `stepId` is generated if it has none.
+
+        Returns:
+            A future resolving to the created step.
+
+        Raises:
+            ValueError: A step with the same `stepId` is already waiting to be created.
+        """
+        step = dict(step, stepId=step.get("stepId") or str(uuid.uuid4()))
+        pending = _PendingStep(step, len(json.dumps(step)))
+        key = _step_key(step)
+        with self._lock:
+            self._check_open()
+            if key in self._creates:
+                raise ValueError(f"Step {key[1]} is already waiting to be created.")
+            self._creates[key] = pending
+            full = self._add_size(pending.size)
+        if full:
+            self.flush()
+        return pending.future
+
+    def update(self, step: Dict[str, Any]) -> "Future[Dict[str, Any]]":
+        """Buffers an update of an existing step.
+
+        Args:
+            step: The step values to be merged into the existing step. Must contain the
+                step's `stepId` and `resultId`.
+
+        Returns:
+            A future resolving to the updated step.
+        """
+        key = _step_key(step)
+        if key[1] is None:
+            raise ValueError("Steps to be updated must have a stepId.")
+        with self._lock:
+            self._check_open()
+            pending = self._creates.get(key) or self._updates.get(key)
+            if pending is not None:
+                pending.step.update(step)
+                return pending.future
+            pending = _PendingStep(dict(step), len(json.dumps(step)))
+            self._updates[key] = pending
+            full = self._add_size(pending.size)
+        if full:
+            self.flush()
+        return pending.future
+
+    def flush(self) -> None:
+        """Sends all buffered steps. Creations are sent before updates."""
+        with self._flush_lock:
+            with self._lock:
+                creates, self._creates = list(self._creates.values()), {}
+                updates, self._updates = list(self._updates.values()), {}
+                self._size = 0
+                self._oldest = None
+            for batch in self._batches(creates):
+                self._send(self._client.create_steps, batch)
+            for batch in self._batches(updates):
+                self._send(self._client.update_steps, batch)
+
+    def close(self) -> None:
+        """Flushes the remaining steps and stops the background age check."""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join()
+        self.flush()
+
+    def _check_open(self) -> None:
+        if self._closed.is_set():
+            raise RuntimeError("The StepBatchWriter is closed.")
+
+    def _add_size(self, size: int) -> bool:
+        self._size += size
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        count = len(self._creates) + len(self._updates)
+        return count >= self._max_steps or self._size >= self._max_bytes
+
+    def _batches(self, steps: List[_PendingStep]) -> List[List[_PendingStep]]:
+        batches: List[List[_PendingStep]] = []
+        batch: List[_PendingStep] = []
+        size = 0
+        for pending in steps:
+            if batch and (
+                len(batch) >= self._max_steps or size + pending.size > self._max_bytes
+            ):
+                batches.append(batch)
+                batch, size = [], 0
+            batch.append(pending)
+            size += pending.size
+        if batch:
+            batches.append(batch)
+        return batches
+
+    def _send(self, send: _SendSteps, batch: List[_PendingStep]) -> None:
+        try:
+            response = send([pending.step for pending in batch])
+        except Exception as e:
+            for pending in batch:
+                pending.future.set_exception(e)
+            return
+
+        failed = {_step_key(step) for step in response.get("failed") or []}
+        written = {_step_key(step): step for step in response.get("steps") or []}
+        for pending in batch:
+            key = _step_key(pending.step)
+            if key in failed:
+                error = StepWriteError(pending.step, response.get("error"))
+                pending.future.set_exception(error)
+            else:
+                pending.future.set_result(written.get(key, pending.step))
+
+    def _flush_stale(self) -> None:
+        assert self._max_age is not None
+        while not self._closed.wait(self._max_age / 4):
+            with self._lock:
+                oldest = self._oldest
+            if oldest is not None and time.monotonic() - oldest >= self._max_age:
+                self.flush()
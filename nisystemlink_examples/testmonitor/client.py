@@ -0,0 +1,203 @@
+"""This module provides a pooled HTTP client for the SystemLink Test Monitor v2 API.
+
+Classes:
+    TestDataManagerClient: Creates, updates and deletes test results and steps over a
+        keep-alive connection pool.
+"""
+
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from .payloads import (
+    create_results_request,
+    delete_results_request,
+    steps_request,
+    update_results_request,
+)
+from ..session import create_session
+
+CREATE_RESULTS_ROUTE = "nitestmonitor/v2/results"
+CREATE_STEPS_ROUTE = "nitestmonitor/v2/steps"
+UPDATE_RESULTS_ROUTE = "nitestmonitor/v2/update-results"
+UPDATE_STEPS_ROUTE = "nitestmonitor/v2/update-steps"
+DELETE_RESULTS_ROUTE = "nitestmonitor/v2/delete-results"
+DELETE_RESULT_ROUTE = "nitestmonitor/v2/results"
+
+
+class TestDataManagerClient:
+    """Client for the Test Monitor v2 routes of one SystemLink Enterprise server.
+
+    Every client owns a `requests.Session` whose connections are kept alive and reused
+    between calls, so uploading many steps does not pay for a TCP and TLS handshake per
+    request. Requests rejected with 429 or 503 are retried with exponential backoff,
+    honoring the `Retry-After` header sent by the server. Several clients can be used
+    side by side to talk to different servers from one process.
+    """
+
+    __test__ = False  # Keep pytest from collecting this class because of its name.
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        timeout: Optional[float] = None,
+    ):
+        """Initializes the client.
+
+        Args:
+            base_url: The server URL including the scheme, host, and port if not default.
+            api_key: The API key used to authenticate against the server.
+            pool_connections: The number of per-host connection pools to cache.
+            pool_maxsize: The maximum number of connections kept open to a single host.
+                Requests beyond this limit wait for a free connection.
+            max_retries: How often a request rejected with 429 or 503 is retried.
+            backoff_factor: The base delay in seconds of the exponential retry backoff.
+            timeout: The timeout in seconds for a single request, or None to wait forever.
+        """
+        self.base_url = base_url if base_url.endswith("/") else base_url + "/"
+        self.timeout = timeout
+        self.session = create_session(
+            api_key, pool_connections, pool_maxsize, max_retries, backoff_factor
+        )
+
+    def __enter__(self) -> "TestDataManagerClient":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Closes all pooled connections."""
+        self.session.close()
+
+    def create_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Creates new test results. The server generates the result IDs.
+
+        Args:
+            results: The results to be created.
+
+        Returns:
+            The JSON response of the server.
+        """
+        if len(results) == 0:
+            raise ValueError("Number of results to be created can not be empty.")
+        response = self.post(CREATE_RESULTS_ROUTE, create_results_request(results))
+        return response.json()
+
+    def update_results(
+        self, results: List[Dict[str, Any]], determine_status_from_steps: bool = True
+    ) -> Dict[str, Any]:
+        """Updates existing test results by merging or replacing values.
+
+        Args:
+            results: The results to be updated.
+            determine_status_from_steps: Whether the result status should be derived
+                from the status of its steps.
+
+        Returns:
+            The JSON response of the server.
+        """
+        if len(results) == 0:
+            raise ValueError("Number of results to be updated can not be empty.")
+        body = update_results_request(results, determine_status_from_steps)
+        return self.post(UPDATE_RESULTS_ROUTE, body).json()
+
+    def create_steps(
+        self, steps: List[Dict[str, Any]], update_result_total_time: bool = True
+    ) -> Dict[str, Any]:
+        """Creates new test steps.
+
+        The results associated with the steps must exist prior to step creation. The
+        server generates step IDs if they are not provided.
+
+        Args:
+            steps: The steps to be created.
+            update_result_total_time: Whether the result total time should be updated.
+
+        Returns:
+            The JSON response of the server.
+        """
+        if len(steps) == 0:
+            raise ValueError("Number of steps to be created can not be empty.")
+        body = steps_request(steps, update_result_total_time)
+        return self.post(CREATE_STEPS_ROUTE, body).json()
+
+    def update_steps(
+        self, steps: List[Dict[str, Any]], update_result_total_time: bool = True
+    ) -> Dict[str, Any]:
+        """Updates existing steps by merging or replacing values.
+
+        Args:
+            steps: The steps to be updated.
+            update_result_total_time: Whether the result total time should be updated.
+
+        Returns:
+            The JSON response of the server.
+        """
+        if len(steps) == 0:
+            raise ValueError("Number of steps to be updated can not be empty.")
+        body = steps_request(steps, update_result_total_time)
+        return self.post(UPDATE_STEPS_ROUTE, body).json()
+
+    def delete_result(self, result_id: str, delete_steps: bool = True) -> None:
+        """Deletes a single test result.
+
+        Args:
+            result_id: The ID of the result to be deleted.
+            delete_steps: Whether the steps of the result should be deleted as well.
+        """
+        if not result_id:
+            raise ValueError("Missing required parameter 'result_id'.")
+        self.delete(
+            f"{DELETE_RESULT_ROUTE}/{result_id}",
+            params={"deleteSteps": str(delete_steps).lower()},
+        )
+
+    def delete_results(
+        self, result_ids: List[str], delete_steps: bool = True
+    ) -> Dict[str, Any]:
+        """Deletes multiple test results.
+
+        Args:
+            result_ids: The IDs of the results to be deleted.
+            delete_steps: Whether the steps of the results should be deleted as well.
+
+        Returns:
+            The JSON response of the server, or an empty dictionary if all results
+            were deleted.
+        """
+        if not result_ids:
+            raise ValueError("result_ids cannot be null or empty.")
+        body = delete_results_request(result_ids, delete_steps)
+        response = self.post(DELETE_RESULTS_ROUTE, body)
+        if response.status_code == 204:
+            return {}
+        return response.json()
+
+    def get(
+        self, route: str, params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        """Sends a GET request to a route of the server and raises on HTTP errors."""
+        return self._request("GET", route, params=params)
+
+    def post(self, route: str, body: Dict[str, Any]) -> requests.Response:
+        """Sends a POST request to a route of the server and raises on HTTP errors."""
+        return self._request("POST", route, json=body)
+
+    def delete(
+        self, route: str, params: Optional[Dict[str, Any]] = None
+    ) -> requests.Response:
+        """Sends a DELETE request to a route of the server and raises on HTTP errors."""
+        return self._request("DELETE", route, params=params)
+
+    def _request(self, method: str, route: str, **kwargs: Any) -> requests.Response:
+        response = self.session.request(
+            method, self.base_url + route, timeout=self.timeout, **kwargs
+        )
+        response.raise_for_status()
+        return response
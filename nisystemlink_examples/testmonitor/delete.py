@@ -0,0 +1,263 @@
+"""This module provides bulk deletion of Test Monitor results.
+
+Classes:
+    BulkDeleteReport: The outcome of a bulk deletion.
+
+Functions:
+    bulk_delete_results: Deletes any number of results in concurrent, checkpointed chunks.
+"""
+
+import itertools
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .client import TestDataManagerClient
+from ..query import paginate
+
+QUERY_RESULTS_ROUTE = "nitestmonitor/v2/query-results"
+MAX_DELETE_BATCH_SIZE = 1000
+
+
+@dataclass
+class BulkDeleteReport:
+    """The outcome of a bulk deletion.
+
+    Attributes:
+        deleted_count: The number of deleted results.
+        deleted_ids: The IDs of the deleted results, if they were collected.
+        failed: The error message of every result that could not be deleted, by ID.
+    """
+
+    deleted_count: int = 0
+    deleted_ids: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+
+class _RateLimiter:
+    def __init__(self, requests_per_second: Optional[float]):
+        self._interval = 1 / requests_per_second if requests_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def acquire(self) -> None:
+        if not self._interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self._interval
+        time.sleep(start - now)
+
+
+class _Checkpoint:
+    """Tracks how many IDs were handled in order, so a rerun can skip them.
+
+    The IDs of chunks whose request raised an error, e.g. a timeout, did not get an
+    answer from the server. They are kept as `retry_ids`, so a rerun sends them again.
+    """
+
+    def __init__(self, path: Optional[str], report: BulkDeleteReport):
+        self.path = path
+        self.offset = 0
+        self.retry_ids: Dict[str, None] = {}
+        self._report = report
+        self._done: Dict[int, int] = {}
+        self._next_chunk = 0
+        if path and os.path.exists(path):
+            with open(path) as file:
+                state = json.load(file)
+            self.offset = state["offset"]
+            self.retry_ids = dict.fromkeys(state.get("retry_ids", []))
+            report.deleted_count = state["deleted_count"]
+            report.failed.update(state["failed"])
+            for result_id in self.retry_ids:
+                report.failed.pop(result_id, None)
+
+    def complete(
+        self, chunk_index: int, size: int, chunk: List[str], answered: bool
+    ) -> None:
+        """Records a handled chunk.
+
+        The offset is advanced by `size` IDs once all chunks before it are handled.
+        """
+        for result_id in chunk:
+            if answered:
+                self.retry_ids.pop(result_id, None)
+            else:
+                self.retry_ids[result_id] = None
+        self._done[chunk_index] = size
+        while self._next_chunk in self._done:
+            self.offset += self._done.pop(self._next_chunk)
+            self._next_chunk += 1
+        self.save()
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        state = {
+            "offset": self.offset,
+            "deleted_count": self._report.deleted_count,
+            "failed": self._report.failed,
+            "retry_ids": list(self.retry_ids),
+        }
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w") as file:
+            json.dump(state, file)
+        os.replace(temporary_path, self.path)
+
+
+def _query_result_ids(
+    client: TestDataManagerClient, filter: str, page_size: int
+) -> Iterator[str]:
+    """Yields the IDs of the results matching a filter.
+
+    Results deleted while the query is paged shift the pages behind them, so some
+    matching results can be skipped. The query is therefore repeated until a pass
+    yields no new IDs.
+    """
+
+    def query(body: Dict[str, Any]) -> Dict[str, Any]:
+        return client.post(QUERY_RESULTS_ROUTE, body).json()
+
+    seen: Set[str] = set()
+    body: Dict[str, Any] = {
+        "filter": filter,
+        "projection": ["ID"],
+        "take": page_size,
+        "returnCount": False,
+    }
+    while True:
+        found = False
+        for result in paginate(query, body, "results"):
+            if result["id"] not in seen:
+                seen.add(result["id"])
+                found = True
+                yield result["id"]
+        if not found:
+            return
+
+
+def _chunks(ids: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(ids)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+
+def _failed_ids(response: Dict[str, Any], chunk: List[str]) -> Dict[str, str]:
+    """Parses the IDs and error messages of a partial success response."""
+    error = response.get("error") or {}
+    messages = {
+        inner["resourceId"]: inner.get("message", "")
+        for inner in error.get("innerErrors") or []
+        if inner.get("resourceId")
+    }
+    failed = response.get("failed")
+    if failed is None:
+        failed = [result_id for result_id in chunk if result_id in messages]
+    return {
+        result_id: messages.get(result_id, error.get("message", "Not deleted."))
+        for result_id in failed
+    }
+
+
+def bulk_delete_results(
+    client: TestDataManagerClient,
+    result_ids: Optional[Iterable[str]] = None,
+    filter: Optional[str] = None,
+    delete_steps: bool = True,
+    chunk_size: int = MAX_DELETE_BATCH_SIZE,
+    max_workers: int = 4,
+    max_requests_per_second: Optional[float] = None,
+    checkpoint_path: Optional[str] = None,
+    collect_deleted_ids: bool = False,
+) -> BulkDeleteReport:
+    """Deletes any number of test results.
+
+    The IDs are read lazily and deleted in chunks of at most `chunk_size` IDs, with up
+    to `max_workers` delete requests running at the same time. Results the server
+    could not delete are collected from the partial success responses instead of
+    stopping the deletion.
+
+    If a `checkpoint_path` is given, the progress is saved after every chunk. Running
+    the deletion again with the same IDs and checkpoint skips the IDs already handled.
+    Chunks whose request raised an error, such as a timeout, are not handled: their
+    IDs are sent again first. Deletions by `filter` need no offset, as deleted results
+    no longer match the filter, while results that were not deleted still do.
+
+    Args:
+        client: The client used to query and delete the results.
+        result_ids: The IDs of the results to be deleted.
+        filter: A Test Monitor result query filter selecting the results to be deleted.
+            Used when no `result_ids` are given.
+        delete_steps: Whether the steps of the results should be deleted as well.
+        chunk_size: The number of IDs sent per delete request.
+        max_workers: The maximum number of delete requests in flight.
+        max_requests_per_second: The maximum rate of delete requests, or None for no
+            limit.
+        checkpoint_path: The path of a JSON file used to save and resume progress.
+        collect_deleted_ids: Whether the report should list every deleted ID.
+
+    Returns:
+        The number of deleted results and the errors of the results not deleted.
+    """
+    if result_ids is None and filter is None:
+        raise ValueError("Either result_ids or filter must be provided.")
+    if not 0 < chunk_size <= MAX_DELETE_BATCH_SIZE:
+        raise ValueError(f"chunk_size must be between 1 and {MAX_DELETE_BATCH_SIZE}.")
+
+    report = BulkDeleteReport()
+    checkpoint = _Checkpoint(checkpoint_path, report)
+    # Every chunk advances the checkpoint offset by its size. The IDs sent again do
+    # not, as they lie before the offset.
+    chunks: Iterator[Tuple[List[str], int]]
+    ids: Iterator[str]
+    if result_ids is not None:
+        retry = _chunks(list(checkpoint.retry_ids), chunk_size)
+        ids = itertools.islice(result_ids, checkpoint.offset, None)
+        chunks = itertools.chain(
+            ((chunk, 0) for chunk in retry),
+            ((chunk, len(chunk)) for chunk in _chunks(ids, chunk_size)),
+        )
+    else:
+        assert filter is not None
+        checkpoint.retry_ids.clear()
+        ids = _query_result_ids(client, filter, chunk_size)
+        chunks = ((chunk, len(chunk)) for chunk in _chunks(ids, chunk_size))
+    limiter = _RateLimiter(max_requests_per_second)
+    lock = threading.Lock()
+
+    def delete_chunk(chunk: List[str]) -> Tuple[Dict[str, str], bool]:
+        """Deletes a chunk, returning its failed IDs and whether the server answered."""
+        limiter.acquire()
+        try:
+            response = client.delete_results(chunk, delete_steps)
+        except Exception as e:
+            return {result_id: str(e) for result_id in chunk}, False
+        return (_failed_ids(response, chunk) if response else {}), True
+
+    def delete_and_record(index: int, chunk: List[str], size: int) -> None:
+        failed, answered = delete_chunk(chunk)
+        with lock:
+            deleted = [result_id for result_id in chunk if result_id not in failed]
+            report.deleted_count += len(deleted)
+            if collect_deleted_ids:
+                report.deleted_ids.extend(deleted)
+            report.failed.update(failed)
+            checkpoint.complete(index, size, chunk, answered)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        in_flight: Set["Future[None]"] = set()
+        for index, (chunk, size) in enumerate(chunks):
+            if len(in_flight) >= max_workers * 2:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    future.result()
+            in_flight.add(executor.submit(delete_and_record, index, chunk, size))
+        for future in in_flight:
+            future.result()
+    return report
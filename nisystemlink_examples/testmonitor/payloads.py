@@ -0,0 +1,165 @@
+"""Builders for SystemLink Test Monitor v2 request payloads.
+
+These helpers create the result and step dictionaries expected by the Test Monitor
+service and wrap them into the request bodies of the v2 routes.
+
+Functions:
+    create_test_result: Builds a result populated to match the TestStand data model.
+    create_test_step: Builds a step populated to match the TestStand data model.
+    create_results_request: Wraps results into a create results request body.
+    update_results_request: Wraps results into an update results request body.
+    steps_request: Wraps steps into a create or update steps request body.
+    delete_results_request: Builds a delete results request body.
+"""
+
+import datetime
+import random
+import uuid
+from typing import Any, Dict, List, Optional
+
+RUNNING_STATUS = {"statusType": "RUNNING", "statusName": "Running"}
+PASSED_STATUS = {"statusType": "PASSED", "statusName": "Passed"}
+FAILED_STATUS = {"statusType": "FAILED", "statusName": "Failed"}
+
+
+def _utc_now() -> str:
+    return str(datetime.datetime.now(datetime.timezone.utc))
+
+
+def create_test_result(
+    program_name: str = "Power Test",
+    part_number: str = "NI-ABC-123-PWR",
+    operator: Optional[str] = None,
+    serial_number: Optional[str] = None,
+    started_at: Optional[str] = None,
+    system_id: Optional[str] = None,
+    host_name: Optional[str] = None,
+    properties: Optional[Dict[str, str]] = None,
+    file_ids: Optional[List[str]] = None,
+    status: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """Creates the result data and populates it to match the TestStand data model.
+
+    Args:
+        program_name: The test result's program name.
+        part_number: The test result's part number.
+        operator: The test result's operator.
+        serial_number: The test result's serial number. A random UUID is used if omitted.
+        started_at: The test result's start time. The current UTC time is used if omitted.
+        system_id: The test result's system ID.
+        host_name: The test result's host name.
+        properties: The test result's properties.
+        file_ids: The IDs of files attached to the test result.
+        status: The test result's status. Defaults to running.
+
+    Returns:
+        The result data used to create a test result.
+    """
+    return {
+        "programName": program_name,
+        "status": dict(status or RUNNING_STATUS),
+        "systemId": system_id,
+        "hostName": host_name,
+        "properties": properties,
+        "serialNumber": serial_number or str(uuid.uuid4()),
+        "operator": operator,
+        "partNumber": part_number,
+        "fileIds": file_ids,
+        "startedAt": started_at or _utc_now(),
+        "totalTimeInSeconds": random.uniform(0, 1) * 10,
+    }
+
+
+def create_test_step(
+    name: str,
+    step_type: str,
+    result_id: Optional[str],
+    parent_id: Optional[str] = None,
+    children: Optional[List[Dict[str, Any]]] = None,
+    inputs: Optional[List[Dict[str, Any]]] = None,
+    outputs: Optional[List[Dict[str, Any]]] = None,
+    parameters: Optional[Dict[str, Any]] = None,
+    status: Optional[Dict[str, str]] = None,
+    keywords: Optional[List[str]] = None,
+    properties: Optional[Dict[str, str]] = None,
+    step_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Creates the step data and populates it to match the TestStand data model.
+
+    Args:
+        name: The test step's name.
+        step_type: The test step's type.
+        result_id: The ID of the result the step belongs to.
+        parent_id: The ID of the parent step, if any.
+        children: The test step's child steps.
+        inputs: The test step's input values.
+        outputs: The test step's output values.
+        parameters: The measurement parameters.
+        status: The test step's status. Defaults to running.
+        keywords: The test step's keywords.
+        properties: The test step's properties.
+        step_id: The test step's ID. The server generates an ID if omitted.
+
+    Returns:
+        The step data used to create a test step.
+    """
+    return {
+        "stepId": step_id,
+        "parentId": parent_id,
+        "resultId": result_id,
+        "children": children,
+        "data": parameters,
+        "dataModel": "TestStand",
+        "name": name,
+        "startedAt": _utc_now(),
+        "status": dict(status or RUNNING_STATUS),
+        "stepType": step_type,
+        "totalTimeInSeconds": random.uniform(0, 1) * 10,
+        "inputs": inputs,
+        "outputs": outputs,
+        "keywords": keywords,
+        "properties": properties,
+    }
+
+
+def create_results_request(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Creates a create test results request body."""
+    return {"results": results}
+
+
+def update_results_request(
+    results: List[Dict[str, Any]], determine_status_from_steps: bool = False
+) -> Dict[str, Any]:
+    """Creates an update test results request body.
+
+    Args:
+        results: The results to be updated.
+        determine_status_from_steps: Whether the result status should be derived from
+            the status of its steps.
+    """
+    return {
+        "results": results,
+        "determineStatusFromSteps": determine_status_from_steps,
+    }
+
+
+def steps_request(
+    steps: List[Dict[str, Any]], update_result_total_time: bool = False
+) -> Dict[str, Any]:
+    """Creates a create or update test steps request body.
+
+    Args:
+        steps: The steps to be created or updated.
+        update_result_total_time: Whether the result total time should be updated.
+    """
+    return {"steps": steps, "updateResultTotalTime": update_result_total_time}
+
+
+def delete_results_request(result_ids: List[str], delete_steps: bool) -> Dict[str, Any]:
+    """Creates a delete test results request body.
+
+    Args:
+        result_ids: The IDs of the results to be deleted.
+        delete_steps: Whether the steps of the results should be deleted as well.
+    """
+    return {"ids": result_ids, "deleteSteps": delete_steps}
@@ -0,0 +1,414 @@
+"""This module provides a `ResultSpool` class for offline store-and-forward uploads.
+
+Classes:
+    ResultSpool: Stores results and steps in a local SQLite database and replays them to
+        the server in batches.
+"""
+
+import json
+import sqlite3
+import threading
+import uuid
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from .client import TestDataManagerClient
+
+QUERY_RESULTS_ROUTE = "nitestmonitor/v2/query-results"
+STEP_ROUTE = "nitestmonitor/v2/results/{result_id}/steps/{step_id}"
+
+# The result property holding the local ID of a spooled result. It lets the spool find
+# results that reached the server before the spool could record their server ID.
+SPOOL_ID_PROPERTY = "spoolId"
+
+CREATE_RESULT = "create_result"
+UPDATE_RESULT = "update_result"
+CREATE_STEP = "create_step"
+UPDATE_STEP = "update_step"
+
+_SENDING = "sending"
+_FAILED = "failed"
+
+# Client errors that do not depend on the batch: a request that timed out and an API
+# key that expired or lost its permissions until it is replaced.
+_RETRIED_CLIENT_ERRORS = (401, 403, 408, 429)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS operations (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    local_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    state TEXT NOT NULL DEFAULT 'pending',
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS operations_state ON operations (state, seq);
+CREATE TABLE IF NOT EXISTS id_map (
+    local_id TEXT PRIMARY KEY,
+    server_id TEXT NOT NULL
+);
+"""
+
+_Operation = Tuple[int, str, str, Dict[str, Any], str]
+
+
+def _operation_key(body: Dict[str, Any]) -> Tuple[Optional[str], Optional[str]]:
+    """Returns the key matching a sent step or result to its echo in a response."""
+    if "stepId" in body:
+        return body.get("resultId"), body.get("stepId")
+    return body.get("id"), None
+
+
+def _rejection(error: requests.HTTPError) -> Any:
+    """Returns the error body of a batch the server rejected as a whole.
+
+    Raises:
+        requests.HTTPError: The request can be retried, as it was not authorized,
+            timed out, was rate limited or failed with a server error.
+    """
+    response = error.response
+    status = response.status_code if response is not None else None
+    if (
+        response is None
+        or status is None
+        or status in _RETRIED_CLIENT_ERRORS
+        or not 400 <= status < 500
+    ):
+        raise error
+    try:
+        body = response.json()
+    except ValueError:
+        return {"message": response.text or str(error)}
+    return body.get("error", body) if isinstance(body, dict) else body
+
+
+class ResultSpool:
+    """Writes results and steps to a local spool first and forwards them to the server.
+
+    Every call only appends to a SQLite database in WAL mode, so the test sequence never
+    waits for the server. A drainer replays the spooled operations in their original
+    order, combining consecutive operations of the same kind into batched requests.
+
+    Results get a local ID when they are spooled. The server ID is recorded in the spool
+    once the result is created, and all later result updates and steps referring to the
+    local ID are rewritten before they are sent. Steps should carry client-generated
+    step IDs, which the server keeps, so they need no mapping.
+
+    Operations are marked as sending before each request. If the process stops before
+    the outcome was recorded, result creations are looked up on the server by their
+    `spoolId` property, and step creations rejected on replay are looked up by their
+    step ID, so nothing is uploaded twice. Operations the server rejects, one by one in
+    a partial success or as a whole batch with a client error, are kept in the spool
+    as failed and do not block the operations behind them. Connection errors,
+    authorization errors, timeouts, rate limiting and server errors are retried.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        client: TestDataManagerClient,
+        batch_size: int = 500,
+        retry_interval: float = 5.0,
+    ):
+        """Initializes the spool and creates the database if it does not exist.
+
+        Args:
+            path: The path of the SQLite database file.
+            client: The client used to forward the spooled operations.
+            batch_size: The maximum number of results or steps sent in one request.
+            retry_interval: The time in seconds the background drainer waits before
+                retrying after the server could not be reached.
+        """
+        self._client = client
+        self._batch_size = batch_size
+        self._retry_interval = retry_interval
+        self._lock = threading.RLock()
+        # Held while draining, so a manual drain and the background drainer do not
+        # send the same operations.
+        self._drain_lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._wake = threading.Event()
+        self._stopped = threading.Event()
+        self._drainer: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "ResultSpool":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def create_result(self, result: Dict[str, Any]) -> str:
+        """Spools the creation of a test result.
+
+        Args:
+            result: The result to be created.
+
+        Returns:
+            The local ID of the result, to be used as `resultId` of its steps and as
+            `id` of its updates.
+        """
+        local_id = str(uuid.uuid4())
+        properties = dict(result.get("properties") or {})
+        properties[SPOOL_ID_PROPERTY] = local_id
+        self._append([(CREATE_RESULT, local_id, dict(result, properties=properties))])
+        return local_id
+
+    def update_results(self, results: List[Dict[str, Any]]) -> None:
+        """Spools updates of test results identified by their local or server `id`."""
+        self._append([(UPDATE_RESULT, result["id"], result) for result in results])
+
+    def create_steps(self, steps: List[Dict[str, Any]]) -> List[str]:
+        """Spools the creation of test steps.
+
+        Args:
+            steps: The steps to be created. Steps without a `stepId` get a generated one.
+
+        Returns:
+            The IDs of the steps.
+        """
+        steps = [
+            dict(step, stepId=step.get("stepId") or str(uuid.uuid4())) for step in steps
+        ]
+        self._append([(CREATE_STEP, step["stepId"], step) for step in steps])
+        return [step["stepId"] for step in steps]
+
+    def update_steps(self, steps: List[Dict[str, Any]]) -> None:
+        """Spools updates of test steps identified by their `stepId` and `resultId`."""
+        self._append([(UPDATE_STEP, step["stepId"], step) for step in steps])
+
+    def server_id(self, local_id: str) -> Optional[str]:
+        """Returns the server ID of a spooled result, or None if it is not created yet."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT server_id FROM id_map WHERE local_id = ?", (local_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def pending_count(self) -> int:
+        """Returns the number of operations that still have to be sent."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT COUNT(*) FROM operations WHERE state != ?", (_FAILED,)
+            ).fetchone()
+        return row[0]
+
+    def failed_operations(self) -> List[Tuple[str, Dict[str, Any], str]]:
+        """Returns the kind, payload and error of every operation the server rejected."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT kind, payload, error FROM operations WHERE state = ? "
+                "ORDER BY seq",
+                (_FAILED,),
+            ).fetchall()
+        return [(kind, json.loads(payload), error) for kind, payload, error in rows]
+
+    def drain(self) -> int:
+        """Forwards spooled operations until the spool is empty.
+
+        While the background drainer is forwarding operations, this waits for it.
+
+        Returns:
+            The number of operations forwarded or rejected by the server.
+
+        Raises:
+            requests.RequestException: The server could not be reached, did not
+                authorize the request, timed out, limited the rate of requests or
+                failed with a server error. The operations of the failed batch stay in
+                the spool.
+        """
+        handled = 0
+        with self._drain_lock:
+            while True:
+                batch = self._next_batch()
+                if not batch:
+                    return handled
+                self._send(batch)
+                handled += len(batch)
+
+    def start(self) -> None:
+        """Starts forwarding spooled operations on a background thread."""
+        if self._drainer is None:
+            self._stopped.clear()
+            self._drainer = threading.Thread(target=self._drain_forever, daemon=True)
+            self._drainer.start()
+
+    def stop(self) -> None:
+        """Stops the background thread after its current batch."""
+        if self._drainer is not None:
+            self._stopped.set()
+            self._wake.set()
+            self._drainer.join()
+            self._drainer = None
+
+    def close(self) -> None:
+        """Stops the background thread and closes the database."""
+        self.stop()
+        self._connection.close()
+
+    def _append(self, operations: List[Tuple[str, str, Dict[str, Any]]]) -> None:
+        rows = [
+            (kind, local_id, json.dumps(body)) for kind, local_id, body in operations
+        ]
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO operations (kind, local_id, payload) VALUES (?, ?, ?)",
+                    rows,
+                )
+        self._wake.set()
+
+    def _drain_forever(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                self.drain()
+            except requests.RequestException:
+                self._stopped.wait(self._retry_interval)
+                continue
+            self._wake.wait()
+            self._wake.clear()
+
+    def _operations(self) -> Iterator[_Operation]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT seq, kind, local_id, payload, state FROM operations "
+                "WHERE state != ? ORDER BY seq LIMIT ?",
+                (_FAILED, self._batch_size),
+            ).fetchall()
+        for seq, kind, local_id, payload, state in rows:
+            yield seq, kind, local_id, json.loads(payload), state
+
+    def _next_batch(self) -> List[_Operation]:
+        """Returns the next run of operations of one kind that can be sent together."""
+        batch: List[_Operation] = []
+        step_ids = set()
+        for operation in self._operations():
+            kind, body = operation[1], operation[3]
+            if batch and kind != batch[0][1]:
+                break
+            if kind == CREATE_STEP and body.get("parentId") in step_ids:
+                break
+            step_ids.add(body.get("stepId"))
+            batch.append(operation)
+        return batch
+
+    def _send(self, batch: List[_Operation]) -> None:
+        kind = batch[0][1]
+        self._set_state(batch, _SENDING)
+        if kind == CREATE_RESULT:
+            self._send_result_creations(batch)
+            return
+
+        bodies = [self._with_server_ids(body) for _, _, _, body, _ in batch]
+        send: Callable[[List[Dict[str, Any]]], Dict[str, Any]]
+        if kind == CREATE_STEP:
+            send = self._client.create_steps
+        elif kind == UPDATE_STEP:
+            send = self._client.update_steps
+        else:
+            send = self._client.update_results
+        try:
+            response = send(bodies)
+        except requests.HTTPError as e:
+            response = {"failed": bodies, "error": _rejection(e)}
+
+        failed = {_operation_key(body) for body in response.get("failed") or []}
+        rejected = [
+            _operation_key(body) in failed
+            and not (
+                # A step sent before the process stopped may have been created then.
+                kind == CREATE_STEP
+                and operation[4] == _SENDING
+                and self._step_exists(body)
+            )
+            for operation, body in zip(batch, bodies)
+        ]
+        error = json.dumps(response.get("error"))
+        with self._lock, self._connection:
+            for operation, operation_rejected in zip(batch, rejected):
+                if operation_rejected:
+                    self._fail(operation[0], error)
+                else:
+                    self._remove(operation[0])
+
+    def _send_result_creations(self, batch: List[_Operation]) -> None:
+        uncertain = [
+            local_id for _, _, local_id, _, state in batch if state == _SENDING
+        ]
+        recovered = self._find_spooled_results(uncertain) if uncertain else {}
+        remaining = [operation for operation in batch if operation[2] not in recovered]
+
+        created = dict(recovered)
+        error = None
+        if remaining:
+            bodies = [body for _, _, _, body, _ in remaining]
+            try:
+                response = self._client.create_results(bodies)
+            except requests.HTTPError as e:
+                response = {"failed": bodies, "error": _rejection(e)}
+            created.update(self._spool_ids(response.get("results") or []))
+            error = json.dumps(response.get("error"))
+
+        with self._lock, self._connection:
+            for seq, _, local_id, _, _ in batch:
+                if local_id in created:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO id_map (local_id, server_id) VALUES (?, ?)",
+                        (local_id, created[local_id]),
+                    )
+                    self._remove(seq)
+                else:
+                    # Results that were not created are kept as failed, whether the
+                    # server listed them as failed or left them out of the response.
+                    self._fail(seq, error)
+
+    def _step_exists(self, step: Dict[str, Any]) -> bool:
+        route = STEP_ROUTE.format(result_id=step["resultId"], step_id=step["stepId"])
+        try:
+            self._client.get(route)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return False
+            raise
+        return True
+
+    def _find_spooled_results(self, local_ids: List[str]) -> Dict[str, str]:
+        clauses = " || ".join(
+            f'properties["{SPOOL_ID_PROPERTY}"] == @{index}'
+            for index in range(len(local_ids))
+        )
+        body = {"filter": clauses, "substitutions": local_ids, "take": len(local_ids)}
+        response = self._client.post(QUERY_RESULTS_ROUTE, body).json()
+        return self._spool_ids(response.get("results") or [])
+
+    def _spool_ids(self, results: List[Dict[str, Any]]) -> Dict[str, str]:
+        spool_ids = {}
+        for result in results:
+            local_id = (result.get("properties") or {}).get(SPOOL_ID_PROPERTY)
+            if local_id and result.get("id"):
+                spool_ids[local_id] = result["id"]
+        return spool_ids
+
+    def _with_server_ids(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        key = "resultId" if "stepId" in body else "id"
+        server_id = self.server_id(body.get(key) or "")
+        return dict(body, **{key: server_id}) if server_id else body
+
+    def _set_state(self, batch: List[_Operation], state: str) -> None:
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "UPDATE operations SET state = ? WHERE seq = ?",
+                [(state, operation[0]) for operation in batch],
+            )
+
+    def _remove(self, seq: int) -> None:
+        self._connection.execute("DELETE FROM operations WHERE seq = ?", (seq,))
+
+    def _fail(self, seq: int, error: Optional[str]) -> None:
+        self._connection.execute(
+            "UPDATE operations SET state = ?, error = ? WHERE seq = ?",
+            (_FAILED, error, seq),
+        )
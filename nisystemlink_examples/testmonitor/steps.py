@@ -0,0 +1,184 @@
+"""This module provides a `StepTree` class for building step hierarchies in memory.
+
+Classes:
+    StepNode: A step and its child steps.
+    StepTree: The steps of one test result, identified by client-generated IDs.
+"""
+
+import uuid
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, List, Optional
+
+from .batch import StepBatchWriter, StepWriteError
+from .payloads import create_test_step
+
+# Status types ordered from least to most severe. A parent step takes the most severe
+# status of its children.
+STATUS_SEVERITY = [
+    "SKIPPED",
+    "LOOPING",
+    "DONE",
+    "PASSED",
+    "CUSTOM",
+    "WAITING",
+    "RUNNING",
+    "TERMINATED",
+    "TIMED_OUT",
+    "FAILED",
+    "ERRORED",
+]
+
+
+def _severity(status: Dict[str, str]) -> int:
+    status_type = status.get("statusType", "CUSTOM")
+    if status_type in STATUS_SEVERITY:
+        return STATUS_SEVERITY.index(status_type)
+    return STATUS_SEVERITY.index("CUSTOM")
+
+
+class StepNode:
+    """A step of a `StepTree` together with its child steps."""
+
+    def __init__(self, step: Dict[str, Any]):
+        """Initializes the node with the step data created by `create_test_step`."""
+        self.step = step
+        self.children: List["StepNode"] = []
+
+    @property
+    def step_id(self) -> str:
+        """The client-generated ID of the step."""
+        return self.step["stepId"]
+
+    @property
+    def status(self) -> Dict[str, str]:
+        """The status of the step."""
+        return self.step["status"]
+
+    def roll_up_status(self) -> Dict[str, str]:
+        """Sets the status of running parent steps to the most severe child status.
+
+        Steps that already have a final status keep it. Steps without children are
+        left unchanged.
+
+        Returns:
+            The status of this step after the roll up.
+        """
+        if not self.children:
+            return self.status
+        child_statuses = [child.roll_up_status() for child in self.children]
+        if self.status.get("statusType") == "RUNNING":
+            most_severe = max(child_statuses, key=_severity)
+            self.step["status"] = dict(most_severe)
+        return self.status
+
+
+def _parent_failed(node: StepNode) -> "Future[Dict[str, Any]]":
+    """Fails a step and its descendants, whose parent step was not created."""
+    future: "Future[Dict[str, Any]]" = Future()
+    error = {"message": f"The parent step {node.step.get('parentId')} was not written."}
+    future.set_exception(StepWriteError(node.step, error))
+    return future
+
+
+class StepTree:
+    """Builds the step hierarchy of a test result before anything is uploaded.
+
+    Every step gets its ID on the client, so child steps can reference their parents
+    without waiting for the server to create the parent first. Once the sequence is
+    complete, the statuses are rolled up to the parents and the whole tree is created
+    with one request per hierarchy level.
+    """
+
+    def __init__(self, result_id: str):
+        """Initializes an empty tree.
+
+        Args:
+            result_id: The ID of the result the steps belong to.
+        """
+        self.result_id = result_id
+        self.roots: List[StepNode] = []
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def add_step(
+        self,
+        name: str,
+        step_type: str,
+        parent: Optional[StepNode] = None,
+        **step_fields: Any,
+    ) -> StepNode:
+        """Adds a step to the tree.
+
+        Args:
+            name: The step's name.
+            step_type: The step's type.
+            parent: The parent of the step, or None for a top-level step.
+            **step_fields: Further arguments passed to `create_test_step`.
+
+        Returns:
+            The node of the new step.
+        """
+        step = create_test_step(
+            name=name,
+            step_type=step_type,
+            result_id=self.result_id,
+            parent_id=parent.step_id if parent else None,
+            step_id=str(uuid.uuid4()),
+            **step_fields,
+        )
+        node = StepNode(step)
+        (parent.children if parent else self.roots).append(node)
+        self._count += 1
+        return node
+
+    def roll_up_status(self) -> Dict[str, str]:
+        """Rolls the step statuses up to their parents.
+
+        Returns:
+            The most severe status of the top-level steps, which is the status the
+            result should be given.
+        """
+        statuses = [root.roll_up_status() for root in self.roots]
+        if not statuses:
+            return {"statusType": "DONE", "statusName": "Done"}
+        most_severe = max(statuses, key=_severity)
+        return dict(most_severe)
+
+    def levels(self) -> Iterator[List[Dict[str, Any]]]:
+        """Yields the steps level by level, starting with the top-level steps."""
+        level = self.roots
+        while level:
+            yield [node.step for node in level]
+            level = [child for node in level for child in node.children]
+
+    def upload(self, writer: StepBatchWriter) -> List["Future[Dict[str, Any]]"]:
+        """Creates all steps of the tree on the server.
+
+        The writer is flushed after each level so parents always exist before their
+        children are created. Within a level, the writer combines the steps into as few
+        requests as its limits allow. The descendants of a step that was not created
+        are not sent; their futures fail with a `StepWriteError`.
+
+        Args:
+            writer: The writer used to create the steps.
+
+        Returns:
+            The futures of all steps, in level order.
+        """
+        futures: List["Future[Dict[str, Any]]"] = []
+        level = [(node, writer.create(node.step)) for node in self.roots]
+        while level:
+            writer.flush()
+            futures.extend(future for _, future in level)
+            next_level = []
+            for node, future in level:
+                create = writer.create if future.exception() is None else None
+                for child in node.children:
+                    child_future = (
+                        create(child.step) if create else _parent_failed(child)
+                    )
+                    next_level.append((child, child_future))
+            level = next_level
+        return futures
@@ -0,0 +1,25 @@
+"""Test plan utilities for SystemLink Enterprise demo package.
+
+This module applies test plan templates to any number of test plans, sending only the
+test plans that differ from the template, in concurrent chunks.
+"""
+
+from .templates import (
+    apply_template,
+    MAX_TEST_PLANS_PER_UPDATE,
+    TEMPLATE_FIELDS,
+    template_fields,
+    TEMPLATE_PROJECTION,
+    template_update,
+    TemplateReport,
+)
+
+__all__ = [
+    "MAX_TEST_PLANS_PER_UPDATE",
+    "TEMPLATE_FIELDS",
+    "TEMPLATE_PROJECTION",
+    "TemplateReport",
+    "apply_template",
+    "template_fields",
+    "template_update",
+]
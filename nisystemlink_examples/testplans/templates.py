@@ -0,0 +1,170 @@
+"""This module applies a test plan template to any number of test plans.
+
+Classes:
+    TemplateReport: The outcome of applying a template.
+
+Functions:
+    template_fields: Extracts the fields a template controls in a test plan.
+    template_update: Builds the update applying a template to a test plan, if it
+        differs from the template.
+    apply_template: Sends the updates of the test plans that differ from a template in
+        concurrent chunks.
+"""
+
+import itertools
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional
+
+from ..query.updates import ChunkedUpdater, get_field
+
+MAX_TEST_PLANS_PER_UPDATE = 1000
+
+# The fields a template controls, by their model attribute and their JSON key.
+TEMPLATE_FIELDS = {
+    "description": "description",
+    "test_program": "testProgram",
+    "estimated_duration_in_seconds": "estimatedDurationInSeconds",
+    "system_filter": "systemFilter",
+    "execution_actions": "executionActions",
+    "properties": "properties",
+    "dashboard": "dashboard",
+}
+
+# The projection of a test plan query returning only what `template_update` compares.
+TEMPLATE_PROJECTION = ["ID"] + [name.upper() for name in TEMPLATE_FIELDS]
+
+# Keys the server derives from a field of a test plan, which templates do not have.
+_DERIVED_KEYS = {"dashboard": {"url"}}
+
+
+@dataclass
+class TemplateReport:
+    """The outcome of applying a template.
+
+    Attributes:
+        unchanged: The number of test plans that already matched the template.
+        updated_test_plans: The `updated_test_plans` of all update responses.
+        failed_test_plans: The updates of the test plans that were not updated.
+        errors: The errors of the failed update requests.
+    """
+
+    unchanged: int = 0
+    updated_test_plans: List[Any] = field(default_factory=list)
+    failed_test_plans: List[Any] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def updated_ids(self) -> List[str]:
+        """The IDs of the updated test plans."""
+        return [get_field(plan, "id", "id") for plan in self.updated_test_plans]
+
+    @property
+    def failed_ids(self) -> List[str]:
+        """The IDs of the test plans that were not updated."""
+        return [get_field(plan, "id", "id") for plan in self.failed_test_plans]
+
+
+def _json(value: Any) -> Any:
+    """Converts models of `nisystemlink-clients` to their JSON value."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json", by_alias=True, exclude_none=True)
+    if isinstance(value, list):
+        return [_json(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _json(item) for key, item in value.items() if item is not None}
+    return value
+
+
+def template_fields(template: Any) -> Dict[str, Any]:
+    """Extracts the fields a template controls in a test plan.
+
+    Args:
+        template: The template, as a `TestPlanTemplate` model of
+            `nisystemlink-clients` or as a dictionary of the Test Plan API.
+
+    Returns:
+        The JSON value of every template field by its JSON key, None where the
+        template has no value.
+    """
+    return {
+        key: _json(get_field(template, name, key))
+        for name, key in TEMPLATE_FIELDS.items()
+    }
+
+
+def template_update(
+    test_plan: Any, fields: Mapping[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Builds the update applying a template to a test plan, if it differs.
+
+    Args:
+        test_plan: The test plan, as a `TestPlan` model or as a dictionary. Only its
+            ID and the template fields are read, see `TEMPLATE_PROJECTION`.
+        fields: The template fields, as returned by `template_fields`.
+
+    Returns:
+        The update setting every template field of the test plan, or None if the test
+        plan already has the values of the template.
+    """
+    for name, key in TEMPLATE_FIELDS.items():
+        value = _json(get_field(test_plan, name, key))
+        derived = _DERIVED_KEYS.get(name)
+        if derived and isinstance(value, dict):
+            value = {k: v for k, v in value.items() if k not in derived}
+        if value != fields[key]:
+            return {"id": get_field(test_plan, "id", "id"), **fields}
+    return None
+
+
+def apply_template(
+    test_plans: Iterable[Any],
+    template: Any,
+    update: Callable[[List[Dict[str, Any]]], Any],
+    test_plans_per_update: int = MAX_TEST_PLANS_PER_UPDATE,
+    max_workers: int = 4,
+) -> TemplateReport:
+    """Applies a template to test plans, sending only the test plans that differ.
+
+    Test plans whose template fields already have the values of the template are
+    skipped. The others are updated in requests of at most `test_plans_per_update`
+    test plans, with up to `max_workers` requests running at the same time, while the
+    next test plans are compared. The test plans are read as they are iterated, so
+    any number of them can be passed, e.g. from `query_by_ids` with
+    `TEMPLATE_PROJECTION`.
+
+    Args:
+        test_plans: The test plans, as `TestPlan` models or as dictionaries.
+        template: The template, as a `TestPlanTemplate` model or as a dictionary.
+        update: The function sending the updates of a chunk of test plans. It gets
+            the JSON updates, e.g. to be sent as `{"testPlans": updates, "replace":
+            True}`, so the properties of the test plans are replaced by those of the
+            template. It returns the response, with the `updated_test_plans` and
+            `failed_test_plans` of the chunk.
+        test_plans_per_update: The maximum number of test plans per update request.
+        max_workers: The maximum number of update requests running at the same time.
+
+    Returns:
+        The number of unchanged test plans and the updated and failed test plans of
+        all chunks.
+    """
+    report = TemplateReport()
+    fields = template_fields(template)
+    updated_field = ("updated_test_plans", "updatedTestPlans")
+    failed_field = ("failed_test_plans", "failedTestPlans")
+
+    def updates() -> Iterator[Dict[str, Any]]:
+        for test_plan in test_plans:
+            plan_update = template_update(test_plan, fields)
+            if plan_update is None:
+                report.unchanged += 1
+            else:
+                yield plan_update
+
+    remaining = updates()
+    with ChunkedUpdater(update, updated_field, failed_field, max_workers) as updater:
+        while chunk := list(itertools.islice(remaining, test_plans_per_update)):
+            updater.submit(chunk)
+    report.updated_test_plans = updater.updated
+    report.failed_test_plans = updater.failed
+    report.errors = updater.errors
+    return report
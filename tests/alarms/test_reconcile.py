@@ -0,0 +1,164 @@
+"""Unit tests for the alarm reconciliation."""
+
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import pytest
+from nisystemlink.clients.assetmanagement.models import Asset, CalibrationStatus
+from nisystemlink_examples.alarms import (
+    AlarmReconciler,
+    calibration_alarms,
+    CLEAR_SEVERITY,
+    DesiredAlarm,
+    severity_index,
+    Transition,
+)
+
+ASSETS = [
+    {"id": "a", "calibrationStatus": "PAST_RECOMMENDED_DUE_DATE"},
+    {"id": "b", "calibrationStatus": "APPROACHING_RECOMMENDED_DUE_DATE"},
+    {"id": "c", "calibrationStatus": "OK"},
+    {"id": "d", "calibrationStatus": "OK"},
+    {"id": "e", "calibrationStatus": "LIMITED_USE"},
+]
+
+
+def alarm_id(asset) -> str:
+    """Returns the alarm ID of an asset model or dictionary."""
+    return f"Assets.{asset['id'] if isinstance(asset, dict) else asset.id}"
+
+
+class _FakeAlarmService:
+    """Holds the current severity of alarms and records the sent transitions."""
+
+    def __init__(self, severities: Dict[str, int]):
+        self.severities = dict(severities)
+        self.lookups: List[Sequence[str]] = []
+        self.sent: List[str] = []
+        self.failing: set = set()
+        self._lock = threading.Lock()
+
+    def current_severities(self, alarm_ids: Sequence[str]) -> Dict[str, Optional[int]]:
+        """Looks up the severity of the alarms, as a bulk query would."""
+        self.lookups.append(list(alarm_ids))
+        return {i: self.severities[i] for i in alarm_ids if i in self.severities}
+
+    def submit(self, transition: Transition) -> None:
+        """Applies a transition, failing for the alarms in `failing`."""
+        alarm = transition.alarm
+        if alarm.alarm_id in self.failing:
+            raise RuntimeError("rejected")
+        with self._lock:
+            self.sent.append(alarm.alarm_id)
+            self.severities[alarm.alarm_id] = alarm.severity
+
+
+class TestAlarmReconciler:
+    """Test cases for the alarm reconciliation."""
+
+    def test_calibration_alarms_of_models_and_dictionaries(self):
+        """Test that assets in unmapped statuses get no alarm."""
+        model = Asset(id="m", calibration_status=CalibrationStatus.OK)
+
+        alarms = list(calibration_alarms(ASSETS + [model], alarm_id))
+
+        assert [(a.alarm_id, a.severity) for a in alarms] == [
+            ("Assets.a", 2),
+            ("Assets.b", 1),
+            ("Assets.c", CLEAR_SEVERITY),
+            ("Assets.d", CLEAR_SEVERITY),
+            ("Assets.m", CLEAR_SEVERITY),
+        ]
+        assert alarms[-1].source is model
+
+    def test_severity_index(self):
+        """Test that alarms are indexed by their alarm ID."""
+        alarms = [{"alarmId": "x", "currentSeverityLevel": 2}]
+
+        assert severity_index(alarms) == {"x": 2}
+
+    def test_reconcile_sends_only_changes(self):
+        """Test that alarms in their desired state get no transition."""
+        service = _FakeAlarmService({"Assets.a": 2, "Assets.b": 2, "Assets.c": 1})
+
+        with AlarmReconciler() as reconciler:
+            report = reconciler.reconcile(
+                calibration_alarms(ASSETS, alarm_id),
+                service.current_severities,
+                service.submit,
+            )
+
+        assert report.in_sync == 2  # a already has severity 2, d has no alarm
+        assert sorted((t.alarm.alarm_id, t.action) for t in report.succeeded) == [
+            ("Assets.b", "update"),
+            ("Assets.c", "clear"),
+        ]
+        assert sorted(service.sent) == ["Assets.b", "Assets.c"]
+
+    def test_snapshot_skips_unchanged_assets_across_runs(self, tmp_path):
+        """Test that a second run only looks at assets whose status changed."""
+        path = str(tmp_path / "alarms.db")
+        service = _FakeAlarmService({})
+        with AlarmReconciler(path) as reconciler:
+            reconciler.reconcile(
+                calibration_alarms(ASSETS, alarm_id),
+                service.current_severities,
+                service.submit,
+            )
+            assert len(reconciler) == 4
+
+        changed = [dict(ASSETS[0], calibrationStatus="OK")] + ASSETS[1:]
+        service.sent.clear()
+        with AlarmReconciler(path) as reconciler:
+            report = reconciler.reconcile(
+                calibration_alarms(changed, alarm_id),
+                service.current_severities,
+                service.submit,
+            )
+
+        assert report.skipped == 3
+        assert service.lookups[-1] == ["Assets.a"]
+        assert service.sent == ["Assets.a"]
+        assert service.severities["Assets.a"] == CLEAR_SEVERITY
+
+    def test_failed_transitions_are_retried_by_the_next_run(self):
+        """Test that failures are reported and not recorded in the snapshot."""
+        service = _FakeAlarmService({})
+        service.failing = {"Assets.a"}
+        desired = list(calibration_alarms(ASSETS, alarm_id))
+
+        with AlarmReconciler() as reconciler:
+            report = reconciler.reconcile(
+                desired,
+                service.current_severities,
+                service.submit,
+                max_workers=2,
+                batch_size=1,
+            )
+            assert [(t.alarm.alarm_id, e) for t, e in report.failed] == [
+                ("Assets.a", "rejected")
+            ]
+            assert [t.alarm.alarm_id for t in report.succeeded] == ["Assets.b"]
+
+            service.failing.clear()
+            report = reconciler.reconcile(
+                desired, service.current_severities, service.submit
+            )
+
+        assert [t.alarm.alarm_id for t in report.succeeded] == ["Assets.a"]
+        assert report.skipped == 3
+
+    @pytest.mark.parametrize("full", [False, True])
+    def test_full_reconciliation_checks_every_alarm(self, full):
+        """Test that a full run notices alarms changed on the server."""
+        service = _FakeAlarmService({})
+        desired = [DesiredAlarm("x", 2, "PAST_RECOMMENDED_DUE_DATE")]
+        with AlarmReconciler() as reconciler:
+            reconciler.reconcile(desired, service.current_severities, service.submit)
+            service.severities["x"] = CLEAR_SEVERITY
+
+            report = reconciler.reconcile(
+                desired, service.current_severities, service.submit, full=full
+            )
+
+        assert len(report.succeeded) == (1 if full else 0)
@@ -0,0 +1 @@
+"""Test for the analysis package."""
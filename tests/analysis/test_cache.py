@@ -0,0 +1,135 @@
+"""Unit tests for the ResultStatusCache class."""
+
+import time
+from collections import Counter
+from typing import Iterator
+
+import pytest
+from nisystemlink_examples.analysis import ResultStatusCache
+from nisystemlink_examples.mockserver import MockSystemLinkServer
+from nisystemlink_examples.testmonitor import TestDataManagerClient
+
+
+@pytest.fixture
+def mock() -> Iterator[MockSystemLinkServer]:
+    """Runs a local mock SystemLink server."""
+    with MockSystemLinkServer() as server:
+        yield server
+
+
+@pytest.fixture
+def client(mock: MockSystemLinkServer) -> Iterator[TestDataManagerClient]:
+    """Creates a Test Monitor client connected to the mock server."""
+    with TestDataManagerClient(mock.url, "key") as client:
+        yield client
+
+
+def create(client, *results):
+    """Creates results from (part number, status type) pairs and returns their IDs."""
+    response = client.create_results(
+        [
+            {"partNumber": part_number, "status": {"statusType": status}}
+            for part_number, status in results
+        ]
+    )
+    return [result["id"] for result in response["results"]]
+
+
+def queries(mock):
+    """Returns the number of result queries the mock server received."""
+    return sum(path.endswith("query-results") for _, path in mock.requests)
+
+
+class TestResultStatusCache:
+    """Test cases for the ResultStatusCache class."""
+
+    def test_refresh_fetches_only_updated_results(self, mock, client):
+        """Test that a refresh after the first one fetches only recent updates."""
+        ids = []
+        for result in [("A", "FAILED"), ("A", "PASSED"), ("B", "FAILED")]:
+            ids += create(client, result)
+            time.sleep(0.001)
+        cache = ResultStatusCache()
+
+        assert cache.refresh(client) == 3
+        client.update_results([{"id": ids[1], "status": {"statusType": "FAILED"}}])
+        fetched = cache.refresh(client)
+
+        assert fetched == 2  # The update and the results at the previous watermark.
+        assert cache.counts() == Counter({("A", "FAILED"): 2, ("B", "FAILED"): 1})
+        assert len(cache) == 3
+
+    def test_update_times_are_compared_as_times(self, mock, client):
+        """Test that an update with unpadded fractional seconds is not rejected."""
+        [result_id] = create(client, ("A", "FAILED"))
+        mock.results[result_id]["updatedAt"] = "2024-01-01T00:00:05Z"
+        cache = ResultStatusCache()
+        cache.refresh(client)
+
+        mock.results[result_id].update(
+            status={"statusType": "PASSED"}, updatedAt="2024-01-01T00:00:05.1Z"
+        )
+        cache.refresh(client)
+
+        assert cache.counts() == Counter({("A", "PASSED"): 1})
+        assert cache.watermark == "2024-01-01T00:00:05.100000Z"
+
+    def test_cache_persists_between_instances(self, client, tmp_path):
+        """Test that a reopened cache keeps its results and watermark."""
+        create(client, ("A", "FAILED"))
+        path = str(tmp_path / "cache.db")
+        with ResultStatusCache(path) as cache:
+            cache.refresh(client)
+            watermark = cache.watermark
+
+        with ResultStatusCache(path) as cache:
+            assert cache.watermark == watermark
+            assert cache.counts() == Counter({("A", "FAILED"): 1})
+        with pytest.raises(ValueError, match="partNumber"):
+            ResultStatusCache(path, group_by="operator")
+
+    def test_counts_of_ids_fetch_only_uncached_results(self, mock, client):
+        """Test that counting a selection queries only the results not cached."""
+        first = create(client, ("A", "FAILED"), ("B", "PASSED"))
+        cache = ResultStatusCache()
+        cache.fetch(client, first)
+        second = create(client, ("B", "ERRORED"))
+        before = queries(mock)
+
+        counts = cache.counts(first[1:] + second, client)
+
+        assert counts == Counter({("B", "PASSED"): 1, ("B", "ERRORED"): 1})
+        assert queries(mock) == before + 1
+        assert cache.watermark is None
+
+    def test_counts_of_ids_without_client_skip_uncached_results(self, client):
+        """Test that uncached results are not counted without a client."""
+        ids = create(client, ("A", "FAILED"), ("B", "FAILED"))
+        cache = ResultStatusCache()
+        cache.fetch(client, ids[:1])
+
+        assert cache.counts(ids) == Counter({("A", "FAILED"): 1})
+
+    def test_evict_by_size_keeps_most_recent_updates(self, client):
+        """Test that the least recently updated results are evicted first."""
+        for part_number in "ABC":
+            create(client, (part_number, "FAILED"))
+            time.sleep(0.001)
+        cache = ResultStatusCache(max_entries=2)
+
+        cache.refresh(client)
+
+        assert len(cache) == 2
+        assert cache.counts() == Counter({("B", "FAILED"): 1, ("C", "FAILED"): 1})
+
+    def test_evict_by_age(self, client):
+        """Test that results not updated within max_age are evicted."""
+        create(client, ("A", "FAILED"))
+        cache = ResultStatusCache(max_age=0.05)
+        cache.refresh(client)
+        assert len(cache) == 1
+
+        time.sleep(0.1)
+
+        assert cache.evict() == 1
+        assert cache.counts() == Counter()
@@ -0,0 +1,131 @@
+"""Unit tests for the Data Space analysis runner."""
+
+import math
+
+import numpy as np
+import pandas  # type: ignore[import-untyped]
+import pytest
+from nisystemlink_examples.analysis import (
+    AnalysisInput,
+    moving_mean,
+    register_analysis,
+    run_analyses,
+    supported_analysis,
+    trace_statistics,
+)
+
+
+@register_analysis("test_range")
+def _range(analysis: AnalysisInput) -> float:
+    return analysis.statistics.max - analysis.statistics.min
+
+
+def _trace(name, values):
+    return {
+        "name": name,
+        "data": pandas.DataFrame({"x": np.arange(len(values)), "y": values}),
+    }
+
+
+def test_trace_statistics_match_pandas():
+    """Tests that the statistics skip NaN values like pandas."""
+    values = np.array([3.0, np.nan, 1.0, 4.0, 1.0, 5.0])
+    series = pandas.Series(values)
+
+    statistics = trace_statistics(values)
+
+    assert statistics.count == 5
+    assert statistics.min == series.min()
+    assert statistics.max == series.max()
+    assert statistics.mean == pytest.approx(series.mean())
+    assert statistics.std == pytest.approx(series.std())
+
+
+def test_trace_statistics_without_values():
+    """Tests that the statistics of a trace without values are NaN."""
+    statistics = trace_statistics(np.array([np.nan]))
+
+    assert statistics.count == 0
+    assert math.isnan(statistics.mean)
+    assert math.isnan(statistics.std)
+
+
+@pytest.mark.parametrize("window", [1, 3, 10])
+def test_moving_mean_matches_rolling_mean(window):
+    """Tests that the moving mean equals the rolling mean of pandas."""
+    values = np.random.default_rng(0).normal(size=50)
+    values[[4, 5, 6, 20]] = np.nan
+
+    expected = pandas.Series(values).rolling(window, min_periods=1).mean()
+
+    np.testing.assert_allclose(moving_mean(values, window), expected)
+
+
+def test_supported_analysis_lists_default_and_custom_options():
+    """Tests that registered options are listed with their type."""
+    supported = supported_analysis()
+
+    assert {"id": "moving_mean", "type": "vector"} in supported
+    assert {"id": "test_range", "type": "scalar"} in supported
+
+
+def test_register_analysis_rejects_unknown_type():
+    """Tests that only scalar and vector analyses can be registered."""
+    with pytest.raises(ValueError):
+        register_analysis("test_matrix", "matrix")
+
+
+def test_run_analyses_adds_one_column_per_option():
+    """Tests that every option adds its results to a copy of the trace data."""
+    traces = [_trace("first", [1.0, 2.0, 3.0, 4.0]), _trace("second", [2.0, 2.0])]
+
+    results = run_analyses(
+        traces,
+        ["Mean", "2std", "-2std", "moving_mean", "cp", "cpk", "test_range"],
+        max_workers=1,
+        lower_limit=0.0,
+        upper_limit=6.0,
+        moving_mean_window=2,
+    )
+
+    assert [result["plot_label"] for result in results] == ["first", "second"]
+    first = results[0]["data"]
+    std = np.std([1.0, 2.0, 3.0, 4.0], ddof=1)
+    assert list(first["mean"]) == [2.5] * 4
+    assert first["2std"].iloc[0] == pytest.approx(2.5 + 2 * std)
+    assert first["-2std"].iloc[0] == pytest.approx(2.5 - 2 * std)
+    assert list(first["moving_mean"]) == [1.0, 1.5, 2.5, 3.5]
+    assert first["cp"].iloc[0] == pytest.approx(6.0 / (6 * std))
+    assert first["cpk"].iloc[0] == pytest.approx(2.5 / (3 * std))
+    assert list(first["test_range"]) == [3.0] * 4
+    assert list(results[1]["data"]["test_range"]) == [0.0, 0.0]
+    assert "mean" not in traces[0]["data"]
+
+
+def test_run_analyses_of_constant_trace():
+    """Tests that capability indices of a trace without spread are NaN."""
+    results = run_analyses(
+        [_trace("flat", [2.0, 2.0])], ["cp", "cpk"], lower_limit=0.0, upper_limit=4.0
+    )
+
+    assert results[0]["data"][["cp", "cpk"]].isna().all().all()
+
+
+def test_run_analyses_in_processes_matches_inline_run():
+    """Tests that a pool of processes returns the results of an inline run."""
+    generator = np.random.default_rng(1)
+    traces = [_trace(f"trace-{i}", generator.normal(size=100)) for i in range(4)]
+    options = ["min", "max", "moving_mean", "test_range"]
+
+    inline = run_analyses(traces, options, max_workers=1)
+    parallel = run_analyses(traces, options, max_workers=2)
+
+    for expected, actual in zip(inline, parallel):
+        assert actual["plot_label"] == expected["plot_label"]
+        pandas.testing.assert_frame_equal(actual["data"], expected["data"])
+
+
+def test_run_analyses_rejects_unsupported_options():
+    """Tests that unregistered options are named in the error."""
+    with pytest.raises(ValueError, match="median"):
+        run_analyses([_trace("first", [1.0])], ["mean", "median"])
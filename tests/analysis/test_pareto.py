@@ -0,0 +1,154 @@
+"""Unit tests for the failure pareto functions."""
+
+from collections import Counter
+from typing import Iterator
+
+import numpy as np
+import pytest
+from nisystemlink_examples.analysis import (
+    failure_pareto,
+    pareto,
+    pareto_graph,
+    query_status_counts,
+)
+from nisystemlink_examples.mockserver import MockSystemLinkServer
+from nisystemlink_examples.testmonitor import TestDataManagerClient
+
+RESULTS = [
+    ("A", "FAILED", "alice"),
+    ("A", "PASSED", "alice"),
+    ("A", "ERRORED", "bob"),
+    ("B", "FAILED", "bob"),
+    ("B", "FAILED", "bob"),
+    ("B", "FAILED", "alice"),
+    (None, "FAILED", "alice"),
+    ("C", "PASSED", "bob"),
+]
+
+
+@pytest.fixture
+def mock() -> Iterator[MockSystemLinkServer]:
+    """Runs a local mock SystemLink server holding the RESULTS."""
+    with MockSystemLinkServer() as server:
+        with TestDataManagerClient(server.url, "key") as client:
+            client.create_results(
+                [
+                    {
+                        "partNumber": part_number,
+                        "status": {"statusType": status},
+                        "operator": operator,
+                    }
+                    for part_number, status, operator in RESULTS
+                ]
+            )
+        yield server
+
+
+@pytest.fixture
+def client(mock: MockSystemLinkServer) -> Iterator[TestDataManagerClient]:
+    """Creates a Test Monitor client connected to the mock server."""
+    with TestDataManagerClient(mock.url, "key") as client:
+        yield client
+
+
+class TestPareto:
+    """Test cases for the failure pareto functions."""
+
+    def test_query_status_counts_splits_ids_into_filters(self, mock, client):
+        """Test that the failures of the IDs are counted across chunked queries."""
+        result_ids = list(mock.results)
+
+        counts = query_status_counts(
+            client, result_ids + result_ids[:2], ids_per_filter=3, page_size=2
+        )
+
+        assert counts == Counter(
+            {
+                ("A", "FAILED"): 1,
+                ("A", "ERRORED"): 1,
+                ("B", "FAILED"): 3,
+                ("", "FAILED"): 1,
+            }
+        )
+        queries = [path for _, path in mock.requests if path.endswith("query-results")]
+        assert len(queries) >= 3
+
+    def test_query_status_counts_by_other_field_and_every_status(self, mock, client):
+        """Test that results can be grouped by any field, including passed results."""
+        counts = query_status_counts(
+            client, filter='partNumber != "C"', group_by="operator", statuses=None
+        )
+
+        assert counts == Counter(
+            {
+                ("alice", "FAILED"): 3,
+                ("alice", "PASSED"): 1,
+                ("bob", "ERRORED"): 1,
+                ("bob", "FAILED"): 2,
+            }
+        )
+
+    def test_failure_pareto_orders_groups_by_failures(self):
+        """Test that the table is sorted and accumulates percentages."""
+        counts = Counter(
+            {
+                ("A", "FAILED"): 1,
+                ("A", "ERRORED"): 1,
+                ("B", "FAILED"): 6,
+                ("C", "PASSED"): 9,
+            }
+        )
+
+        frame = failure_pareto(counts)
+
+        assert frame["group"].tolist() == ["B", "A"]
+        assert frame["fail_count"].tolist() == [6, 2]
+        assert frame["cumulative"].tolist() == [75.0, 100.0]
+
+    def test_failure_pareto_without_failures_is_empty(self):
+        """Test that counts without failures give an empty table."""
+        assert failure_pareto(Counter({("A", "PASSED"): 1})).empty
+
+    def test_pareto_counts_failures_of_columns(self):
+        """Test that the columns of individual results give the same table."""
+        part_numbers, statuses, _ = zip(*RESULTS)
+
+        frame = pareto(part_numbers, statuses)
+
+        assert frame["group"].tolist() == ["B", "A", ""]
+        assert frame["fail_count"].tolist() == [3, 2, 1]
+        assert frame["cumulative"].tolist() == pytest.approx([50.0, 500 / 6, 100.0])
+        counts = Counter((group or "", status) for group, status, _ in RESULTS)
+        assert frame.equals(failure_pareto(counts))
+
+    def test_pareto_by_other_group(self):
+        """Test that the same statuses can be grouped by another column."""
+        _, statuses, operators = zip(*RESULTS)
+
+        frame = pareto(np.array(operators), np.array(statuses))
+
+        assert frame["group"].tolist() == ["alice", "bob"]
+        assert frame["fail_count"].tolist() == [3, 3]
+
+    def test_pareto_without_failures_is_empty(self):
+        """Test that columns without failures give an empty table."""
+        frame = pareto(["A", "B"], ["PASSED", "PASSED"])
+
+        assert frame.empty
+        assert list(frame.columns) == ["group", "fail_count", "cumulative"]
+
+    def test_pareto_graph(self):
+        """Test that the graph names missing groups without changing the table."""
+        frame = pareto(["A", None], ["FAILED", "FAILED"])
+
+        graph = pareto_graph(frame, "Operator", id="graph")
+
+        assert graph["id"] == "graph"
+        assert graph["config"]["title"] == "Failure Pareto - Results by Operator"
+        assert [column["name"] for column in graph["data"]["columns"]] == [
+            "group",
+            "fail_count",
+            "cumulative",
+        ]
+        assert graph["data"]["values"] == [["No Operator", 1, 50.0], ["A", 1, 100.0]]
+        assert frame["group"].tolist() == ["", "A"]
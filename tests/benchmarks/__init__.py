@@ -0,0 +1 @@
+"""Benchmarks of the upload, query, ETL and simulation paths."""
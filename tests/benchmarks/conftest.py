@@ -0,0 +1,39 @@
+"""Shared fixtures for the benchmarks."""
+
+from typing import Any, Callable, Iterator
+
+import pytest
+from nisystemlink_examples.mockserver import MockSystemLinkServer
+from nisystemlink_examples.testmonitor import TestDataManagerClient
+
+
+@pytest.fixture
+def mock_server() -> Iterator[MockSystemLinkServer]:
+    """Runs a local mock SystemLink server without latency or errors."""
+    with MockSystemLinkServer(seed=0) as server:
+        yield server
+
+
+@pytest.fixture
+def client(mock_server: MockSystemLinkServer) -> Iterator[TestDataManagerClient]:
+    """Creates a Test Monitor client connected to the mock server."""
+    with TestDataManagerClient(mock_server.url, "key") as client:
+        yield client
+
+
+@pytest.fixture
+def throughput(benchmark: Any) -> Callable[..., Any]:
+    """Benchmarks a function and records how many items per second it handles.
+
+    The rate is saved as `<unit>_per_second` in the `extra_info` of the benchmark, so
+    it is part of the JSON report.
+    """
+
+    def measure(function: Callable[..., Any], count: int, unit: str, *args: Any) -> Any:
+        result = benchmark(function, *args)
+        if benchmark.stats is not None:  # None when benchmarks are disabled
+            rate = count / benchmark.stats.stats.mean
+            benchmark.extra_info[f"{unit}_per_second"] = rate
+        return result
+
+    return measure
@@ -0,0 +1,53 @@
+"""Benchmarks of reconciling the calibration alarms of a fleet of assets."""
+
+import random
+
+from nisystemlink_examples.alarms import (
+    AlarmReconciler,
+    calibration_alarms,
+    CALIBRATION_STATUS_TO_SEVERITY,
+)
+
+ASSET_COUNT = 100_000
+STATUSES = list(CALIBRATION_STATUS_TO_SEVERITY)
+
+
+def assets(seed: int):
+    """Creates the assets of a fleet, with calibration statuses of a seed."""
+    generator = random.Random(seed)
+    return [
+        {"id": str(i), "calibrationStatus": generator.choice(STATUSES)}
+        for i in range(ASSET_COUNT)
+    ]
+
+
+def alarm_id(asset) -> str:
+    """Returns the alarm ID of an asset."""
+    return f"Assets.{asset['id']}.Calibration"
+
+
+def test_reconcile_unchanged_fleet(throughput):
+    """Measures a run after a previous one, with 1% of the assets changed."""
+    previous = assets(0)
+    current = [
+        dict(asset, calibrationStatus="OK") if i % 100 == 0 else asset
+        for i, asset in enumerate(previous)
+    ]
+    with AlarmReconciler() as reconciler:
+
+        def reconcile(fleet):
+            severities = {}
+
+            def submit(transition):
+                severities[transition.alarm.alarm_id] = transition.alarm.severity
+
+            return reconciler.reconcile(
+                calibration_alarms(fleet, alarm_id),
+                lambda alarm_ids: {i: severities.get(i) for i in alarm_ids},
+                submit,
+            )
+
+        reconcile(previous)
+        report = throughput(reconcile, ASSET_COUNT, "assets", current)
+
+    assert report.skipped >= ASSET_COUNT * 0.99
@@ -0,0 +1,33 @@
+"""Benchmarks of running Data Space analyses on many traces."""
+
+import numpy as np
+import pandas  # type: ignore[import-untyped]
+from nisystemlink_examples.analysis import run_analyses
+
+TRACE_COUNT = 16
+TRACE_POINTS = 250_000
+OPTIONS = ["min", "max", "mean", "2std", "-2std", "moving_mean", "cp", "cpk"]
+
+
+def test_run_analyses(throughput):
+    """Measures running every default option on sixteen traces of 250k points."""
+    generator = np.random.default_rng(0)
+    traces = [
+        {
+            "name": f"trace-{i}",
+            "data": pandas.DataFrame(
+                {"x": np.arange(TRACE_POINTS), "y": generator.normal(size=TRACE_POINTS)}
+            ),
+        }
+        for i in range(TRACE_COUNT)
+    ]
+
+    results = throughput(
+        run_analyses,
+        TRACE_COUNT * TRACE_POINTS,
+        "points",
+        traces,
+        OPTIONS,
+    )
+
+    assert len(results) == TRACE_COUNT
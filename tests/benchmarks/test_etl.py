@@ -0,0 +1,73 @@
+"""Benchmarks of the Simple ETL DataFrame ingest path."""
+
+import io
+
+import numpy as np
+import pandas  # type: ignore[import-untyped]
+import pytest
+from nisystemlink_examples.dataframe import DataFrameClient, ingest_csv
+
+ROW_COUNT = 20000
+
+
+@pytest.fixture
+def csv_file() -> bytes:
+    """Creates a measurement CSV file like the one of the Simple ETL example."""
+    random = np.random.default_rng(0)
+    frame = pandas.DataFrame(
+        {
+            "Index": np.arange(ROW_COUNT),
+            "Timestamp": pandas.date_range("2024-01-01", periods=ROW_COUNT, freq="s"),
+            "Voltage": random.random(ROW_COUNT),
+            "Current": random.random(ROW_COUNT),
+            "Station": "station-1",
+            "Passed": random.random(ROW_COUNT) > 0.1,
+        }
+    )
+    return frame.to_csv(index=False).encode()
+
+
+def test_dataframe_ingest(mock_server, client, throughput, csv_file):
+    """Measures the row rate of parsing a CSV file and writing it to a new table."""
+    data_types = ["INT32", "TIMESTAMP", "FLOAT32", "FLOAT32", "STRING", "BOOL"]
+
+    def ingest() -> None:
+        frame = pandas.read_csv(io.BytesIO(csv_file))
+        columns = [
+            {
+                "name": name,
+                "dataType": data_type,
+                "columnType": "INDEX" if index == 0 else "NULLABLE",
+            }
+            for index, (name, data_type) in enumerate(zip(frame.columns, data_types))
+        ]
+        table = client.post("nidataframe/v1/tables", {"columns": columns}).json()
+        frame_json = frame.astype(str).to_json(orient="split", index=False)
+        client.session.post(
+            f"{client.base_url}nidataframe/v1/tables/{table['id']}/data",
+            data=f'{{"frame": {frame_json}, "endOfData": true}}',
+            headers={"Content-Type": "application/json"},
+        ).raise_for_status()
+
+    throughput(ingest, ROW_COUNT, "rows")
+    assert all(t["rowCount"] == ROW_COUNT for t in mock_server.tables.values())
+
+
+@pytest.mark.parametrize("chunk_size", [5000, 20000])
+def test_dataframe_ingest_chunked(mock_server, throughput, csv_file, chunk_size):
+    """Measures the row rate of streaming the CSV file into a table in chunks."""
+    columns = [
+        {"name": "Index", "dataType": "INT32", "columnType": "INDEX"},
+        {"name": "Timestamp", "dataType": "TIMESTAMP", "columnType": "NULLABLE"},
+        {"name": "Voltage", "dataType": "FLOAT32", "columnType": "NULLABLE"},
+        {"name": "Current", "dataType": "FLOAT32", "columnType": "NULLABLE"},
+        {"name": "Station", "dataType": "STRING", "columnType": "NULLABLE"},
+        {"name": "Passed", "dataType": "BOOL", "columnType": "NULLABLE"},
+    ]
+    with DataFrameClient(mock_server.url, "key") as client:
+
+        def ingest() -> int:
+            table_id = client.create_table(columns)
+            return ingest_csv(client, table_id, io.BytesIO(csv_file), chunk_size)
+
+        assert throughput(ingest, ROW_COUNT, "rows") == ROW_COUNT
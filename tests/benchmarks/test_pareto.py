@@ -0,0 +1,63 @@
+"""Benchmarks of counting result statuses for the failure pareto."""
+
+import random
+
+import numpy as np
+import pytest
+from nisystemlink_examples.analysis import (
+    pareto,
+    query_status_counts,
+    ResultStatusCache,
+)
+
+RESULT_COUNT = 5000
+COLUMN_ROWS = 1_000_000
+STATUSES = ["PASSED", "FAILED", "ERRORED"]
+
+
+@pytest.fixture
+def result_ids(client):
+    """Creates results spread over 50 part numbers and returns their IDs."""
+    generator = random.Random(0)
+    results = [
+        {
+            "partNumber": f"PN-{generator.randrange(50)}",
+            "status": {"statusType": generator.choice(STATUSES)},
+        }
+        for _ in range(RESULT_COUNT)
+    ]
+    return [result["id"] for result in client.create_results(results)["results"]]
+
+
+def test_query_status_counts(client, throughput, result_ids):
+    """Measures counting the failures of a list of IDs on the server."""
+    counts = throughput(
+        query_status_counts, RESULT_COUNT, "results", client, result_ids
+    )
+
+    assert sum(counts.values()) > 0
+
+
+def test_cached_status_counts(client, throughput, result_ids):
+    """Measures counting the same IDs again from an up to date cache."""
+    with ResultStatusCache() as cache:
+        cache.refresh(client)
+
+        def count():
+            cache.refresh(client)
+            return cache.counts(result_ids)
+
+        counts = throughput(count, RESULT_COUNT, "results")
+
+    assert sum(counts.values()) == RESULT_COUNT
+
+
+def test_pareto_of_columns(throughput):
+    """Measures building the pareto from the columns of a million results."""
+    generator = np.random.default_rng(0)
+    groups = generator.choice([f"PN-{i}" for i in range(50)], COLUMN_ROWS)
+    statuses = generator.choice(STATUSES, COLUMN_ROWS)
+
+    frame = throughput(pareto, COLUMN_ROWS, "results", groups, statuses)
+
+    assert frame["cumulative"].iloc[-1] == pytest.approx(100.0)
@@ -0,0 +1,34 @@
+"""Benchmarks of paging through query results."""
+
+import time
+
+import pytest
+from nisystemlink_examples.query import paginate_pages
+from nisystemlink_examples.testmonitor import create_test_result
+
+RESULT_COUNT = 5000
+PAGE_SIZE = 500
+LATENCY = 0.005
+
+
+@pytest.mark.parametrize("prefetch_pages", [0, 1, 2])
+def test_paginate_results(mock_server, client, throughput, prefetch_pages):
+    """Measures the query rate of a caller that spends as long on a page as the server.
+
+    Prefetching overlaps the processing of one page with the query of the next.
+    """
+    client.create_results([create_test_result() for _ in range(RESULT_COUNT)])
+    mock_server.latency = LATENCY
+    request = {"filter": "", "take": PAGE_SIZE}
+
+    def query(body):
+        return client.post("nitestmonitor/v2/query-results", body).json()
+
+    def read_all() -> int:
+        count = 0
+        for page in paginate_pages(query, request, "results", prefetch_pages):
+            time.sleep(LATENCY)
+            count += len(page)
+        return count
+
+    assert throughput(read_all, RESULT_COUNT, "results") == RESULT_COUNT
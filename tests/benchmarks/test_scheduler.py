@@ -0,0 +1,60 @@
+"""Benchmarks of scheduling test plans on many systems."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+from nisystemlink_examples.scheduler import Scheduler
+
+SYSTEM_COUNT = 200
+FIXTURES_PER_SYSTEM = 4
+BOOKED_COUNT = 20_000
+SCHEDULED_COUNT = 1000
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def booked_scheduler() -> Scheduler:
+    """Creates a scheduler of many systems holding many booked test plans."""
+    generator = random.Random(0)
+    scheduler = Scheduler(START, START + timedelta(days=182))
+    for system in range(SYSTEM_COUNT):
+        scheduler.add_system(
+            f"system-{system}",
+            [f"fixture-{system}-{i}" for i in range(FIXTURES_PER_SYSTEM)],
+        )
+    for _ in range(BOOKED_COUNT):
+        system = generator.randrange(SYSTEM_COUNT)
+        start = START + timedelta(hours=generator.randrange(24 * 120))
+        fixtures = generator.sample(
+            scheduler.fixtures(f"system-{system}"), generator.randrange(3)
+        )
+        scheduler.book(
+            f"system-{system}",
+            start,
+            start + timedelta(hours=generator.randrange(1, 12)),
+            fixtures,
+        )
+    return scheduler
+
+
+def test_schedule_test_plans(throughput):
+    """Measures scheduling test plans on any of a quarter of the systems."""
+    generator = random.Random(1)
+    requests = [
+        (
+            timedelta(hours=generator.randrange(1, 24)),
+            generator.randrange(3),
+            [f"system-{generator.randrange(SYSTEM_COUNT)}" for _ in range(50)],
+        )
+        for _ in range(SCHEDULED_COUNT)
+    ]
+
+    def schedule():
+        scheduler = booked_scheduler()
+        return [
+            scheduler.schedule(str(i), duration, fixture_count, system_ids)
+            for i, (duration, fixture_count, system_ids) in enumerate(requests)
+        ]
+
+    slots = throughput(schedule, SCHEDULED_COUNT, "test_plans")
+
+    assert all(slots)
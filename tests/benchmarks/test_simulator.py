@@ -0,0 +1,31 @@
+"""Benchmarks of the test sequence simulation."""
+
+import pytest
+from nisystemlink_examples.testdata import Simulator
+
+SEQUENCE = dict(
+    part_number="PN-12345",
+    serial_number="SN-67890",
+    test_plan_id="TP-001",
+    system_id="SYS-001",
+    test_program="test_program.py",
+    operator="test_operator",
+    hostname="test-machine",
+)
+
+
+@pytest.mark.parametrize("sweep_size", [10, 100, 1000])
+def test_simulate_sequence(throughput, sweep_size):
+    """Measures the measurement rate of simulating a sweep."""
+    simulator = Simulator(range(sweep_size), range(sweep_size), seed=0)
+
+    throughput(
+        simulator.simulate_sequence, sweep_size**2, "measurements", *SEQUENCE.values()
+    )
+
+
+def test_to_step_tree(throughput):
+    """Measures the rate of turning simulated measurements into step payloads."""
+    sequence = Simulator(range(50), range(50), seed=0).simulate_sequence(**SEQUENCE)
+
+    throughput(sequence.to_step_tree, len(sequence), "steps", "result-id")
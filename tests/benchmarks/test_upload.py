@@ -0,0 +1,31 @@
+"""Benchmarks of building and uploading results and steps."""
+
+import pytest
+from nisystemlink_examples.testmonitor import create_test_result, create_test_step
+
+STEP_COUNT = 1000
+
+
+def test_create_test_result(throughput):
+    """Measures the cost of building a result payload."""
+    throughput(create_test_result, 1, "results")
+
+
+def test_create_test_step(throughput):
+    """Measures the cost of building a step payload."""
+    throughput(create_test_step, 1, "steps", "step", "NumericLimit", "result-id")
+
+
+@pytest.mark.parametrize("batch_size", [10, 100, 1000])
+def test_create_steps(client, throughput, batch_size):
+    """Measures the step upload rate for different numbers of steps per request."""
+    result_id = client.create_results([create_test_result()])["results"][0]["id"]
+    steps = [
+        create_test_step("step", "NumericLimit", result_id) for _ in range(STEP_COUNT)
+    ]
+
+    def upload() -> None:
+        for offset in range(0, STEP_COUNT, batch_size):
+            client.create_steps(steps[offset : offset + batch_size])
+
+    throughput(upload, STEP_COUNT, "steps")
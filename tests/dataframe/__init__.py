@@ -0,0 +1 @@
+"""Test for the dataframe package."""
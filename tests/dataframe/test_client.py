@@ -0,0 +1,58 @@
+"""Unit tests for the DataFrameClient class."""
+
+from typing import Iterator
+
+import pytest
+import requests
+from nisystemlink_examples.dataframe import DataFrameClient
+from nisystemlink_examples.mockserver import MockSystemLinkServer
+
+COLUMNS = [
+    {"name": "index", "dataType": "INT32", "columnType": "INDEX"},
+    {"name": "value", "dataType": "FLOAT64", "columnType": "NULLABLE"},
+]
+
+
+@pytest.fixture
+def mock() -> Iterator[MockSystemLinkServer]:
+    """Runs a local mock SystemLink server."""
+    with MockSystemLinkServer() as server:
+        yield server
+
+
+class TestDataFrameClient:
+    """Test cases for the DataFrameClient class."""
+
+    def test_create_table_returns_id(self, mock):
+        """Test that a table is created with its columns and metadata."""
+        with DataFrameClient(mock.url, "key") as client:
+            table_id = client.create_table(COLUMNS, name="t", properties={"a": "b"})
+            table = client.get_table(table_id)
+
+        assert table["name"] == "t"
+        assert table["columns"] == COLUMNS
+        assert table["properties"] == {"a": "b"}
+
+    def test_append_table_data_sends_body_as_is(self, mock):
+        """Test that a serialized body is appended without being parsed."""
+        body = '{"frame":{"columns":["index","value"],"data":[["1","2.5"]]}}'
+        with DataFrameClient(mock.url, "key") as client:
+            table_id = client.create_table(COLUMNS)
+            client.append_table_data(table_id, body)
+
+        assert mock.tables[table_id]["rows"] == [["1", "2.5"]]
+
+    def test_delete_table_removes_table(self, mock):
+        """Test that a deleted table can no longer be read."""
+        with DataFrameClient(mock.url, "key") as client:
+            table_id = client.create_table(COLUMNS)
+            client.delete_table(table_id)
+
+            with pytest.raises(requests.HTTPError):
+                client.get_table(table_id)
+
+    def test_invalid_table_raises(self, mock):
+        """Test that rejected requests raise an HTTP error."""
+        with DataFrameClient(mock.url, "key") as client:
+            with pytest.raises(requests.HTTPError):
+                client.create_table([COLUMNS[1]])
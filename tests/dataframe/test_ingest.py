@@ -0,0 +1,183 @@
+"""Unit tests for the chunked ingest functions."""
+
+import io
+import json
+import threading
+import time
+from typing import Iterator
+
+import pandas  # type: ignore[import-untyped]
+import pytest
+import requests
+from nisystemlink_examples.dataframe import (
+    DataFrameClient,
+    frame_request,
+    ingest_csv,
+    ingest_frames,
+)
+from nisystemlink_examples.mockserver import MockSystemLinkServer
+
+CSV = """,timestamp,voltage,label,pass
+0,2022-01-01 00:00:00,0.10000000000000001,a,True
+1,2022-01-01 00:00:01,,b,False
+2,2022-01-01 00:00:02,0.3,,True
+3,2022-01-01 00:00:03,1e-05,d,False
+4,2022-01-01 00:00:04,0.5,e,True
+"""
+
+COLUMNS = [
+    {"name": name, "dataType": "STRING", "columnType": column_type}
+    for name, column_type in [
+        ("timestamp", "INDEX"),
+        ("voltage", "NULLABLE"),
+        ("label", "NULLABLE"),
+        ("pass", "NULLABLE"),
+    ]
+]
+
+
+@pytest.fixture
+def mock() -> Iterator[MockSystemLinkServer]:
+    """Runs a local mock SystemLink server."""
+    with MockSystemLinkServer() as server:
+        yield server
+
+
+@pytest.fixture
+def client(mock: MockSystemLinkServer) -> Iterator[DataFrameClient]:
+    """Creates a DataFrame client connected to the mock server."""
+    with DataFrameClient(mock.url, "key") as client:
+        yield client
+
+
+class _RecordingClient:
+    def __init__(self, delay: float = 0.0):
+        self.bodies: list = []
+        self.delay = delay
+        self.in_flight = threading.Event()
+
+    def append_table_data(self, table_id: str, body: str) -> None:
+        self.in_flight.set()
+        time.sleep(self.delay)
+        self.bodies.append(json.loads(body))
+        self.in_flight.clear()
+
+
+class TestIngest:
+    """Test cases for the chunked ingest functions."""
+
+    def test_ingest_csv_appends_chunks_with_source_text(self, mock, client):
+        """Test that the CSV text arrives unchanged, with nulls for empty values."""
+        table_id = client.create_table(COLUMNS)
+
+        rows = ingest_csv(client, table_id, io.StringIO(CSV), chunk_size=2, index_col=0)
+
+        assert rows == 5
+        table = mock.tables[table_id]
+        assert table["rows"][0] == [
+            "2022-01-01 00:00:00",
+            "0.10000000000000001",
+            "a",
+            "True",
+        ]
+        assert table["rows"][1][1] is None and table["rows"][2][2] is None
+        assert table["rows"][3][1] == "1e-05"
+        assert table["supportsAppend"] is False
+        posts = [path for method, path in mock.requests if path.endswith("/data")]
+        assert len(posts) == 3
+
+    def test_only_last_chunk_ends_data(self):
+        """Test that endOfData is only set on the last request."""
+        recorder = _RecordingClient()
+        frames = [pandas.DataFrame({"a": [i]}) for i in range(3)]
+
+        ingest_frames(recorder, "t", frames)  # type: ignore[arg-type]
+
+        assert [body["endOfData"] for body in recorder.bodies] == [False, False, True]
+        assert [body["frame"]["data"] for body in recorder.bodies] == [
+            [[0]],
+            [[1]],
+            [[2]],
+        ]
+
+    def test_no_frames_completes_empty_table(self):
+        """Test that an empty source still completes the table."""
+        recorder = _RecordingClient()
+
+        assert ingest_frames(recorder, "t", []) == 0  # type: ignore[arg-type]
+        assert recorder.bodies == [{"endOfData": True}]
+
+    def test_next_chunk_is_prepared_during_upload(self):
+        """Test that chunks are read while the previous chunk is uploaded."""
+        recorder = _RecordingClient(delay=0.05)
+        read_during_upload = []
+
+        def frames():
+            for i in range(3):
+                read_during_upload.append(recorder.in_flight.is_set())
+                yield pandas.DataFrame({"a": [i]})
+
+        ingest_frames(recorder, "t", frames())  # type: ignore[arg-type]
+
+        assert any(read_during_upload)
+        assert len(recorder.bodies) == 3
+
+    def test_rejected_chunk_raises(self, mock, client):
+        """Test that a rejected chunk stops the ingest with an HTTP error."""
+        table_id = client.create_table(COLUMNS[:2])
+
+        with pytest.raises(requests.HTTPError):
+            ingest_csv(client, table_id, io.StringIO(CSV), index_col=0)
+
+    @pytest.mark.parametrize("data_type, value", [("INT64", "1.5"), ("BOOL", "x")])
+    def test_unfit_value_raises_value_error(self, mock, client, data_type, value):
+        """Test that a value not fitting its column type stops the ingest."""
+        columns = [
+            {"name": "index", "dataType": "INT64", "columnType": "INDEX"},
+            {"name": "value", "dataType": data_type, "columnType": "NULLABLE"},
+        ]
+        table_id = client.create_table(columns)
+        rows = "index,value\n0,\n1,\n2," + value + "\n"
+
+        with pytest.raises(ValueError, match="after row 2"):
+            ingest_csv(client, table_id, io.StringIO(rows), 2, columns)
+
+    def test_frame_request_writes_typed_values_as_json(self):
+        """Test that frames not read as text are serialized in their JSON form."""
+        frame = pandas.DataFrame(
+            {"t": pandas.to_datetime(["2022-01-01"]), "v": [1.5], "s": [None]}
+        )
+
+        body = json.loads(frame_request(frame, end_of_data=True))
+
+        assert body == {
+            "frame": {
+                "columns": ["t", "v", "s"],
+                "data": [["2022-01-01T00:00:00.000000", 1.5, None]],
+            },
+            "endOfData": True,
+        }
+
+    def test_ingest_csv_with_columns_sends_native_values(self, mock, client):
+        """Test that values are parsed into the types of the table columns."""
+        columns = [
+            {"name": "timestamp", "dataType": "TIMESTAMP", "columnType": "INDEX"},
+            {"name": "voltage", "dataType": "FLOAT64", "columnType": "NULLABLE"},
+            {"name": "label", "dataType": "STRING", "columnType": "NULLABLE"},
+            {"name": "pass", "dataType": "BOOL", "columnType": "NULLABLE"},
+        ]
+        table_id = client.create_table(columns)
+
+        ingest_csv(
+            client,
+            table_id,
+            io.StringIO(CSV),
+            chunk_size=2,
+            columns=columns,
+            index_col=0,
+        )
+
+        rows = mock.tables[table_id]["rows"]
+        assert rows[0] == ["2022-01-01 00:00:00", 0.1, "a", True]
+        assert rows[1][1:] == [None, "b", False]
+        assert rows[3][1] == 1e-05
@@ -0,0 +1,134 @@
+"""Unit tests for the DataFrame schema functions."""
+
+import io
+
+import numpy as np
+import pandas  # type: ignore[import-untyped]
+import pytest
+from nisystemlink_examples.dataframe import (
+    csv_dtypes,
+    data_type,
+    infer_columns,
+    validate_columns,
+    widen_columns,
+)
+
+CSV = """id,time,voltage,label,passed,count
+1,2024-01-01T00:00:00Z,1.5,a,True,3
+2,2024-01-01T00:00:01Z,,b,,4
+"""
+
+
+class TestSchema:
+    """Test cases for the DataFrame schema functions."""
+
+    @pytest.mark.parametrize(
+        "dtype, expected",
+        [
+            (np.int8, "INT32"),
+            (np.uint16, "INT32"),
+            (np.int32, "INT32"),
+            (np.uint32, "INT64"),
+            (np.int64, "INT64"),
+            ("Int64", "INT64"),
+            (np.float32, "FLOAT32"),
+            (np.float64, "FLOAT64"),
+            (bool, "BOOL"),
+            ("boolean", "BOOL"),
+            ("datetime64[ns]", "TIMESTAMP"),
+            ("datetime64[ns, UTC]", "TIMESTAMP"),
+            (object, "STRING"),
+            ("string", "STRING"),
+        ],
+    )
+    def test_data_type_maps_dtypes(self, dtype, expected):
+        """Test that every dtype maps to the narrowest service type."""
+        assert data_type(pandas.Series([], dtype=dtype).dtype) == expected
+
+    def test_infer_columns_reads_types_from_sample(self):
+        """Test that CSV columns get their types and the first unique id is the index."""
+        frame = pandas.read_csv(io.StringIO(CSV))
+
+        columns = infer_columns(frame)
+
+        assert [(c["name"], c["dataType"], c["columnType"]) for c in columns] == [
+            ("id", "INT64", "INDEX"),
+            ("time", "TIMESTAMP", "NULLABLE"),
+            ("voltage", "FLOAT64", "NULLABLE"),
+            ("label", "STRING", "NULLABLE"),
+            ("passed", "BOOL", "NULLABLE"),
+            ("count", "INT64", "NULLABLE"),
+        ]
+
+    def test_infer_columns_keeps_digit_strings_as_text(self):
+        """Test that digit strings, which parse as ISO 8601 dates, stay strings."""
+        frame = pandas.DataFrame(
+            {"id": [1, 2], "serial": ["2024", "20240101"], "code": ["7", None]}
+        )
+
+        columns = infer_columns(frame)
+
+        assert [c["dataType"] for c in columns] == ["INT64", "STRING", "STRING"]
+
+    def test_infer_columns_skips_columns_unfit_for_index(self):
+        """Test that repeated values keep a column from becoming the index."""
+        frame = pandas.DataFrame(
+            {"step": [1, 1], "time": pandas.to_datetime(["2024-01-01", "2024-01-02"])}
+        )
+
+        columns = infer_columns(frame)
+
+        assert [c["columnType"] for c in columns] == ["NULLABLE", "INDEX"]
+
+    def test_infer_columns_without_index_candidate_raises(self):
+        """Test that a frame without integer or timestamp columns is rejected."""
+        with pytest.raises(ValueError, match="index"):
+            infer_columns(pandas.DataFrame({"a": ["x"], "b": [1.5]}))
+
+    def test_validate_columns_rejects_invalid_tables(self):
+        """Test that the rules of the service are checked."""
+        index = {"name": "i", "dataType": "INT32", "columnType": "INDEX"}
+        with pytest.raises(ValueError, match="not unique"):
+            validate_columns([index, dict(index, columnType="NORMAL")])
+        with pytest.raises(ValueError, match="unknown data type"):
+            validate_columns([index, {"name": "v", "dataType": "FLOAT16"}])
+        with pytest.raises(ValueError, match="one index column"):
+            validate_columns([dict(index, columnType="NULLABLE")])
+        with pytest.raises(ValueError, match="must be one of"):
+            validate_columns([dict(index, dataType="STRING")])
+
+    def test_csv_dtypes_reads_chunks_in_column_types(self):
+        """Test that the read_csv arguments parse every column into its type."""
+        columns = infer_columns(pandas.read_csv(io.StringIO(CSV)))
+
+        frame = pandas.read_csv(io.StringIO(CSV), **csv_dtypes(columns))
+
+        assert frame["time"].tolist() == [
+            "2024-01-01T00:00:00Z",
+            "2024-01-01T00:00:01Z",
+        ]
+        assert frame["passed"].dtype == "boolean"
+        assert frame["passed"].isna().tolist() == [False, True]
+        assert frame["count"].dtype == "Int64"
+
+    def test_widen_columns_fits_every_value(self):
+        """Test that columns are widened to hold values after the sample."""
+        rows = (
+            "id,whole,big,decimal,flag,text\n"
+            "1,1,1,1.5,True,a\n"
+            "2,2.5,3000000000,x,maybe,\n"
+            "3.5,,,,,\n"
+        )
+        columns = infer_columns(pandas.read_csv(io.StringIO(rows), nrows=1), index="id")
+
+        widened = widen_columns(columns, pandas.read_csv(io.StringIO(rows), dtype=str))
+
+        assert [column["dataType"] for column in widened] == [
+            "INT64",
+            "FLOAT64",
+            "INT64",
+            "STRING",
+            "STRING",
+            "STRING",
+        ]
+        assert columns[1]["dataType"] == "INT64"
@@ -0,0 +1,163 @@
+"""Unit tests for the run_etl function."""
+
+from typing import Iterator
+
+import pytest
+from nisystemlink_examples.etl import run_etl
+from nisystemlink_examples.etl.__main__ import main
+from nisystemlink_examples.mockserver import MockSystemLinkServer
+from nisystemlink_examples.testmonitor import TestDataManagerClient
+
+CSV = (
+    b",time,voltage,current,name,passed\n"
+    b"0,2024-01-01T00:00:00Z,1.5,0.1,a,True\n"
+    b"1,2024-01-01T00:00:01Z,1.6,0.2,b,False\n"
+    b"2,2024-01-01T00:00:02Z,1.7,,c,True\n"
+)
+
+
+@pytest.fixture
+def mock() -> Iterator[MockSystemLinkServer]:
+    """Runs a local mock SystemLink server."""
+    with MockSystemLinkServer() as server:
+        yield server
+
+
+class TestRunEtl:
+    """Test cases for the run_etl function."""
+
+    def test_loads_every_file_into_its_own_table(self, mock):
+        """Test that each file gets a table with its rows and a linked result."""
+        file_ids = [mock.add_file(f"data{i}.csv", CSV) for i in range(6)]
+
+        report = run_etl(
+            mock.url,
+            "key",
+            file_ids,
+            workspace="ws",
+            result_fields={"partNumber": "PN"},
+            download_workers=2,
+            load_workers=3,
+            queue_size=1,
+            chunk_size=2,
+            index_col=0,
+        )
+
+        assert [outcome.file_id for outcome in report.files] == file_ids
+        assert not report.failed
+        for index, outcome in enumerate(report.files):
+            table = mock.tables[outcome.table_id]
+            assert table["name"] == f"data{index}.csv"
+            assert table["workspace"] == "ws"
+            assert table["columns"][0] == {
+                "name": "time",
+                "dataType": "TIMESTAMP",
+                "columnType": "INDEX",
+            }
+            assert len(table["rows"]) == outcome.row_count == 3
+            result = mock.results[outcome.result_id]
+            assert result["fileIds"] == [outcome.file_id]
+            assert result["dataTableIds"] == [outcome.table_id]
+            assert result["partNumber"] == "PN"
+        creates = [r for r in mock.requests if r[1] == "/nitestmonitor/v2/results"]
+        assert len(creates) == 1
+
+    def test_failed_file_does_not_stop_others(self, mock):
+        """Test that a missing or malformed file is reported and skipped."""
+        good = mock.add_file("good.csv", CSV)
+        malformed = mock.add_file("bad.csv", b"a,b\nx,y\n")
+
+        report = run_etl(mock.url, "key", [good, "missing", malformed], index_col=0)
+
+        assert [outcome.file_id for outcome in report.succeeded] == [good]
+        assert "404" in report.files[1].error
+        assert "index" in report.files[2].error
+        assert report.files[2].table_id is None
+        assert len(mock.results) == 1
+
+    def test_columns_are_widened_for_rows_after_the_sample(self, mock):
+        """Test that a file is loaded again if a later row does not fit its columns."""
+        rows = "index,count\n" + "".join(f"{i},{i}\n" for i in range(5)) + "5,1.5\n"
+        file_id = mock.add_file("data.csv", rows.encode())
+
+        report = run_etl(mock.url, "key", [file_id], sample_rows=2, chunk_size=2)
+
+        [outcome] = report.files
+        assert outcome.error is None
+        assert outcome.row_count == 6
+        assert list(mock.tables) == [outcome.table_id]
+        table = mock.tables[outcome.table_id]
+        assert table["columns"][1]["dataType"] == "FLOAT64"
+        assert table["rows"][-1] == [5, 1.5]
+
+    def test_partly_loaded_table_is_deleted(self, mock):
+        """Test that a file failing after its table was created leaves no table."""
+        rows = "index,count\n0,1\n1,2\n2,x\n"
+        file_id = mock.add_file("data.csv", rows.encode())
+
+        report = run_etl(
+            mock.url, "key", [file_id], column_types=["INT64", "INT64"], chunk_size=2
+        )
+
+        [outcome] = report.failed
+        assert "after row 2" in outcome.error
+        assert outcome.table_id is None
+        assert mock.tables == {}
+        assert mock.results == {}
+
+    def test_duplicate_file_ids_are_loaded_separately(self, mock):
+        """Test that a file ID given twice gets two tables and two results."""
+        file_id = mock.add_file("data.csv", CSV)
+
+        report = run_etl(
+            mock.url, "key", [file_id, file_id], load_workers=2, index_col=0
+        )
+
+        assert not report.failed
+        assert len({outcome.table_id for outcome in report.files}) == 2
+        assert len({outcome.result_id for outcome in report.files}) == 2
+        assert all(outcome.row_count == 3 for outcome in report.files)
+
+    def test_unmatched_created_results_fail_their_files(self, mock, monkeypatch):
+        """Test that a response without the expected results does not raise."""
+        file_ids = [mock.add_file(f"data{i}.csv", CSV) for i in range(2)]
+        monkeypatch.setattr(
+            TestDataManagerClient,
+            "create_results",
+            lambda self, results: {"results": [{"id": "r"}], "error": {}},
+        )
+
+        report = run_etl(mock.url, "key", file_ids, index_col=0)
+
+        assert [outcome.error for outcome in report.files] == ["No result created."] * 2
+
+    def test_scrapbook_result_summarizes_run(self, mock):
+        """Test that the notebook output counts the files and rows."""
+        file_id = mock.add_file("data.csv", CSV)
+
+        report = run_etl(mock.url, "key", [file_id, "missing"], index_col=0)
+
+        values = {item["id"]: item["value"] for item in report.scrapbook_result()}
+        assert values == {"Files": 2, "Loaded Files": 1, "Failed Files": 1, "Rows": 3}
+
+    def test_removes_downloaded_files(self, mock, tmp_path):
+        """Test that no downloaded file is left in the work directory."""
+        file_id = mock.add_file("data.csv", CSV)
+
+        run_etl(mock.url, "key", [file_id], work_directory=str(tmp_path), index_col=0)
+
+        assert list(tmp_path.iterdir()) == []
+
+    def test_main_prints_outcome_of_every_file(self, mock, capsys):
+        """Test that the command line fails if any file failed."""
+        file_id = mock.add_file("data.csv", CSV)
+
+        exit_code = main(
+            ["--server", mock.url, "--api-key", "key", "--index-col", "0"]
+            + [file_id, "missing"]
+        )
+
+        output = capsys.readouterr().out
+        assert exit_code == 1
+        assert f"{file_id}: 3 rows" in output
+        assert "1 of 2 files loaded." in output
@@ -0,0 +1 @@
+"""Test for the files package."""
@@ -0,0 +1,109 @@
+"""Unit tests for the FileClient class."""
+
+import os
+from typing import Iterator
+
+import pandas  # type: ignore[import-untyped]
+import pytest
+import requests
+from nisystemlink_examples.files import FileClient
+from nisystemlink_examples.mockserver import MockSystemLinkServer
+
+CONTENT = bytes(range(256)) * 1000
+
+
+@pytest.fixture
+def mock() -> Iterator[MockSystemLinkServer]:
+    """Runs a local mock SystemLink server."""
+    with MockSystemLinkServer() as server:
+        yield server
+
+
+class TestFileClient:
+    """Test cases for the FileClient class."""
+
+    def test_download_streams_file_into_directory(self, mock, tmp_path):
+        """Test that a file is written under its name on the server."""
+        file_id = mock.add_file("data.bin", CONTENT)
+
+        with FileClient(mock.url, "key") as client:
+            path = client.download(file_id, str(tmp_path), chunk_size=1000)
+
+        assert path == str(tmp_path / "data.bin")
+        assert open(path, "rb").read() == CONTENT
+
+    def test_download_resumes_interrupted_stream(self, mock, tmp_path):
+        """Test that a broken download continues with a range request."""
+        file_id = mock.add_file("data.bin", CONTENT)
+        mock.truncate_next_downloads(count=2, after_bytes=100_000)
+        destination = str(tmp_path / "copy.bin")
+
+        with FileClient(mock.url, "key") as client:
+            path = client.download(file_id, destination)
+
+        assert open(path, "rb").read() == CONTENT
+        assert len(mock.requests) == 3
+
+    def test_download_gives_up_after_max_retries(self, mock, tmp_path):
+        """Test that a download interrupted too often raises."""
+        file_id = mock.add_file("data.bin", CONTENT)
+        mock.truncate_next_downloads(count=3, after_bytes=10)
+
+        with FileClient(mock.url, "key", max_retries=2) as client:
+            with pytest.raises(requests.ConnectionError):
+                client.download(file_id, str(tmp_path / "copy.bin"))
+
+    def test_download_completes_existing_partial_file(self, mock, tmp_path):
+        """Test that an incomplete file from an earlier call is continued."""
+        file_id = mock.add_file("data.bin", CONTENT)
+        destination = tmp_path / "copy.bin"
+        destination.write_bytes(CONTENT[:5000])
+
+        with FileClient(mock.url, "key") as client:
+            client.download(file_id, str(destination))
+            client.download(file_id, str(destination))
+
+        assert destination.read_bytes() == CONTENT
+        assert len(mock.requests) == 2
+
+    def test_download_replaces_existing_larger_file(self, mock, tmp_path):
+        """Test that a stale file larger than the file on the server is replaced."""
+        file_id = mock.add_file("data.bin", CONTENT)
+        destination = tmp_path / "copy.bin"
+        destination.write_bytes(CONTENT + b"stale")
+
+        with FileClient(mock.url, "key") as client:
+            client.download(file_id, str(destination))
+
+        assert destination.read_bytes() == CONTENT
+        assert len(mock.requests) == 2
+
+    def test_download_without_resume_overwrites_file(self, mock, tmp_path):
+        """Test that an existing file is replaced when resuming is disabled."""
+        file_id = mock.add_file("data.bin", CONTENT)
+        destination = tmp_path / "copy.bin"
+        destination.write_bytes(b"stale content that is longer than nothing")
+
+        with FileClient(mock.url, "key") as client:
+            client.download(file_id, str(destination), resume=False)
+
+        assert destination.read_bytes() == CONTENT
+
+    def test_download_missing_file_raises(self, mock, tmp_path):
+        """Test that an unknown file ID raises an HTTP error."""
+        with FileClient(mock.url, "key") as client:
+            with pytest.raises(requests.HTTPError):
+                client.download("missing", str(tmp_path))
+
+        assert os.listdir(tmp_path) == []
+
+    def test_open_feeds_chunked_csv_reader(self, mock):
+        """Test that a file can be parsed in chunks straight from the network."""
+        file_id = mock.add_file("data.csv", b"a,b\n1,2\n3,4\n5,6\n")
+
+        with FileClient(mock.url, "key") as client:
+            with client.open(file_id) as stream:
+                chunks = list(pandas.read_csv(stream, chunksize=2))
+
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        assert chunks[1]["b"].tolist() == [6]
@@ -0,0 +1,84 @@
+"""Unit tests for the load generator."""
+
+from typing import Iterator
+
+import numpy as np
+import pytest
+from nisystemlink_examples.loadgen import LoadReport, run_load, StationStats
+from nisystemlink_examples.loadgen.__main__ import main
+from nisystemlink_examples.mockserver import MockSystemLinkServer
+
+
+@pytest.fixture
+def stub() -> Iterator[MockSystemLinkServer]:
+    """Runs a local mock SystemLink server."""
+    with MockSystemLinkServer() as server:
+        yield server
+
+
+def _paths(server: MockSystemLinkServer) -> list:
+    return [path for _, path in server.requests]
+
+
+class TestLoadgen:
+    """Test cases for the load generator."""
+
+    def test_run_load_uploads_every_station_sequence(self, stub):
+        """Test that all stations upload their results and step hierarchies."""
+        report = run_load(
+            stub.url, "key", stations=2, sequences=3, currents=3, voltages=4, seed=1
+        )
+
+        assert (report.stations, report.results, report.steps) == (2, 6, 90)
+        assert report.requests == len(stub.requests) == 24
+        assert report.errors == 0
+        assert _paths(stub).count("/nitestmonitor/v2/update-results") == 6
+
+    def test_run_load_splits_large_levels(self, stub):
+        """Test that levels larger than steps_per_request are sent in chunks."""
+        run_load(
+            stub.url,
+            "key",
+            stations=1,
+            sequences=1,
+            currents=2,
+            voltages=5,
+            steps_per_request=4,
+        )
+
+        assert _paths(stub).count("/nitestmonitor/v2/steps") == 4
+
+    def test_failed_requests_count_as_errors(self, stub):
+        """Test that rejected requests are reported in the error rate."""
+        stub.partial_failure_rate = 1.0
+
+        report = run_load(stub.url, "key", stations=1, sequences=2, currents=2)
+
+        assert (report.results, report.steps) == (0, 0)
+        assert report.errors == report.requests == 2
+        assert report.error_rate == 1
+
+    def test_report_computes_throughput_and_percentiles(self):
+        """Test that the report combines the statistics of its stations."""
+        stats = [
+            StationStats(4, 40, [0.1, 0.2], started_at=10, finished_at=11),
+            StationStats(6, 60, [0.3, 0.4], started_at=10.5, finished_at=12),
+        ]
+
+        report = LoadReport.from_stations(stats)
+
+        assert report.duration == 2
+        assert report.results_per_second == 5
+        assert report.steps_per_second == 50
+        assert report.latency_percentiles([0, 100]) == {0: 0.1, 100: 0.4}
+        assert np.array_equal(report.latencies, [0.1, 0.2, 0.3, 0.4])
+
+    def test_main_prints_report(self, stub, capsys):
+        """Test that the command line runs the load and prints the summary."""
+        exit_code = main(
+            ["--server", stub.url, "--api-key", "key", "--stations", "1"]
+            + ["--sequences", "1", "--currents", "1", "--voltages", "2"]
+        )
+
+        assert exit_code == 0
+        assert "Steps:      3" in capsys.readouterr().out
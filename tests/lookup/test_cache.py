@@ -0,0 +1,126 @@
+"""Unit tests for the LookupCache class."""
+
+from typing import Any, Dict, List, Sequence
+
+from nisystemlink_examples.lookup import LookupCache, query_fetcher
+from nisystemlink_examples.mockserver import MockSystemLinkServer
+from nisystemlink_examples.testmonitor import TestDataManagerClient
+
+SYSTEMS = {
+    f"system-{i}": {"id": f"system-{i}", "alias": f"Alias {i}"} for i in range(5)
+}
+
+
+class _FakeClock:
+    """A clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeService:
+    """Returns the SYSTEMS and records the IDs of every fetch."""
+
+    def __init__(self) -> None:
+        self.fetches: List[List[str]] = []
+
+    def fetch(self, ids: Sequence[str]) -> Dict[str, Any]:
+        """Fetches the systems with the IDs."""
+        self.fetches.append(list(ids))
+        return {i: SYSTEMS[i] for i in ids if i in SYSTEMS}
+
+
+class TestLookupCache:
+    """Test cases for the LookupCache class."""
+
+    def test_cached_lookups_do_not_fetch(self):
+        """Test that only uncached IDs are fetched, in one call per lookup."""
+        service = _FakeService()
+        cache = LookupCache(service.fetch)
+
+        assert cache.get("system-1") == SYSTEMS["system-1"]
+        assert cache.get_many(["system-1", "system-2", "system-3", "system-2"]) == {
+            i: SYSTEMS[i] for i in ["system-1", "system-2", "system-3"]
+        }
+        assert cache.get("system-2")["alias"] == "Alias 2"
+        assert service.fetches == [["system-1"], ["system-2", "system-3"]]
+
+    def test_missing_ids_are_remembered(self):
+        """Test that unknown IDs are not fetched again within their time to live."""
+        service = _FakeService()
+        cache = LookupCache(service.fetch)
+
+        assert cache.get("unknown", "none") == "none"
+        assert cache.get("unknown") is None
+        assert len(service.fetches) == 1
+
+    def test_entries_expire_after_ttl(self):
+        """Test that entries older than the time to live are fetched again."""
+        service = _FakeService()
+        clock = _FakeClock()
+        cache = LookupCache(service.fetch, ttl=60, clock=clock)
+        cache.prefetch(list(SYSTEMS))
+
+        clock.now += 59
+        assert "system-0" in cache
+        clock.now += 1
+        assert "system-0" not in cache
+        cache.get("system-0")
+
+        assert service.fetches[1:] == [["system-0"]]
+
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test that the cache stays within its size, keeping recently used entries."""
+        service = _FakeService()
+        cache = LookupCache(service.fetch, max_entries=3)
+        cache.prefetch(["system-0", "system-1", "system-2"])
+        cache.get("system-0")
+
+        cache.get("system-3")
+
+        assert len(cache) == 3
+        assert "system-0" in cache
+        assert "system-1" not in cache
+
+    def test_entries_persist_across_runs(self, tmp_path):
+        """Test that a new cache on the same database starts with fresh entries."""
+        path = str(tmp_path / "systems.db")
+        service = _FakeService()
+        clock = _FakeClock()
+        with LookupCache(service.fetch, ttl=60, path=path, clock=clock) as cache:
+            cache.prefetch(["system-0", "unknown"])
+            clock.now += 30
+            cache.prefetch(["system-1"])
+            cache.invalidate(["system-1"])
+            cache.get("system-2")
+
+        clock.now += 40
+        with LookupCache(service.fetch, ttl=60, path=path, clock=clock) as cache:
+            assert len(cache) == 1
+            assert cache.get("system-2") == SYSTEMS["system-2"]
+
+        assert service.fetches == [["system-0", "unknown"], ["system-1"], ["system-2"]]
+
+    def test_query_fetcher(self):
+        """Test that a paged query fetches entities in chunks by their ID."""
+        with MockSystemLinkServer() as server:
+            with TestDataManagerClient(server.url, "key") as client:
+                results = client.create_results(
+                    [{"partNumber": str(i)} for i in range(5)]
+                )
+                ids = [result["id"] for result in results["results"]]
+
+                def query(request: Dict[str, Any]) -> Dict[str, Any]:
+                    return client.post("nitestmonitor/v2/query-results", request).json()
+
+                fetch = query_fetcher(query, {"take": 2}, "results", ids_per_query=2)
+                cache = LookupCache(fetch)
+
+                found = cache.get_many(ids + ["missing"])
+
+        assert {i: r["partNumber"] for i, r in found.items()} == {
+            i: str(n) for n, i in enumerate(ids)
+        }
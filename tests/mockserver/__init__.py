@@ -0,0 +1 @@
+"""Test for the mockserver package."""
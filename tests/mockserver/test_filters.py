@@ -0,0 +1,61 @@
+"""Unit tests for the compile_filter function."""
+
+import pytest
+from nisystemlink_examples.mockserver import compile_filter
+
+RESULT = {
+    "id": "a",
+    "partNumber": "PN-1",
+    "status": {"statusType": "FAILED"},
+    "updatedAt": "2024-01-02T00:00:00.000000Z",
+    "totalTimeInSeconds": 5,
+    "properties": {"Serial Number": "S-1", "spoolId": "local"},
+}
+
+
+class TestCompileFilter:
+    """Test cases for the compile_filter function."""
+
+    @pytest.mark.parametrize(
+        "filter, expected",
+        [
+            ("", True),
+            ('id == "a"', True),
+            ('Id == "b" or Id == "a"', True),
+            ('partNumber == "PN-1" and status.statusType == "PASSED"', False),
+            ('(id == "b" or id == "a") and status.statusType == "FAILED"', True),
+            ('id == "b" or id == "a" && status.statusType == "PASSED"', False),
+            ('updatedAt > "2024-01-01T00:00:00Z"', True),
+            ("totalTimeInSeconds >= 5 and totalTimeInSeconds < 6", True),
+            ("operator == null", True),
+            ('operator != null || keywords == "x"', False),
+        ],
+    )
+    def test_filter_matches(self, filter, expected):
+        """Test that comparisons, boolean operators and nesting are evaluated."""
+        assert compile_filter(filter)(RESULT) is expected
+
+    @pytest.mark.parametrize(
+        "filter, expected",
+        [
+            ('properties["spoolId"] == @0', True),
+            ('properties["spoolId"] == @1 || properties["spoolId"] == @0', True),
+            ('properties["Serial Number"] == "S-1" and id == @1', False),
+        ],
+    )
+    def test_substitutions_and_quoted_names(self, filter, expected):
+        """Test that substitutions and bracketed field names are resolved."""
+        assert compile_filter(filter, ["local", "other"])(RESULT) is expected
+
+    def test_missing_substitution_raises(self):
+        """Test that a substitution without a value is rejected."""
+        with pytest.raises(ValueError):
+            compile_filter("id == @1", ["a"])
+
+    @pytest.mark.parametrize(
+        "filter", ['keywords.Contains("x")', '(id == "a"', 'id == "a" "b"', "id ~ 1"]
+    )
+    def test_unsupported_filter_raises(self, filter):
+        """Test that syntax outside of the supported subset is rejected."""
+        with pytest.raises(ValueError):
+            compile_filter(filter)
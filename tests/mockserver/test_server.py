@@ -0,0 +1,157 @@
+"""Unit tests for the MockSystemLinkServer class."""
+
+from typing import Iterator
+
+import pytest
+import requests
+from nisystemlink_examples.mockserver import MockSystemLinkServer
+from nisystemlink_examples.testmonitor import (
+    bulk_delete_results,
+    create_test_result,
+    create_test_step,
+    TestDataManagerClient,
+)
+
+
+@pytest.fixture
+def mock() -> Iterator[MockSystemLinkServer]:
+    """Runs a mock server with a fixed seed."""
+    with MockSystemLinkServer(seed=0) as server:
+        yield server
+
+
+def _client(mock: MockSystemLinkServer) -> TestDataManagerClient:
+    return TestDataManagerClient(mock.url, "key", backoff_factor=0)
+
+
+class TestMockSystemLinkServer:
+    """Test cases for the MockSystemLinkServer class."""
+
+    def test_results_and_steps_round_trip(self, mock):
+        """Test that created results and steps are stored, updated and deleted."""
+        with _client(mock) as client:
+            result = client.create_results([create_test_result()])["results"][0]
+            step = create_test_step("step", "Action", result["id"], step_id="s1")
+            client.create_steps([step])
+            client.update_steps([{"stepId": "s1", "resultId": result["id"], "x": 1}])
+            client.update_results([{"id": result["id"], "operator": "op"}])
+
+            assert mock.results[result["id"]]["operator"] == "op"
+            assert mock.steps["s1"]["x"] == 1
+
+            assert client.delete_results([result["id"]]) == {}
+        assert mock.results == {} and mock.steps == {}
+
+    def test_steps_of_unknown_result_are_rejected(self, mock):
+        """Test that steps are validated like on the real server."""
+        with _client(mock) as client:
+            response = client.create_steps([create_test_step("s", "Action", "nope")])
+
+        assert response["steps"] == []
+        assert response["failed"][0]["resultId"] == "nope"
+        assert response["error"]["innerErrors"]
+
+    def test_partial_failure_rate_rejects_items(self, mock):
+        """Test that items are rejected in partial success responses."""
+        mock.partial_failure_rate = 0.5
+        with _client(mock) as client:
+            response = client.create_results([create_test_result()] * 20)
+
+        assert 0 < len(response["failed"]) < 20
+        assert len(response["results"]) + len(response["failed"]) == 20
+        assert len(mock.results) == len(response["results"])
+
+    def test_injected_failures_are_retried(self, mock):
+        """Test that injected 503 responses exercise the client retries."""
+        mock.fail_next(2)
+        with _client(mock) as client:
+            client.create_results([create_test_result()])
+
+        assert len(mock.requests) == 3
+        assert len(mock.results) == 1
+
+    def test_timed_out_post_is_not_sent_again(self, mock):
+        """Test that a POST the server applied before timing out is not repeated."""
+        mock.delay_next_responses(seconds=1.0)
+        with TestDataManagerClient(mock.url, "key", timeout=0.2) as client:
+            with pytest.raises(requests.RequestException):
+                client.create_results([create_test_result()])
+
+        assert len(mock.requests) == 1
+        assert len(mock.results) == 1
+
+    def test_error_rate_rejects_requests(self, mock):
+        """Test that every request fails with an error rate of one."""
+        mock.error_rate = 1.0
+        mock.error_status = 500
+        with _client(mock) as client, pytest.raises(requests.HTTPError):
+            client.create_results([create_test_result()])
+
+    def test_latency_delays_requests(self, mock):
+        """Test that the configured latency is added to every request."""
+        mock.latency = 0.2
+        with _client(mock) as client:
+            client.create_results([create_test_result()])
+            elapsed = client.session.get(mock.url + "/unknown").elapsed
+
+        assert elapsed.total_seconds() >= 0.2
+
+    def test_bulk_delete_by_filter_pages_query_results(self, mock):
+        """Test that the query route pages through the stored results."""
+        with _client(mock) as client:
+            client.create_results([create_test_result()] * 25)
+            report = bulk_delete_results(client, filter="", chunk_size=10)
+
+        assert report.deleted_count == 25
+        assert mock.results == {}
+
+    def test_dataframe_table_data_round_trip(self, mock):
+        """Test that rows appended to a table can be read back in pages."""
+        columns = [
+            {"name": "i", "dataType": "INT32", "columnType": "INDEX"},
+            {"name": "v", "dataType": "FLOAT64", "columnType": "NULLABLE"},
+        ]
+        with requests.Session() as session:
+            table_id = session.post(
+                f"{mock.url}/nidataframe/v1/tables", json={"columns": columns}
+            ).json()["id"]
+            url = f"{mock.url}/nidataframe/v1/tables/{table_id}/data"
+            frame = {"columns": ["v", "i"], "data": [["0.5", "1"], ["1.5", "2"]]}
+            session.post(url, json={"frame": frame}).raise_for_status()
+            session.post(url, json={"frame": frame, "endOfData": True})
+            rejected = session.post(url, json={"frame": frame})
+            page = session.get(url, params={"take": 3}).json()
+            table = session.get(f"{mock.url}/nidataframe/v1/tables/{table_id}").json()
+
+        assert rejected.status_code == 409
+        assert page["frame"]["data"][0] == ["1", "0.5"]
+        assert page["totalRowCount"] == 4
+        assert page["continuationToken"] == "3"
+        assert (table["rowCount"], table["supportsAppend"]) == (4, False)
+
+    def test_file_download_supports_ranges(self, mock):
+        """Test that files can be downloaded whole or from an offset."""
+        file_id = mock.add_file("data.csv", b"0123456789")
+        url = f"{mock.url}/nifile/v1/service-groups/Default/files/{file_id}/data"
+
+        whole = requests.get(url)
+        tail = requests.get(url, headers={"Range": "bytes=6-"})
+
+        assert whole.content == b"0123456789"
+        assert 'filename="data.csv"' in whole.headers["Content-Disposition"]
+        assert tail.status_code == 206
+        assert tail.content == b"6789"
+        assert tail.headers["Content-Range"] == "bytes 6-9/10"
+
+    def test_file_download_can_be_truncated(self, mock):
+        """Test that a truncated download announces more bytes than it sends."""
+        file_id = mock.add_file("data.csv", b"0123456789")
+        url = f"{mock.url}/nifile/v1/service-groups/Default/files/{file_id}/data"
+        mock.truncate_next_downloads(after_bytes=4)
+
+        with pytest.raises(requests.exceptions.ChunkedEncodingError):
+            requests.get(url)
+        past_end = requests.get(url, headers={"Range": "bytes=10-"})
+
+        assert past_end.status_code == 416
+        assert past_end.headers["Content-Range"] == "bytes */10"
@@ -0,0 +1,110 @@
+"""Unit tests for the chunked query functions."""
+
+from typing import Any, Dict, Iterator
+
+import pytest
+from nisystemlink_examples.mockserver import MockSystemLinkServer
+from nisystemlink_examples.query import (
+    contains_any,
+    equals_any,
+    id_filters,
+    query_by_ids,
+)
+from nisystemlink_examples.testmonitor import TestDataManagerClient
+
+
+@pytest.fixture
+def client() -> Iterator[TestDataManagerClient]:
+    """Creates a Test Monitor client connected to a local mock server."""
+    with MockSystemLinkServer() as server:
+        with TestDataManagerClient(server.url, "key") as client:
+            yield client
+
+
+class TestChunkedQuery:
+    """Test cases for the chunked query functions."""
+
+    def test_filter_builders(self):
+        """Test the filter syntax of both builders, including quoting."""
+        assert equals_any("id")(["a", 'b"c']) == '(id == "a" or id == "b\\"c")'
+        assert contains_any("location.minionId")(["a", "b"]) == (
+            'new[] {"a", "b"}.Contains(location.minionId)'
+        )
+
+    def test_id_filters_are_bounded_and_deduplicated(self):
+        """Test that repeated IDs are selected once, in chunks."""
+        filters = list(
+            id_filters(["a", "b", "a", "c"], equals_any("id"), 2, 'partNumber == "x"')
+        )
+
+        assert filters == [
+            '(id == "a" or id == "b") and (partNumber == "x")',
+            '(id == "c") and (partNumber == "x")',
+        ]
+
+    @pytest.mark.parametrize("max_workers", [1, 3])
+    def test_query_by_ids_merges_chunks(self, client, max_workers):
+        """Test that the items of every chunk are yielded once, in chunk order."""
+        results = client.create_results(
+            [{"partNumber": "A" if i % 2 else "B"} for i in range(25)]
+        )["results"]
+        ids = [result["id"] for result in results]
+        requests = []
+
+        def query(request: Dict[str, Any]) -> Dict[str, Any]:
+            requests.append(request)
+            return client.post("nitestmonitor/v2/query-results", request).json()
+
+        request = {"filter": 'partNumber == "A"', "take": 2, "returnCount": False}
+        items = list(
+            query_by_ids(
+                query,
+                request,
+                "results",
+                ids + ids[:5],
+                equals_any("id"),
+                ids_per_query=4,
+                max_workers=max_workers,
+            )
+        )
+
+        assert [item["id"] for item in items] == ids[1::2]
+        assert request == {
+            "filter": 'partNumber == "A"',
+            "take": 2,
+            "returnCount": False,
+        }
+        assert len({r["filter"] for r in requests}) == 7
+
+    def test_query_by_ids_deduplicates_by_key(self, client):
+        """Test that items selected by several chunks are yielded once per key."""
+        client.create_results([{"partNumber": "A"}, {"partNumber": "B"}])
+
+        def query(request: Dict[str, Any]) -> Dict[str, Any]:
+            return client.post("nitestmonitor/v2/query-results", request).json()
+
+        def by_part_number(result: Dict[str, Any]) -> str:
+            return result["partNumber"]
+
+        items = list(
+            query_by_ids(
+                query,
+                {"take": 10},
+                "results",
+                ["A", "B", "C"],
+                lambda values: '(partNumber == "A" or partNumber == "B")',
+                ids_per_query=1,
+                key=by_part_number,
+            )
+        )
+
+        assert sorted(item["partNumber"] for item in items) == ["A", "B"]
+
+    def test_query_by_ids_raises_errors_of_chunks(self, client):
+        """Test that a failing query stops the iteration."""
+
+        def query(request: Dict[str, Any]) -> Dict[str, Any]:
+            raise RuntimeError("rejected")
+
+        with pytest.raises(RuntimeError, match="rejected"):
+            list(query_by_ids(query, {}, "results", ["a", "b"], equals_any("id"), 1))
@@ -0,0 +1,128 @@
+"""Unit tests for the pagination functions."""
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import pytest
+from nisystemlink_examples.query import apaginate, paginate, paginate_pages
+
+
+@dataclass
+class _TokenRequest:
+    take: int = 3
+    continuation_token: Optional[str] = None
+
+
+@dataclass
+class _TokenResponse:
+    results: List[int] = field(default_factory=list)
+    continuation_token: Optional[str] = None
+
+
+class _TokenService:
+    def __init__(self, count: int):
+        self.items = list(range(count))
+        self.requests: List[_TokenRequest] = []
+
+    def query(self, request: _TokenRequest) -> _TokenResponse:
+        self.requests.append(request)
+        start = int(request.continuation_token or 0)
+        end = start + request.take
+        token = str(end) if end < len(self.items) else None
+        return _TokenResponse(self.items[start:end], token)
+
+
+def _skip_query(items: List[int], requests: List[Dict[str, Any]]) -> Any:
+    def query(request: Dict[str, Any]) -> Dict[str, Any]:
+        requests.append(request)
+        skip, take = request["skip"], request["take"]
+        return {"assets": items[skip : skip + take]}
+
+    return query
+
+
+class TestPagination:
+    """Test cases for the pagination functions."""
+
+    @pytest.mark.parametrize("prefetch_pages", [0, 1, 3])
+    def test__continuation_token__yields_every_item_including_last_page(
+        self, prefetch_pages: int
+    ):
+        service = _TokenService(10)
+        request = _TokenRequest()
+
+        items = list(paginate(service.query, request, "results", prefetch_pages))
+
+        assert items == list(range(10))
+        assert [r.continuation_token for r in service.requests] == [None, "3", "6", "9"]
+        assert request.continuation_token is None
+
+    def test__skip_and_take__stops_on_short_page(self):
+        requests: List[Dict[str, Any]] = []
+        query = _skip_query(list(range(7)), requests)
+
+        items = list(paginate(query, {"skip": 0, "take": 3}, "assets"))
+
+        assert items == list(range(7))
+        assert [r["skip"] for r in requests] == [0, 3, 6]
+
+    def test__skip_and_take__stops_on_empty_page(self):
+        requests: List[Dict[str, Any]] = []
+        query = _skip_query(list(range(6)), requests)
+
+        pages = list(paginate_pages(query, {"skip": 0, "take": 3}, "assets"))
+
+        assert pages == [[0, 1, 2], [3, 4, 5]]
+        assert len(requests) == 3
+
+    def test__max_items__stops_fetching(self):
+        service = _TokenService(100)
+
+        items = list(paginate(service.query, _TokenRequest(), "results", 0, 5))
+
+        assert items == [0, 1, 2, 3, 4]
+        assert len(service.requests) == 2
+
+    def test__slow_consumer__prefetches_at_most_configured_pages(self):
+        service = _TokenService(30)
+        fetched = threading.Semaphore(0)
+
+        def query(request: _TokenRequest) -> _TokenResponse:
+            response = service.query(request)
+            fetched.release()
+            return response
+
+        pages = paginate_pages(query, _TokenRequest(), "results", prefetch_pages=2)
+        next(pages)
+        for _ in range(3):
+            fetched.acquire(timeout=1)
+        assert not fetched.acquire(timeout=0.2)
+
+        assert len(service.requests) == 3
+        pages.close()
+
+    def test__query_raises__error_reaches_caller(self):
+        def query(request: _TokenRequest) -> _TokenResponse:
+            if request.continuation_token:
+                raise RuntimeError("server unavailable")
+            return _TokenResponse([1], "next")
+
+        items = paginate(query, _TokenRequest(), "results")
+
+        assert next(items) == 1
+        with pytest.raises(RuntimeError, match="server unavailable"):
+            next(items)
+
+    def test__async_query__yields_every_item(self):
+        service = _TokenService(8)
+
+        async def query(request: _TokenRequest) -> _TokenResponse:
+            await asyncio.sleep(0)
+            return service.query(request)
+
+        async def collect() -> List[int]:
+            return [item async for item in apaginate(query, _TokenRequest(), "results")]
+
+        assert asyncio.run(collect()) == list(range(8))
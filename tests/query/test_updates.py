@@ -0,0 +1,54 @@
+"""Unit tests for the ChunkedUpdater class."""
+
+import threading
+import time
+from typing import Any, Dict, List
+
+from nisystemlink_examples.query import ChunkedUpdater
+
+FIELDS = ("updated_items", "updatedItems"), ("failed_items", "failedItems")
+
+
+class TestChunkedUpdater:
+    """Test cases for the ChunkedUpdater class."""
+
+    def test_items_are_split_into_updated_and_failed(self):
+        """Test that failed items and failed requests are collected separately."""
+
+        def update(chunk: List[Dict[str, Any]]) -> Dict[str, Any]:
+            if chunk[0]["id"] == "c":
+                raise ConnectionError("timed out")
+            return {
+                "updatedItems": [item for item in chunk if item["id"] != "b"],
+                "failedItems": [{"id": "b", "echo": True}],
+                "error": {"message": "conflict"},
+            }
+
+        with ChunkedUpdater(update, *FIELDS) as updater:
+            updater.submit([{"id": "a"}, {"id": "b"}])
+            updater.submit([{"id": "c"}])
+
+        assert updater.updated == [{"id": "a"}]
+        assert updater.failed == [{"id": "b"}, {"id": "c"}]
+        assert updater.errors == ["conflict", "timed out"]
+
+    def test_requests_are_bounded(self):
+        """Test that no more than max_workers requests run at the same time."""
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def update(chunk: List[Any]) -> Dict[str, Any]:
+            with lock:
+                running[0] += 1
+                running[1] = max(running)
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            return {"updatedItems": chunk}
+
+        with ChunkedUpdater(update, *FIELDS, max_workers=2) as updater:
+            for i in range(10):
+                updater.submit([i])
+
+        assert running[1] <= 2
+        assert sorted(updater.updated) == list(range(10))
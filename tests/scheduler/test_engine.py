@@ -0,0 +1,175 @@
+"""Unit tests for the Scheduler class."""
+
+from datetime import datetime, timedelta, timezone
+
+from nisystemlink.clients.test_plan.models import ScheduleTestPlansRequest, TestPlan
+from nisystemlink_examples.scheduler import booking_filter, schedule_request, Scheduler
+
+T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+HOUR = timedelta(hours=1)
+
+
+def at(hours: float) -> datetime:
+    """Returns the time a number of hours after T0."""
+    return T0 + hours * HOUR
+
+
+def scheduler() -> Scheduler:
+    """Creates a scheduler of two systems with two fixtures each."""
+    scheduler = Scheduler(at(0), at(100))
+    scheduler.add_system("system-1", ["fixture-1a", "fixture-1b"])
+    scheduler.add_system("system-2", ["fixture-2a", "fixture-2b"])
+    return scheduler
+
+
+class TestScheduler:
+    """Test cases for the Scheduler class."""
+
+    def test_earliest_slot_on_any_system(self):
+        """Test that the system with the earliest free window is chosen."""
+        subject = scheduler()
+        subject.book("system-1", at(0), at(5))
+        subject.book("system-2", at(0), at(3))
+
+        assert subject.earliest_slot(2 * HOUR) == ("system-2", at(3), [])
+        assert subject.earliest_slot(2 * HOUR, system_ids=["system-1"]) == (
+            "system-1",
+            at(5),
+            [],
+        )
+
+    def test_fixtures_are_found_free_together(self):
+        """Test that a plan waits until enough fixtures of a system are free."""
+        subject = scheduler()
+        subject.book("system-1", at(0), at(2), ["fixture-1a"])
+        subject.book("system-1", at(1), at(4), ["fixture-1b"])
+        subject.book("system-2", at(0), at(6))
+
+        assert subject.earliest_slot(HOUR, 1) == ("system-1", at(0), ["fixture-1b"])
+        assert subject.earliest_slot(HOUR, 2) == (
+            "system-1",
+            at(4),
+            ["fixture-1a", "fixture-1b"],
+        )
+        assert subject.earliest_slot(HOUR, 3) is None
+
+    def test_whole_system_bookings_block_every_fixture(self):
+        """Test that a plan without fixtures occupies the fixtures of its system."""
+        subject = scheduler()
+        subject.book("system-1", at(0), at(2))
+        subject.book("system-2", at(0), at(1), ["fixture-2a"])
+
+        assert subject.earliest_slot(HOUR, 2, ["system-1"]) == (
+            "system-1",
+            at(2),
+            ["fixture-1a", "fixture-1b"],
+        )
+        assert subject.earliest_slot(HOUR, 0, ["system-2"]) == ("system-2", at(1), [])
+
+    def test_schedule_books_slots_for_later_plans(self):
+        """Test that scheduled plans are taken into account by the next ones."""
+        subject = scheduler()
+
+        slots = [
+            subject.schedule(f"plan-{i}", 10 * HOUR, 1, ["system-1"]) for i in range(5)
+        ]
+
+        assert [(slot.start, slot.fixture_ids) for slot in slots if slot] == [
+            (at(0), ["fixture-1a"]),
+            (at(0), ["fixture-1b"]),
+            (at(10), ["fixture-1a"]),
+            (at(10), ["fixture-1b"]),
+            (at(20), ["fixture-1a"]),
+        ]
+        assert subject.schedule("late", 90 * HOUR, 2, ["system-1"]) is None
+
+    def test_book_test_plans_of_known_systems(self):
+        """Test that models and dictionaries of test plans are booked."""
+        subject = scheduler()
+        test_plans = [
+            TestPlan(
+                id="1",
+                system_id="system-1",
+                fixture_ids=[],
+                planned_start_date_time=at(0),
+                estimated_end_date_time=at(3),
+            ),
+            {
+                "id": "2",
+                "systemId": "system-2",
+                "fixtureIds": ["fixture-2a", "fixture-2b"],
+                "plannedStartDateTime": "2025-01-01T00:00:00Z",
+                "estimatedEndDateTime": "2025-01-01T04:00:00Z",
+            },
+            {"id": "3", "systemId": "unknown", "plannedStartDateTime": None},
+            {"id": "4", "systemId": "system-1"},
+        ]
+
+        assert subject.book_test_plans(test_plans) == 2
+        assert subject.earliest_slot(HOUR, 1) == ("system-1", at(3), ["fixture-1a"])
+
+    def test_schedule_request_batches_slots(self):
+        """Test that every slot is sent in one request the client model accepts."""
+        subject = scheduler()
+        slots = [subject.schedule(str(i), HOUR) for i in range(3)]
+
+        body = schedule_request(slot for slot in slots if slot)
+        request = ScheduleTestPlansRequest(**body)
+
+        assert [plan.system_id for plan in request.test_plans] == [
+            "system-1",
+            "system-2",
+            "system-1",
+        ]
+        assert body["testPlans"][2]["plannedStartDateTime"] == (
+            "2025-01-01T01:00:00.000000Z"
+        )
+        assert body["testPlans"][2]["estimatedDurationInSeconds"] == 3600
+
+    def test_booking_filter(self):
+        """Test that the filter selects the plans overlapping the window."""
+        assert booking_filter(at(0), at(1)) == (
+            'plannedStartDateTime <= "2025-01-01T01:00:00.000000Z" and '
+            'estimatedEndDateTime >= "2025-01-01T00:00:00.000000Z"'
+        )
+
+    def test_naive_times_are_taken_as_utc(self):
+        """Test that naive times can be mixed with the UTC times of the API."""
+        subject = Scheduler(datetime(2025, 1, 1), datetime(2025, 1, 5))
+        subject.add_system("system-1")
+        subject.book_test_plans(
+            [
+                {
+                    "systemId": "system-1",
+                    "plannedStartDateTime": "2025-01-01T00:00:00Z",
+                    "estimatedEndDateTime": "2025-01-01T02:00:00Z",
+                }
+            ]
+        )
+
+        slot = subject.schedule("plan", HOUR)
+
+        assert slot is not None
+        assert slot.start == at(2)
+        assert slot.schedule_request()["plannedStartDateTime"] == (
+            "2025-01-01T02:00:00.000000Z"
+        )
+
+    def test_times_with_offsets_are_sent_in_utc(self):
+        """Test that times in another time zone are converted to UTC."""
+        plus_two = timezone(timedelta(hours=2))
+        start = datetime(2025, 1, 1, 2, tzinfo=plus_two)
+        subject = Scheduler(start, start + 10 * HOUR)
+        subject.add_system("system-1")
+        subject.book("system-1", start, start + HOUR)
+
+        slot = subject.schedule("plan", HOUR)
+
+        assert slot is not None
+        assert slot.schedule_request()["plannedStartDateTime"] == (
+            "2025-01-01T01:00:00.000000Z"
+        )
+        assert booking_filter(start, start + HOUR) == (
+            'plannedStartDateTime <= "2025-01-01T01:00:00.000000Z" and '
+            'estimatedEndDateTime >= "2025-01-01T00:00:00.000000Z"'
+        )
@@ -0,0 +1,62 @@
+"""Unit tests for the IntervalIndex class."""
+
+from datetime import datetime, timedelta
+
+from nisystemlink_examples.scheduler import IntervalIndex
+
+T0 = datetime(2025, 1, 1)
+HOUR = timedelta(hours=1)
+
+
+def at(hours: float) -> datetime:
+    """Returns the time a number of hours after T0."""
+    return T0 + hours * HOUR
+
+
+class TestIntervalIndex:
+    """Test cases for the IntervalIndex class."""
+
+    def test_add_merges_overlapping_and_adjacent_windows(self):
+        """Test that windows are merged and kept sorted."""
+        index = IntervalIndex()
+        index.add(at(5), at(6))
+        index.add(at(1), at(2))
+        index.add(at(2), at(3))
+        index.add(at(5.5), at(8))
+        index.add(at(4), at(4))
+
+        assert list(index) == [(at(1), at(3)), (at(5), at(8))]
+
+    def test_add_spanning_several_windows(self):
+        """Test that a window covering several bookings replaces them."""
+        index = IntervalIndex()
+        for hour in range(0, 10, 2):
+            index.add(at(hour), at(hour + 1))
+
+        index.add(at(1.5), at(6.5))
+
+        assert list(index) == [(at(0), at(1)), (at(1.5), at(7)), (at(8), at(9))]
+
+    def test_is_free(self):
+        """Test that windows are half-open."""
+        index = IntervalIndex()
+        index.add(at(1), at(2))
+
+        assert index.is_free(at(0), at(1))
+        assert index.is_free(at(2), at(3))
+        assert not index.is_free(at(0), at(1.5))
+        assert not index.is_free(at(1.2), at(1.8))
+        assert not index.is_free(at(0), at(3))
+
+    def test_earliest_fit_skips_short_gaps(self):
+        """Test that the first gap long enough is found."""
+        index = IntervalIndex()
+        index.add(at(1), at(2))
+        index.add(at(2.5), at(4))
+        index.add(at(6), at(7))
+
+        assert index.earliest_fit(HOUR, at(0)) == at(0)
+        assert index.earliest_fit(HOUR, at(0.5)) == at(4)
+        assert index.earliest_fit(3 * HOUR, at(0)) == at(7)
+        assert index.earliest_fit(HOUR, at(6.5), deadline=at(8)) == at(7)
+        assert index.earliest_fit(2 * HOUR, at(6.5), deadline=at(8)) is None
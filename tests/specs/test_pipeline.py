@@ -0,0 +1,187 @@
+"""Unit tests for the bulk specification analysis."""
+
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from nisystemlink.clients.spec.models import (
+    SpecificationType,
+    UpdatedSpecification,
+    UpdateSpecificationsPartialSuccess,
+    UpdateSpecificationsRequestObject,
+)
+from nisystemlink_examples.specs import analyze_specs
+
+
+def mark_analyzed(spec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Marks a spec as analyzed, skipping specs that already are."""
+    if spec.get("properties", {}).get("Spec Analyzed") == "True":
+        return None
+    return dict(spec, properties={"Spec Analyzed": "True"})
+
+
+def specs(count: int) -> List[Dict[str, Any]]:
+    """Builds specs with consecutive IDs."""
+    return [{"id": f"spec-{i}", "specId": f"S{i}", "version": 0} for i in range(count)]
+
+
+class _FakeSpecService:
+    """Records update requests and fails the specs in `failing` a number of times."""
+
+    def __init__(self, failing: Optional[Dict[str, int]] = None, raising: int = 0):
+        self.failing = dict(failing or {})
+        self.raising = raising
+        self.chunks: List[List[str]] = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def update(self, chunk: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Updates the specs, as `SpecClient.update_specs` would."""
+        with self._lock:
+            self.chunks.append([spec["id"] for spec in chunk])
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            raising = self.raising > 0
+            self.raising -= 1
+            failed = []
+            for spec in chunk:
+                if self.failing.get(spec["id"], 0) > 0:
+                    self.failing[spec["id"]] -= 1
+                    failed.append(spec)
+        try:
+            if raising:
+                raise ConnectionError("timed out")
+            response: Dict[str, Any] = {
+                "updatedSpecs": [
+                    {"id": spec["id"], "version": 1}
+                    for spec in chunk
+                    if spec not in failed
+                ],
+                "failedSpecs": [dict(spec) for spec in failed],
+            }
+            if failed:
+                response["error"] = {"message": "Version conflict."}
+            return response
+        finally:
+            with self._lock:
+                self.running -= 1
+
+
+class TestAnalyzeSpecs:
+    """Test cases for the bulk specification analysis."""
+
+    def test_updates_are_sent_in_bounded_chunks(self):
+        """Test that every analyzed spec is sent once in chunks of the given size."""
+        service = _FakeSpecService()
+
+        report = analyze_specs(
+            iter(specs(25)), mark_analyzed, service.update, specs_per_update=10
+        )
+
+        assert [len(chunk) for chunk in service.chunks] == [10, 10, 5]
+        assert [spec["id"] for spec in report.updated_specs] == [
+            spec["id"] for spec in specs(25)
+        ]
+        assert report.failed_specs == []
+        assert service.max_running <= 4
+
+    def test_unchanged_specs_and_analysis_errors_are_not_sent(self):
+        """Test that only the specs returned by the analysis are updated."""
+
+        def analyze(spec):
+            if spec["id"] == "spec-1":
+                raise ValueError("no data")
+            if spec["id"] == "spec-2":
+                return None
+            return mark_analyzed(spec)
+
+        service = _FakeSpecService()
+
+        report = analyze_specs(specs(4), analyze, service.update)
+
+        assert service.chunks == [["spec-0", "spec-3"]]
+        assert report.unchanged == 1
+        assert [(spec["id"], error) for spec, error in report.analysis_errors] == [
+            ("spec-1", "no data")
+        ]
+
+    def test_only_failed_specs_are_retried(self):
+        """Test that the retry sends the failed specs of all chunks together."""
+        service = _FakeSpecService(failing={"spec-1": 1, "spec-7": 1, "spec-8": 2})
+
+        report = analyze_specs(
+            specs(9), mark_analyzed, service.update, specs_per_update=3
+        )
+
+        assert sorted(service.chunks[3:]) == [["spec-1", "spec-7", "spec-8"]]
+        assert len(report.updated_specs) == 8
+        assert [spec["id"] for spec in report.failed_specs] == ["spec-8"]
+        assert report.failed_specs[0]["properties"] == {"Spec Analyzed": "True"}
+        assert report.errors == ["Version conflict."] * 3
+
+    def test_chunks_of_failed_requests_are_retried(self):
+        """Test that a request raising an error fails all specs of its chunk."""
+        service = _FakeSpecService(raising=1)
+
+        report = analyze_specs(
+            specs(4), mark_analyzed, service.update, specs_per_update=2, retries=0
+        )
+
+        assert len(report.updated_specs) == 2
+        assert len(report.failed_specs) == 2
+        assert report.errors == ["timed out"]
+
+        service = _FakeSpecService(raising=1)
+
+        report = analyze_specs(
+            specs(4), mark_analyzed, service.update, specs_per_update=2
+        )
+
+        assert len(report.updated_specs) == 4
+        assert report.failed_specs == []
+
+    def test_analysis_in_process_pool(self):
+        """Test that specs analyzed in other processes are sent."""
+        service = _FakeSpecService()
+
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            report = analyze_specs(
+                specs(6), mark_analyzed, service.update, executor=executor
+            )
+
+        assert sorted(service.chunks[0]) == [spec["id"] for spec in specs(6)]
+        assert len(report.updated_specs) == 6
+
+    def test_responses_of_client_models(self):
+        """Test that the models of `nisystemlink-clients` are supported."""
+        fields = {"product_id": "product", "workspace": "workspace", "version": 0}
+        models = [
+            UpdateSpecificationsRequestObject(
+                id=f"spec-{i}",
+                spec_id=f"S{i}",
+                type=SpecificationType.PARAMETRIC,
+                **fields,
+            )
+            for i in range(3)
+        ]
+
+        def update(chunk):
+            updated = UpdatedSpecification(
+                id=chunk[0].id,
+                spec_id=chunk[0].spec_id,
+                updated_at=datetime(2024, 1, 1),
+                updated_by="user",
+                **dict(fields, version=1),
+            )
+            return UpdateSpecificationsPartialSuccess(
+                updated_specs=[updated],
+                failed_specs=[spec.model_copy() for spec in chunk[1:]],
+            )
+
+        report = analyze_specs(models, lambda spec: spec, update, retries=0)
+
+        assert [spec.id for spec in report.updated_specs] == ["spec-0"]
+        assert report.failed_specs == models[1:]
+        assert report.failed_specs[0] is models[1]
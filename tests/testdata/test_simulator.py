@@ -1,21 +1,78 @@
 """Unit tests for the Simulator class."""
 
+import numpy as np
 from nisystemlink_examples.testdata.simulator import Simulator
 
+SEQUENCE = dict(
+    part_number="PN-12345",
+    serial_number="SN-67890",
+    test_plan_id="TP-001",
+    system_id="SYS-001",
+    test_program="test_program.py",
+    operator="test_operator",
+    hostname="test-machine",
+)
+
 
 class TestSimulator:
     """Test cases for the Simulator class."""
 
-    def test_simulate_sequence_returns_hello_world(self):
-        """Test that simulate_sequence returns 'Hello World'."""
-        simulator = Simulator()
-        result = simulator.simulate_sequence(
-            part_number="PN-12345",
-            serial_number="SN-67890",
-            test_plan_id="TP-001",
-            system_id="SYS-001",
-            test_program="test_program.py",
-            operator="test_operator",
-            hostname="test-machine",
+    def test_simulate_sequence_sweeps_every_current_and_voltage(self):
+        """Test that every current is swept across every voltage."""
+        simulator = Simulator(currents=[1, 2], voltages=[10, 20, 30], seed=1)
+
+        sequence = simulator.simulate_sequence(**SEQUENCE)
+
+        assert len(sequence) == 6
+        assert sequence.current.tolist() == [1, 1, 1, 2, 2, 2]
+        assert sequence.voltage.tolist() == [10, 20, 30, 10, 20, 30]
+        assert sequence.serial_number == "SN-67890"
+
+    def test_simulate_sequence_applies_bounded_losses_and_limits(self):
+        """Test that the power stays within the losses and is checked against limits."""
+        simulator = Simulator(
+            currents=range(100), voltages=range(100), high_limit=2000, seed=2
         )
-        assert result == "Hello World!"
+
+        sequence = simulator.simulate_sequence(**SEQUENCE)
+
+        ideal = sequence.current * sequence.voltage
+        assert np.all(sequence.power <= ideal)
+        assert np.all(sequence.power >= ideal * 0.75**2)
+        assert np.array_equal(sequence.passed, sequence.power <= 2000)
+        assert sequence.status["statusType"] == "FAILED"
+
+    def test_simulate_sequence_is_reproducible_with_seed(self):
+        """Test that generators with the same seed simulate the same sequence."""
+        first = Simulator(seed=3).simulate_sequence(**SEQUENCE)
+        second = Simulator(seed=3).simulate_sequence(**SEQUENCE)
+
+        assert np.array_equal(first.power, second.power)
+
+    def test_to_step_tree_builds_one_sweep_step_per_current(self):
+        """Test that the sequence converts to a rolled up step hierarchy."""
+        simulator = Simulator(currents=[1, 100], voltages=[1, 2], high_limit=10, seed=4)
+        sequence = simulator.simulate_sequence(**SEQUENCE)
+
+        tree = sequence.to_step_tree("result-id")
+
+        assert len(tree) == 6
+        assert [root.status["statusType"] for root in tree.roots] == [
+            "PASSED",
+            "FAILED",
+        ]
+        measurement = tree.roots[0].children[1].step
+        assert measurement["resultId"] == "result-id"
+        assert measurement["inputs"][1] == {"name": "voltage", "value": 2.0}
+        assert measurement["outputs"][0]["value"] == sequence.power[1]
+
+    def test_to_result_carries_sequence_metadata(self):
+        """Test that the result holds the unit, test plan and overall status."""
+        sequence = Simulator(high_limit=1000).simulate_sequence(**SEQUENCE)
+
+        result = sequence.to_result()
+
+        assert result["partNumber"] == "PN-12345"
+        assert result["hostName"] == "test-machine"
+        assert result["properties"] == {"testPlanId": "TP-001"}
+        assert result["status"]["statusType"] == "PASSED"
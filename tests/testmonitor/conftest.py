@@ -0,0 +1,70 @@
+"""Shared fixtures for the testmonitor tests."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import pytest
+
+
+class _RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self) -> None:
+        server: Any = self.server
+        length = int(self.headers["Content-Length"])
+        body = json.loads(self.rfile.read(length))
+        with server.lock:
+            server.calls.append(("POST", self.path, body, self.headers["X-NI-API-KEY"]))
+            server.ports.add(self.client_address[1])
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            fail = server.failures > 0
+            server.failures -= fail
+        time.sleep(server.delay)
+        with server.lock:
+            server.in_flight -= 1
+        if fail:
+            self._reply(503, {})
+        elif self.path.endswith("delete-results"):
+            self._reply(204, None)
+        else:
+            self._reply(201, body)
+
+    def do_DELETE(self) -> None:
+        server: Any = self.server
+        server.calls.append(("DELETE", self.path, None, self.headers["X-NI-API-KEY"]))
+        self._reply(204, None)
+
+    def _reply(self, status: int, body: Any) -> None:
+        payload = b"" if body is None else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def server() -> Iterator[Any]:
+    """Runs a local HTTP server that records the requests it receives."""
+    httpd: Any = ThreadingHTTPServer(("127.0.0.1", 0), _RecordingHandler)
+    httpd.calls = []
+    httpd.ports = set()
+    httpd.failures = 0
+    httpd.delay = 0.0
+    httpd.in_flight = 0
+    httpd.max_in_flight = 0
+    httpd.lock = threading.Lock()
+    thread = threading.Thread(
+        target=httpd.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+    )
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
@@ -0,0 +1,80 @@
+"""Unit tests for the AsyncTestDataManagerClient class."""
+
+import asyncio
+from typing import Any
+
+import pytest
+from nisystemlink_examples.testmonitor import create_test_result
+from nisystemlink_examples.testmonitor.async_client import AsyncTestDataManagerClient
+
+
+def _client(server: Any, **kwargs: Any) -> AsyncTestDataManagerClient:
+    host, port = server.server_address
+    return AsyncTestDataManagerClient(
+        f"http://{host}:{port}", "key", backoff_factor=0, **kwargs
+    )
+
+
+class TestAsyncTestDataManagerClient:
+    """Test cases for the AsyncTestDataManagerClient class."""
+
+    def test_create_results_posts_to_results_route(self, server):
+        """Test that results are posted to the v2 results route."""
+
+        async def run():
+            async with _client(server) as client:
+                return await client.create_results([create_test_result(operator="op")])
+
+        response = asyncio.run(run())
+
+        method, path, body, api_key = server.calls[0]
+        assert (method, path, api_key) == ("POST", "/nitestmonitor/v2/results", "key")
+        assert response == body
+
+    def test_concurrent_requests_are_bounded(self, server):
+        """Test that no more than max_concurrency requests are in flight at once."""
+        server.delay = 0.05
+
+        async def run():
+            async with _client(server, max_concurrency=3) as client:
+                await asyncio.gather(
+                    *(client.create_steps([{"name": str(i)}]) for i in range(12))
+                )
+
+        asyncio.run(run())
+
+        assert len(server.calls) == 12
+        assert 1 < server.max_in_flight <= 3
+
+    def test_service_unavailable_is_retried(self, server):
+        """Test that a 503 response is retried before succeeding."""
+        server.failures = 2
+
+        async def run():
+            async with _client(server) as client:
+                await client.update_steps([{"stepId": "1"}])
+
+        asyncio.run(run())
+
+        assert len(server.calls) == 3
+
+    def test_delete_results_returns_empty_dict_when_all_deleted(self, server):
+        """Test that a 204 response from delete-results yields an empty dictionary."""
+
+        async def run():
+            async with _client(server) as client:
+                await client.delete_result("abc")
+                return await client.delete_results(["1", "2"])
+
+        assert asyncio.run(run()) == {}
+        assert server.calls[0][1] == "/nitestmonitor/v2/results/abc?deleteSteps=true"
+
+    def test_empty_results_are_rejected(self, server):
+        """Test that creating an empty list of results raises a ValueError."""
+
+        async def run():
+            async with _client(server) as client:
+                await client.create_results([])
+
+        with pytest.raises(ValueError):
+            asyncio.run(run())
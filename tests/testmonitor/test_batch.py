@@ -0,0 +1,143 @@
+"""Unit tests for the StepBatchWriter class."""
+
+import time
+
+import pytest
+from nisystemlink_examples.testmonitor.batch import StepBatchWriter, StepWriteError
+
+
+class _FakeClient:
+    """Fails the steps with the given names, echoing steps like the server does.
+
+    The returned steps have default values filled in and are in reverse order.
+    """
+
+    def __init__(self, failed_names=()):
+        self.calls = []
+        self.failed_names = set(failed_names)
+
+    def create_steps(self, steps):
+        self.calls.append(("create", steps))
+        normalized = [dict(step, inputs=[], outputs=[]) for step in steps]
+        created = [s for s in normalized if s.get("name") not in self.failed_names]
+        failed = [s for s in normalized if s.get("name") in self.failed_names]
+        response = {"steps": created[::-1]}
+        if failed:
+            response.update(failed=failed, error={"message": "rejected"})
+        return response
+
+    def update_steps(self, steps):
+        self.calls.append(("update", steps))
+        return {"steps": steps}
+
+
+class TestStepBatchWriter:
+    """Test cases for the StepBatchWriter class."""
+
+    def test_creates_are_coalesced_into_one_request(self):
+        """Test that buffered steps are sent in a single create request."""
+        client = _FakeClient()
+        with StepBatchWriter(client, max_age=None) as writer:
+            futures = [
+                writer.create({"name": str(i), "resultId": "r"}) for i in range(10)
+            ]
+
+        assert [kind for kind, _ in client.calls] == ["create"]
+        sent = client.calls[0][1]
+        assert len({step["stepId"] for step in sent}) == 10
+        assert [future.result()["stepId"] for future in futures] == [
+            step["stepId"] for step in sent
+        ]
+        assert [future.result()["name"] for future in futures] == [
+            str(i) for i in range(10)
+        ]
+
+    def test_flushes_when_max_steps_is_reached(self):
+        """Test that the buffer is flushed as soon as it holds max_steps steps."""
+        client = _FakeClient()
+        writer = StepBatchWriter(client, max_steps=3, max_age=None)
+        for i in range(7):
+            writer.create({"name": str(i)})
+
+        assert [len(steps) for _, steps in client.calls] == [3, 3]
+        writer.close()
+        assert [len(steps) for _, steps in client.calls] == [3, 3, 1]
+
+    def test_flushes_when_max_bytes_is_reached(self):
+        """Test that the buffer is flushed once its JSON size reaches max_bytes."""
+        client = _FakeClient()
+        writer = StepBatchWriter(client, max_bytes=250, max_age=None)
+        writer.create({"name": "x" * 40})
+        writer.create({"name": "y" * 40})
+        assert client.calls == []
+        writer.create({"name": "z" * 40})
+
+        assert [len(steps) for _, steps in client.calls] == [2, 1]
+        writer.close()
+
+    def test_flushes_when_max_age_is_reached(self):
+        """Test that buffered steps are sent after max_age seconds."""
+        client = _FakeClient()
+        writer = StepBatchWriter(client, max_age=0.05)
+        future = writer.create({"name": "step"})
+
+        assert future.result(timeout=2)["name"] == "step"
+        writer.close()
+
+    def test_repeated_updates_are_folded(self):
+        """Test that repeated updates of one step are merged into a final update."""
+        client = _FakeClient()
+        with StepBatchWriter(client, max_age=None) as writer:
+            writer.update({"stepId": "1", "resultId": "r", "status": "FAILED"})
+            writer.update({"stepId": "1", "resultId": "r", "status": "PASSED"})
+            writer.update({"stepId": "2", "resultId": "r", "status": "FAILED"})
+
+        assert client.calls == [
+            (
+                "update",
+                [
+                    {"stepId": "1", "resultId": "r", "status": "PASSED"},
+                    {"stepId": "2", "resultId": "r", "status": "FAILED"},
+                ],
+            )
+        ]
+
+    def test_update_of_pending_create_is_folded_into_create(self):
+        """Test that updating a step that is not yet created changes the creation."""
+        client = _FakeClient()
+        with StepBatchWriter(client, max_age=None) as writer:
+            writer.create({"stepId": "a", "resultId": "r", "status": "RUNNING"})
+            writer.update({"stepId": "a", "resultId": "r", "status": "PASSED"})
+
+        assert client.calls == [
+            ("create", [{"stepId": "a", "resultId": "r", "status": "PASSED"}])
+        ]
+
+    def test_failed_steps_raise_through_their_future(self):
+        """Test that steps in a partial success response fail their futures."""
+        client = _FakeClient(failed_names=["bad"])
+        with StepBatchWriter(client, max_age=None) as writer:
+            first = writer.create({"name": "first", "resultId": "r"})
+            bad = writer.create({"name": "bad", "resultId": "r"})
+            last = writer.create({"name": "last", "resultId": "r"})
+
+        assert first.result()["name"] == "first"
+        assert last.result()["name"] == "last"
+        with pytest.raises(StepWriteError):
+            bad.result()
+
+    def test_duplicate_pending_create_is_rejected(self):
+        """Test that a step ID can only be waiting for one creation at a time."""
+        with StepBatchWriter(_FakeClient(), max_age=None) as writer:
+            writer.create({"stepId": "a", "resultId": "r"})
+            with pytest.raises(ValueError):
+                writer.create({"stepId": "a", "resultId": "r"})
+
+    def test_closed_writer_rejects_steps(self):
+        """Test that steps cannot be added after the writer is closed."""
+        writer = StepBatchWriter(_FakeClient(), max_age=0.01)
+        time.sleep(0.02)
+        writer.close()
+
+        with pytest.raises(RuntimeError):
+            writer.create({"name": "late"})
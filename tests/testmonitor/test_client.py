@@ -0,0 +1,70 @@
+"""Unit tests for the TestDataManagerClient class."""
+
+from typing import Any
+
+import pytest
+from nisystemlink_examples.testmonitor import create_test_result, TestDataManagerClient
+
+
+def _client(server: Any, api_key: str = "key") -> TestDataManagerClient:
+    host, port = server.server_address
+    return TestDataManagerClient(f"http://{host}:{port}", api_key, backoff_factor=0)
+
+
+class TestTestDataManagerClient:
+    """Test cases for the TestDataManagerClient class."""
+
+    def test_create_results_posts_to_results_route(self, server):
+        """Test that results are posted to the v2 results route."""
+        with _client(server) as client:
+            response = client.create_results([create_test_result(operator="op")])
+
+        method, path, body, api_key = server.calls[0]
+        assert (method, path, api_key) == ("POST", "/nitestmonitor/v2/results", "key")
+        assert response == body
+        assert body["results"][0]["operator"] == "op"
+
+    def test_requests_reuse_pooled_connection(self, server):
+        """Test that consecutive requests share one keep-alive connection."""
+        with _client(server) as client:
+            for _ in range(5):
+                client.create_steps([{"name": "step"}])
+
+        assert len(server.calls) == 5
+        assert len(server.ports) == 1
+
+    def test_service_unavailable_is_retried(self, server):
+        """Test that a 503 response is retried before succeeding."""
+        server.failures = 2
+        with _client(server) as client:
+            client.update_steps([{"stepId": "1"}])
+
+        assert len(server.calls) == 3
+
+    def test_clients_keep_separate_credentials(self, server):
+        """Test that two clients in one process use their own API keys."""
+        with _client(server, "first") as first, _client(server, "second") as second:
+            first.update_results([{"id": "1"}])
+            second.update_results([{"id": "2"}])
+
+        assert [call[3] for call in server.calls] == ["first", "second"]
+
+    def test_delete_result_sends_delete_steps_query(self, server):
+        """Test that deleting a single result passes deleteSteps as a query value."""
+        with _client(server) as client:
+            client.delete_result("abc", delete_steps=False)
+
+        assert server.calls[0][:2] == (
+            "DELETE",
+            "/nitestmonitor/v2/results/abc?deleteSteps=false",
+        )
+
+    def test_delete_results_returns_empty_dict_when_all_deleted(self, server):
+        """Test that a 204 response from delete-results yields an empty dictionary."""
+        with _client(server) as client:
+            assert client.delete_results(["1", "2"]) == {}
+
+    def test_empty_steps_are_rejected(self, server):
+        """Test that creating an empty list of steps raises a ValueError."""
+        with _client(server) as client, pytest.raises(ValueError):
+            client.create_steps([])
@@ -0,0 +1,141 @@
+"""Unit tests for the bulk_delete_results function."""
+
+import threading
+import time
+
+import pytest
+from nisystemlink_examples.testmonitor.delete import bulk_delete_results
+
+
+class _FakeClient:
+    def __init__(self, result_ids=(), undeletable=(), unreachable=()):
+        self.results = set(result_ids)
+        self.undeletable = set(undeletable)
+        self.unreachable = set(unreachable)
+        self.chunks = []
+        self.lock = threading.Lock()
+
+    def delete_results(self, result_ids, delete_steps=True):
+        if self.unreachable.intersection(result_ids):
+            raise TimeoutError("timed out")
+        with self.lock:
+            self.chunks.append(list(result_ids))
+            failed = [i for i in result_ids if i in self.undeletable]
+            self.results.difference_update(set(result_ids) - self.undeletable)
+        if not failed:
+            return {}
+        return {
+            "ids": [i for i in result_ids if i not in failed],
+            "failed": failed,
+            "error": {
+                "message": "Some results were not deleted.",
+                "innerErrors": [
+                    {"resourceId": i, "message": f"{i} is locked"} for i in failed
+                ],
+            },
+        }
+
+    def post(self, route, body):
+        ordered = sorted(self.results)
+        start = int(body.get("continuationToken") or 0)
+        page = ordered[start : start + body["take"]]
+        token = str(start + len(page)) if start + len(page) < len(ordered) else None
+
+        class _Response:
+            def json(self):
+                return {
+                    "results": [{"id": i} for i in page],
+                    "continuationToken": token,
+                }
+
+        return _Response()
+
+
+def _ids(count):
+    return [f"{i:05}" for i in range(count)]
+
+
+class TestBulkDeleteResults:
+    """Test cases for the bulk_delete_results function."""
+
+    def test_ids_are_deleted_in_chunks(self):
+        """Test that the IDs are split into chunks of the given size."""
+        client = _FakeClient(_ids(25))
+
+        report = bulk_delete_results(client, iter(_ids(25)), chunk_size=10)
+
+        assert sorted(len(chunk) for chunk in client.chunks) == [5, 10, 10]
+        assert report.deleted_count == 25
+        assert report.failed == {}
+        assert not client.results
+
+    def test_partial_failures_are_reported_per_id(self):
+        """Test that IDs listed as failed are reported with their error message."""
+        client = _FakeClient(_ids(10), undeletable=["00003", "00007"])
+
+        report = bulk_delete_results(
+            client, _ids(10), chunk_size=4, collect_deleted_ids=True
+        )
+
+        assert report.deleted_count == 8
+        assert sorted(report.deleted_ids) == sorted(set(_ids(10)) - {"00003", "00007"})
+        assert report.failed == {"00003": "00003 is locked", "00007": "00007 is locked"}
+
+    def test_results_matching_a_filter_are_deleted(self):
+        """Test that the IDs can be queried from the server by a filter."""
+        client = _FakeClient(_ids(30))
+
+        report = bulk_delete_results(client, filter='partNumber == "x"', chunk_size=7)
+
+        assert report.deleted_count == 30
+        assert not client.results
+
+    def test_checkpoint_resumes_after_handled_ids(self, tmp_path):
+        """Test that a rerun with the same checkpoint skips the IDs already handled."""
+        checkpoint = str(tmp_path / "checkpoint.json")
+        bulk_delete_results(
+            _FakeClient(), _ids(20), chunk_size=5, checkpoint_path=checkpoint
+        )
+
+        client = _FakeClient()
+        report = bulk_delete_results(
+            client, _ids(30), chunk_size=5, checkpoint_path=checkpoint
+        )
+
+        assert sorted(id for chunk in client.chunks for id in chunk) == _ids(30)[20:]
+        assert report.deleted_count == 30
+
+    def test_checkpoint_retries_chunks_that_raised(self, tmp_path):
+        """Test that a rerun sends the chunks whose request raised an error again."""
+        checkpoint = str(tmp_path / "checkpoint.json")
+        first = bulk_delete_results(
+            _FakeClient(unreachable=["00006"]),
+            _ids(20),
+            chunk_size=5,
+            checkpoint_path=checkpoint,
+        )
+        assert first.deleted_count == 15
+        assert sorted(first.failed) == _ids(10)[5:]
+
+        client = _FakeClient(undeletable=["00007"])
+        report = bulk_delete_results(
+            client, _ids(20), chunk_size=5, checkpoint_path=checkpoint
+        )
+
+        assert client.chunks == [_ids(10)[5:]]
+        assert report.deleted_count == 19
+        assert report.failed == {"00007": "00007 is locked"}
+
+    def test_requests_are_rate_limited(self):
+        """Test that delete requests do not exceed the given rate."""
+        start = time.monotonic()
+        bulk_delete_results(
+            _FakeClient(), _ids(5), chunk_size=1, max_requests_per_second=50
+        )
+
+        assert time.monotonic() - start >= 4 / 50
+
+    def test_ids_or_filter_are_required(self):
+        """Test that a deletion without IDs or filter raises a ValueError."""
+        with pytest.raises(ValueError):
+            bulk_delete_results(_FakeClient())
@@ -0,0 +1,277 @@
+"""Unit tests for the ResultSpool class."""
+
+import json
+import threading
+
+import pytest
+import requests
+from nisystemlink_examples.mockserver import MockSystemLinkServer
+from nisystemlink_examples.testmonitor import TestDataManagerClient
+from nisystemlink_examples.testmonitor.spool import ResultSpool, SPOOL_ID_PROPERTY
+
+
+def _http_error(status, body):
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body).encode()
+    return requests.HTTPError(f"{status} Error", response=response)
+
+
+class _FakeClient:
+    def __init__(self):
+        self.calls = []
+        self.results = {}
+        self.offline = False
+        self.status = None
+        self.rejected_steps = set()
+
+    def _call(self, name, items):
+        if self.offline:
+            raise requests.ConnectionError("server unreachable")
+        self.calls.append((name, items))
+        if self.status is not None:
+            raise _http_error(self.status, {"error": {"message": "bad request"}})
+
+    def create_results(self, results):
+        self._call("create_results", results)
+        created = []
+        for result in results:
+            server_result = dict(result, id=f"server-{len(self.results)}")
+            self.results[server_result["id"]] = server_result
+            created.append(server_result)
+        return {"results": created}
+
+    def update_results(self, results):
+        self._call("update_results", results)
+        return {"results": results}
+
+    def create_steps(self, steps):
+        self._call("create_steps", steps)
+        # Like the server, the failed steps are echoed with default values filled in.
+        failed = [
+            dict(step, inputs=[], outputs=[])
+            for step in steps
+            if step["stepId"] in self.rejected_steps
+        ]
+        created = [s for s in steps if s["stepId"] not in self.rejected_steps]
+        response = {"steps": created}
+        if failed:
+            response.update(failed=failed, error={"message": "rejected"})
+        return response
+
+    def update_steps(self, steps):
+        self._call("update_steps", steps)
+        return {"steps": steps}
+
+    def get(self, route):
+        self._call("get", route)
+        raise _http_error(404, {"error": {"message": "not found"}})
+
+    def post(self, route, body):
+        self._call("query", body["substitutions"])
+        results = [
+            result
+            for result in self.results.values()
+            if result["properties"][SPOOL_ID_PROPERTY] in body["substitutions"]
+        ]
+
+        class _Response:
+            def json(self):
+                return {"results": results}
+
+        return _Response()
+
+
+@pytest.fixture
+def client():
+    """Returns a fake Test Monitor client."""
+    return _FakeClient()
+
+
+@pytest.fixture
+def spool(tmp_path, client):
+    """Returns a spool backed by a temporary database."""
+    with ResultSpool(str(tmp_path / "spool.db"), client) as spool:
+        yield spool
+
+
+class TestResultSpool:
+    """Test cases for the ResultSpool class."""
+
+    def test_operations_are_replayed_in_batches_with_server_ids(self, spool, client):
+        """Test that local result IDs are replaced by server IDs when draining."""
+        result_id = spool.create_result({"programName": "Power Test"})
+        spool.create_steps([{"resultId": result_id, "name": str(i)} for i in range(5)])
+        spool.update_results([{"id": result_id, "status": "PASSED"}])
+
+        assert spool.drain() == 7
+
+        assert [name for name, _ in client.calls] == [
+            "create_results",
+            "create_steps",
+            "update_results",
+        ]
+        server_id = spool.server_id(result_id)
+        assert server_id == "server-0"
+        assert all(step["resultId"] == server_id for step in client.calls[1][1])
+        assert client.calls[2][1] == [{"id": server_id, "status": "PASSED"}]
+        assert spool.pending_count() == 0
+
+    def test_children_are_not_batched_with_their_parents(self, spool, client):
+        """Test that a child step is sent after the request creating its parent."""
+        parent_id = spool.create_steps([{"resultId": "r", "name": "parent"}])[0]
+        spool.create_steps([{"resultId": "r", "name": "child", "parentId": parent_id}])
+
+        spool.drain()
+
+        assert [len(steps) for _, steps in client.calls] == [1, 1]
+
+    def test_operations_survive_an_unreachable_server(self, spool, client):
+        """Test that operations stay spooled while the server cannot be reached."""
+        spool.create_result({"programName": "Power Test"})
+        client.offline = True
+
+        with pytest.raises(requests.ConnectionError):
+            spool.drain()
+        assert spool.pending_count() == 1
+
+        client.offline = False
+        spool.drain()
+        assert spool.pending_count() == 0
+
+    def test_uncertain_result_creation_is_not_repeated(self, spool, client):
+        """Test that a result that reached the server before a crash is not resent."""
+        result_id = spool.create_result({"programName": "Power Test"})
+        spool._set_state(spool._next_batch(), "sending")
+        client.create_results([dict(spool._next_batch()[0][3])])
+        client.calls.clear()
+
+        spool.drain()
+
+        assert [name for name, _ in client.calls] == ["query"]
+        assert spool.server_id(result_id) == "server-0"
+        assert len(client.results) == 1
+
+    def test_rejected_steps_are_kept_as_failed(self, spool, client):
+        """Test that rejected operations are set aside without blocking the spool."""
+        step_ids = spool.create_steps([{"resultId": "r"}, {"resultId": "r"}])
+        client.rejected_steps.add(step_ids[0])
+
+        spool.drain()
+
+        assert spool.pending_count() == 0
+        [(kind, payload, error)] = spool.failed_operations()
+        assert (kind, payload["stepId"]) == ("create_step", step_ids[0])
+        assert "rejected" in error
+
+    @pytest.mark.parametrize("status", [400, 404])
+    def test_batches_rejected_by_the_server_are_kept_as_failed(
+        self, spool, client, status
+    ):
+        """Test that a client error fails the batch instead of retrying it forever."""
+        spool.create_result({"programName": "Power Test"})
+        spool.update_steps([{"resultId": "r", "stepId": "s", "name": "x"}])
+        client.status = status
+
+        assert spool.drain() == 2
+
+        assert spool.pending_count() == 0
+        failed = spool.failed_operations()
+        assert [kind for kind, _, _ in failed] == ["create_result", "update_step"]
+        assert all("bad request" in error for _, _, error in failed)
+
+    @pytest.mark.parametrize("status", [401, 403, 408, 429, 500, 503])
+    def test_batches_are_retried_after_transient_errors(self, spool, client, status):
+        """Test that rate limiting and server errors leave the batch in the spool."""
+        spool.update_steps([{"resultId": "r", "stepId": "s", "name": "x"}])
+        client.status = status
+
+        with pytest.raises(requests.HTTPError):
+            spool.drain()
+        assert spool.pending_count() == 1
+        assert spool.failed_operations() == []
+
+        client.status = None
+        spool.drain()
+        assert spool.pending_count() == 0
+
+    def test_uncertain_step_creation_is_confirmed_on_the_server(self, tmp_path):
+        """Test that a rejected step sent before a crash is only dropped if it exists."""
+        with MockSystemLinkServer(seed=0) as server, TestDataManagerClient(
+            server.url, "key"
+        ) as client, ResultSpool(str(tmp_path / "spool.db"), client) as spool:
+            [result] = client.create_results([{"programName": "Power Test"}])["results"]
+            created, missing = spool.create_steps(
+                [{"resultId": result["id"]}, {"resultId": "missing"}]
+            )
+            batch = spool._next_batch()
+            spool._set_state(batch, "sending")
+            client.create_steps([batch[0][3]])
+
+            spool.drain()
+
+            assert spool.pending_count() == 0
+            [(kind, payload, _)] = spool.failed_operations()
+            assert (kind, payload["stepId"]) == ("create_step", missing)
+            assert list(server.steps) == [created]
+
+    def test_manual_drain_waits_for_the_background_drainer(self, spool, client):
+        """Test that concurrent drains do not send the same operations twice."""
+        sending = threading.Event()
+        release = threading.Event()
+        create_steps = client.create_steps
+
+        def blocking_create_steps(steps):
+            sending.set()
+            release.wait()
+            return create_steps(steps)
+
+        client.create_steps = blocking_create_steps
+        spool.create_steps([{"resultId": "r"}])
+        spool.start()
+        assert sending.wait(5)
+        manual = threading.Thread(target=spool.drain)
+        manual.start()
+        manual.join(0.2)
+        release.set()
+        manual.join()
+        spool.stop()
+
+        assert [name for name, _ in client.calls] == ["create_steps"]
+
+    def test_uncertain_result_creation_is_recovered_from_the_server(self, tmp_path):
+        """Test the lookup of a result created before a crash against the mock server."""
+        with MockSystemLinkServer(seed=0) as server, TestDataManagerClient(
+            server.url, "key"
+        ) as client, ResultSpool(str(tmp_path / "spool.db"), client) as spool:
+            result_id = spool.create_result({"programName": "Power Test"})
+            other_id = spool.create_result({"programName": "Power Test"})
+            batch = spool._next_batch()
+            spool._set_state(batch, "sending")
+            [created] = client.create_results([batch[0][3]])["results"]
+
+            spool.drain()
+
+            assert spool.server_id(result_id) == created["id"]
+            assert spool.server_id(other_id) not in (None, created["id"])
+            assert len(server.results) == 2
+
+    def test_spool_persists_across_instances(self, tmp_path, client):
+        """Test that spooled operations and ID mappings are kept on disk."""
+        path = str(tmp_path / "spool.db")
+        with ResultSpool(path, client) as first:
+            result_id = first.create_result({"programName": "Power Test"})
+
+        with ResultSpool(path, client) as second:
+            second.drain()
+            assert second.server_id(result_id) == "server-0"
+
+    def test_background_drainer_forwards_operations(self, spool, client):
+        """Test that the background thread forwards operations as they are spooled."""
+        spool.start()
+        spool.create_steps([{"resultId": "r"}])
+        spool.stop()
+        spool.drain()
+
+        assert spool.pending_count() == 0
+        assert client.calls[0][0] == "create_steps"
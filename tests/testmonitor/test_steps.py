@@ -0,0 +1,106 @@
+"""Unit tests for the StepTree class."""
+
+import pytest
+from nisystemlink_examples.testmonitor.batch import StepBatchWriter, StepWriteError
+from nisystemlink_examples.testmonitor.payloads import FAILED_STATUS, PASSED_STATUS
+from nisystemlink_examples.testmonitor.steps import StepTree
+
+
+class _FakeClient:
+    def __init__(self, rejected_names=()):
+        self.calls = []
+        self.rejected_names = set(rejected_names)
+
+    def create_steps(self, steps):
+        self.calls.append(steps)
+        failed = [step for step in steps if step["name"] in self.rejected_names]
+        created = [step for step in steps if step["name"] not in self.rejected_names]
+        if failed:
+            return {"steps": created, "failed": failed, "error": {"message": "bad"}}
+        return {"steps": created}
+
+
+def _sweep(tree, statuses):
+    parent = tree.add_step("Voltage Sweep", "SequenceCall")
+    for status in statuses:
+        tree.add_step("Measure", "NumericLimit", parent=parent, status=status)
+    return parent
+
+
+class TestStepTree:
+    """Test cases for the StepTree class."""
+
+    def test_children_reference_client_generated_parent_ids(self):
+        """Test that child steps point to the locally generated ID of their parent."""
+        tree = StepTree("result")
+        parent = _sweep(tree, [PASSED_STATUS])
+
+        child = parent.children[0]
+        assert parent.step_id
+        assert child.step["parentId"] == parent.step_id
+        assert child.step["resultId"] == "result"
+        assert len(tree) == 2
+
+    def test_roll_up_takes_most_severe_child_status(self):
+        """Test that running parents take the most severe status of their children."""
+        tree = StepTree("result")
+        passed = _sweep(tree, [PASSED_STATUS, PASSED_STATUS])
+        failed = _sweep(tree, [PASSED_STATUS, FAILED_STATUS])
+
+        result_status = tree.roll_up_status()
+
+        assert passed.status["statusType"] == "PASSED"
+        assert failed.status["statusType"] == "FAILED"
+        assert result_status["statusType"] == "FAILED"
+
+    def test_roll_up_keeps_final_parent_status(self):
+        """Test that a parent with a final status is not overwritten by the roll up."""
+        tree = StepTree("result")
+        parent = tree.add_step("Sequence", "SequenceCall", status=PASSED_STATUS)
+        tree.add_step("Measure", "NumericLimit", parent=parent, status=FAILED_STATUS)
+
+        tree.roll_up_status()
+
+        assert parent.status["statusType"] == "PASSED"
+
+    def test_nested_levels_are_uploaded_in_order(self):
+        """Test that each hierarchy level is created in one request before the next."""
+        tree = StepTree("result")
+        for _ in range(3):
+            parent = _sweep(tree, [PASSED_STATUS] * 4)
+            tree.add_step("Nested", "Action", parent=parent.children[0])
+        client = _FakeClient()
+
+        with StepBatchWriter(client, max_age=None) as writer:
+            futures = tree.upload(writer)
+
+        assert [len(steps) for steps in client.calls] == [3, 12, 3]
+        created = {step["stepId"] for steps in client.calls[:2] for step in steps}
+        assert all(step["parentId"] in created for step in client.calls[2])
+        assert len(futures) == 18
+
+    def test_descendants_of_rejected_steps_are_not_sent(self):
+        """Test that the children of a step the server rejected fail locally."""
+        tree = StepTree("result")
+        rejected = tree.add_step("Rejected", "SequenceCall")
+        child = tree.add_step("Child", "SequenceCall", parent=rejected)
+        tree.add_step("Grandchild", "Action", parent=child)
+        _sweep(tree, [PASSED_STATUS])
+        client = _FakeClient(rejected_names=["Rejected"])
+
+        with StepBatchWriter(client, max_age=None) as writer:
+            futures = tree.upload(writer)
+
+        assert [[step["name"] for step in steps] for steps in client.calls] == [
+            ["Rejected", "Voltage Sweep"],
+            ["Measure"],
+        ]
+        assert [future.exception() is None for future in futures] == [
+            False,
+            True,
+            False,
+            True,
+            False,
+        ]
+        with pytest.raises(StepWriteError, match="parent step"):
+            futures[4].result()
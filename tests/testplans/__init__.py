@@ -0,0 +1 @@
+"""Test for the testplans package."""
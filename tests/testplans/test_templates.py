@@ -0,0 +1,139 @@
+"""Unit tests for applying test plan templates."""
+
+import threading
+from typing import Any, Dict, List, Optional, Set
+
+from nisystemlink.clients.test_plan.models import TestPlan, TestPlanTemplate
+from nisystemlink_examples.testplans import (
+    apply_template,
+    template_fields,
+    TEMPLATE_PROJECTION,
+    template_update,
+)
+
+TEMPLATE: Dict[str, Any] = {
+    "id": "template",
+    "name": "Template",
+    "description": "Functional test",
+    "testProgram": "functional.seq",
+    "estimatedDurationInSeconds": 60,
+    "systemFilter": 'properties.data["Type"] = "Tester"',
+    "executionActions": [{"type": "MANUAL", "action": "START"}],
+    "properties": {"Line": "1"},
+    "dashboard": {"id": "dashboard", "variables": {"product": "A"}},
+}
+
+
+def matching_plan(id: str) -> Dict[str, Any]:
+    """Builds a test plan with the template fields of `TEMPLATE`."""
+    plan = {key: value for key, value in TEMPLATE.items() if key != "name"}
+    plan.update(id=id, estimatedDurationInSeconds=60.0, name=f"Plan {id}")
+    plan["dashboard"] = dict(TEMPLATE["dashboard"], url="https://server/d/dashboard")
+    return plan
+
+
+class _FakeTestPlanService:
+    """Records update requests and fails the test plans in `failing`."""
+
+    def __init__(self, failing: Optional[Set[str]] = None, raising: bool = False):
+        self.failing = failing or set()
+        self.raising = raising
+        self.chunks: List[List[str]] = []
+        self._lock = threading.Lock()
+
+    def update(self, updates: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Updates the test plans, as `TestPlanClient.update_test_plans` would."""
+        with self._lock:
+            self.chunks.append([update["id"] for update in updates])
+        if self.raising:
+            raise ConnectionError("timed out")
+        return {
+            "updatedTestPlans": [
+                {"id": update["id"]}
+                for update in updates
+                if update["id"] not in self.failing
+            ],
+            "failedTestPlans": [
+                update for update in updates if update["id"] in self.failing
+            ],
+        }
+
+
+class TestTemplates:
+    """Test cases for applying test plan templates."""
+
+    def test_matching_test_plan_is_not_updated(self):
+        """Test that server derived dashboard URLs and numeric types are ignored."""
+        assert template_update(matching_plan("a"), template_fields(TEMPLATE)) is None
+
+    def test_differing_test_plan_gets_every_template_field(self):
+        """Test that a single differing field updates all template fields."""
+        plan = dict(matching_plan("a"), properties={"Line": "1", "Extra": "x"})
+
+        update = template_update(plan, template_fields(TEMPLATE))
+
+        assert update == {
+            "id": "a",
+            **{key: TEMPLATE[key] for key in update if key != "id"},
+        }
+        assert set(update) == {
+            "id",
+            *(name for name in TEMPLATE if name not in ("id", "name")),
+        }
+
+    def test_models_are_compared_by_their_json_values(self):
+        """Test that client models compare like the dictionaries of the API."""
+        template = TestPlanTemplate(**TEMPLATE)
+        plan = TestPlan(**matching_plan("a"))
+        fields = template_fields(template)
+
+        assert fields == template_fields(TEMPLATE)
+        assert template_update(plan, fields) is None
+        plan.test_program = "other.seq"
+        assert template_update(plan, fields)["testProgram"] == "functional.seq"
+
+    def test_projection_covers_the_template_fields(self):
+        """Test that the projection names the ID and every template field."""
+        assert TEMPLATE_PROJECTION == [
+            "ID",
+            "DESCRIPTION",
+            "TEST_PROGRAM",
+            "ESTIMATED_DURATION_IN_SECONDS",
+            "SYSTEM_FILTER",
+            "EXECUTION_ACTIONS",
+            "PROPERTIES",
+            "DASHBOARD",
+        ]
+
+    def test_only_differing_test_plans_are_sent_in_chunks(self):
+        """Test that unchanged test plans are counted and the others are chunked."""
+        plans = [
+            (
+                matching_plan(f"plan-{i}")
+                if i % 2
+                else dict(matching_plan(f"plan-{i}"), description=None)
+            )
+            for i in range(2500)
+        ]
+        service = _FakeTestPlanService(failing={"plan-4"})
+
+        report = apply_template(
+            iter(plans), TEMPLATE, service.update, test_plans_per_update=500
+        )
+
+        assert report.unchanged == 1250
+        assert sorted(len(chunk) for chunk in service.chunks) == [250, 500, 500]
+        assert len(report.updated_ids) == 1249
+        assert report.failed_ids == ["plan-4"]
+        assert report.failed_test_plans[0]["description"] == "Functional test"
+
+    def test_failed_requests_fail_their_chunk(self):
+        """Test that the test plans of a request raising an error are reported."""
+        plans = [dict(matching_plan("a"), description="old")]
+        service = _FakeTestPlanService(raising=True)
+
+        report = apply_template(plans, TEMPLATE, service.update)
+
+        assert report.updated_test_plans == []
+        assert report.failed_ids == ["a"]
+        assert report.errors == ["timed out"]